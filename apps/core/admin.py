@@ -80,22 +80,33 @@ class OmicsUnitTypeAdmin(admin.ModelAdmin):
 
 @admin.register(models.PixelSet)
 class PixelSetAdmin(admin.ModelAdmin):
-    actions = ('update_cached_fields', )
+    actions = ('update_cached_fields', 'update_stats')
     exclude = (
         'cached_species', 'cached_omics_areas', 'cached_omics_unit_types'
     )
     list_display = (
-        'get_short_uuid', 'description', 'analysis'
+        'get_short_uuid', 'description', 'analysis', 'get_pixels_count'
     )
     list_filter = (
         'analysis__experiments__omics_area', 'analysis__tags'
     )
+    list_select_related = ('analysis', 'stats')
+
+    def get_pixels_count(self, obj):
+        stats = obj.get_stats()
+        return stats.pixels_count if stats is not None else None
+    get_pixels_count.short_description = _("Pixels")
 
     def update_cached_fields(self, request, queryset):
         for pixelset in queryset:
             pixelset.update_cached_fields()
     update_cached_fields.short_description = _("Update cached fields")
 
+    def update_stats(self, request, queryset):
+        for pixelset in queryset:
+            pixelset.update_stats()
+    update_stats.short_description = _("Refresh statistics")
+
 
 @admin.register(models.Pixel)
 class PixelAdmin(admin.ModelAdmin):
@@ -109,6 +120,16 @@ class PixelAdmin(admin.ModelAdmin):
     )
     readonly_fields = ('omics_unit', )
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        obj.pixel_set.update_stats()
+        obj.pixel_set.bump_version()
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        obj.pixel_set.update_stats()
+        obj.pixel_set.bump_version()
+
     def get_analysis_description(self, obj):
         return obj.pixel_set.analysis.description
     get_analysis_description.short_description = _("Analysis")
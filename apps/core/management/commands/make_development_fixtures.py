@@ -44,8 +44,9 @@ def make_development_fixtures(n_pixel_sets=DEFAULT_N_PIXELSETS,
             pixel_set=pixel_set
         )
 
-        # Update cached fields
+        # Update cached fields and statistics
         pixel_set.update_cached_fields()
+        pixel_set.update_stats()
 
 
 class Command(BaseCommand):
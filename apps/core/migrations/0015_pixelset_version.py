@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.15 on 2026-10-18 09:12
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_auto_20180206_1703'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pixelset',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Incremented each time the pixels of this set change', verbose_name='Version'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.15 on 2026-10-18 11:20
+from __future__ import unicode_literals
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_pixelset_version'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pixelset',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['cached_species'], name='core_pixelset_species_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='pixelset',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['cached_omics_unit_types'], name='core_pixelset_types_gin'),
+        ),
+    ]
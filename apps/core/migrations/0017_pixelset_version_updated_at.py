@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.15 on 2026-10-18 14:27
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_pixelset_facets_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pixelset',
+            name='version_updated_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, help_text='Last time the pixels of this set changed', verbose_name='Version date'),
+        ),
+    ]
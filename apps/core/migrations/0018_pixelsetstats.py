@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.15 on 2026-10-18 15:02
+from __future__ import unicode_literals
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_pixelset_version_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PixelSetStats',
+            fields=[
+                ('pixel_set', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', related_query_name='stats', serialize=False, to='core.PixelSet')),
+                ('pixels_count', models.PositiveIntegerField(default=0, verbose_name='Number of pixels')),
+                ('values_na_count', models.PositiveIntegerField(default=0, verbose_name='Number of missing values')),
+                ('values_min', models.FloatField(null=True, verbose_name='Minimum value')),
+                ('values_max', models.FloatField(null=True, verbose_name='Maximum value')),
+                ('values_mean', models.FloatField(null=True, verbose_name='Mean value')),
+                ('values_std', models.FloatField(null=True, verbose_name='Values standard deviation')),
+                ('values_quantiles', django.contrib.postgres.fields.ArrayField(base_field=models.FloatField(), blank=True, default=list, size=None, verbose_name='Values quantiles')),
+                ('quality_scores_na_count', models.PositiveIntegerField(default=0, verbose_name='Number of missing quality scores')),
+                ('quality_scores_min', models.FloatField(null=True, verbose_name='Minimum quality score')),
+                ('quality_scores_max', models.FloatField(null=True, verbose_name='Maximum quality score')),
+                ('quality_scores_mean', models.FloatField(null=True, verbose_name='Mean quality score')),
+                ('quality_scores_std', models.FloatField(null=True, verbose_name='Quality scores standard deviation')),
+                ('quality_scores_quantiles', django.contrib.postgres.fields.ArrayField(base_field=models.FloatField(), blank=True, default=list, size=None, verbose_name='Quality scores quantiles')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Pixel set statistics',
+                'verbose_name_plural': 'Pixel sets statistics',
+            },
+        ),
+    ]
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.15 on 2026-10-18 16:21
+from __future__ import unicode_literals
+
+from django.db import migrations
+from django.db.models import Count
+
+
+def check_duplicated_pixels(apps, schema_editor):
+    """Refuse to add the constraint when some pixel sets have more than one
+    pixel for the same omics unit: there is no way to tell which value is the
+    right one, so they have to be fixed by hand first.
+    """
+
+    Pixel = apps.get_model('core', 'Pixel')
+
+    duplicates = Pixel.objects.values(
+        'pixel_set_id',
+        'omics_unit_id',
+    ).annotate(
+        count=Count('id'),
+    ).filter(
+        count__gt=1,
+    ).order_by(
+        'pixel_set_id',
+        'omics_unit_id',
+    )
+
+    if not duplicates.exists():
+        return
+
+    raise RuntimeError(
+        'Cannot add the (pixel_set, omics_unit) unique constraint, remove the'
+        ' duplicated pixels first:\n' + '\n'.join(
+            '  pixel set {pixel_set_id}, omics unit {omics_unit_id}:'
+            ' {count} pixels'.format(**duplicate)
+            for duplicate in duplicates
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_pixelsetstats'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            check_duplicated_pixels,
+            reverse_code=migrations.RunPython.noop,
+        ),
+        migrations.AlterUniqueTogether(
+            name='pixel',
+            unique_together=set([('pixel_set', 'omics_unit')]),
+        ),
+    ]
@@ -1,11 +1,16 @@
 import uuid
 import mptt
+import numpy
+
+from itertools import zip_longest
 
 from django.contrib.auth.models import AbstractUser
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 from django.conf import settings
 from django.db import models
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.translation import ugettext as _
 from mptt.fields import TreeForeignKey
 from mptt.models import MPTTModel
@@ -252,7 +257,31 @@ class PixelSet(UUIDModelMixin, models.Model):
         related_query_name='pixelset',
     )
 
+    version = models.PositiveIntegerField(
+        _("Version"),
+        help_text=_("Incremented each time the pixels of this set change"),
+        default=0,
+        editable=False,
+    )
+
+    version_updated_at = models.DateTimeField(
+        _("Version date"),
+        help_text=_("Last time the pixels of this set changed"),
+        default=timezone.now,
+        editable=False,
+    )
+
     class Meta:
+        indexes = [
+            GinIndex(
+                fields=['cached_species'],
+                name='core_pixelset_species_gin'
+            ),
+            GinIndex(
+                fields=['cached_omics_unit_types'],
+                name='core_pixelset_types_gin'
+            ),
+        ]
         ordering = ('analysis', 'pixels_file')
         verbose_name = _("Pixel set")
         verbose_name_plural = _("Pixel sets")
@@ -296,6 +325,28 @@ class PixelSet(UUIDModelMixin, models.Model):
             flat=True
         ))
 
+    def bump_version(self):
+        # Pixels of this set have changed: exports and other artifacts
+        # computed from them are out of date.
+        PixelSet.objects.filter(pk=self.pk).update(
+            version=models.F('version') + 1,
+            version_updated_at=timezone.now(),
+        )
+        self.refresh_from_db(fields=['version', 'version_updated_at'])
+
+    def get_stats(self):
+        """Return the statistics of this set (`None` if they have not been
+        computed yet).
+        """
+        try:
+            return self.stats
+        except PixelSetStats.DoesNotExist:
+            return None
+
+    def update_stats(self):
+        self.stats = PixelSetStats.compute(self)
+        return self.stats
+
     def update_cached_fields(self):
         self.cached_species = list(self.get_species())
         self.cached_omics_unit_types = list(self.get_omics_unit_types())
@@ -309,6 +360,195 @@ class PixelSet(UUIDModelMixin, models.Model):
         )
 
 
+class PixelSetStats(models.Model):
+    """Summary statistics of the pixels of a pixel set, so that we do not
+    need to scan its pixels to count or describe them
+    """
+
+    QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+    pixel_set = models.OneToOneField(
+        'PixelSet',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        related_query_name='stats',
+    )
+
+    pixels_count = models.PositiveIntegerField(
+        _("Number of pixels"),
+        default=0,
+    )
+
+    values_na_count = models.PositiveIntegerField(
+        _("Number of missing values"),
+        default=0,
+    )
+
+    values_min = models.FloatField(_("Minimum value"), null=True)
+
+    values_max = models.FloatField(_("Maximum value"), null=True)
+
+    values_mean = models.FloatField(_("Mean value"), null=True)
+
+    values_std = models.FloatField(_("Values standard deviation"), null=True)
+
+    values_quantiles = ArrayField(
+        models.FloatField(),
+        verbose_name=_("Values quantiles"),
+        default=list,
+        blank=True,
+    )
+
+    quality_scores_na_count = models.PositiveIntegerField(
+        _("Number of missing quality scores"),
+        default=0,
+    )
+
+    quality_scores_min = models.FloatField(
+        _("Minimum quality score"),
+        null=True
+    )
+
+    quality_scores_max = models.FloatField(
+        _("Maximum quality score"),
+        null=True
+    )
+
+    quality_scores_mean = models.FloatField(
+        _("Mean quality score"),
+        null=True
+    )
+
+    quality_scores_std = models.FloatField(
+        _("Quality scores standard deviation"),
+        null=True
+    )
+
+    quality_scores_quantiles = ArrayField(
+        models.FloatField(),
+        verbose_name=_("Quality scores quantiles"),
+        default=list,
+        blank=True,
+    )
+
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        editable=False
+    )
+
+    class Meta:
+        verbose_name = _("Pixel set statistics")
+        verbose_name_plural = _("Pixel sets statistics")
+
+    def __str__(self):
+        return str(self.pixel_set_id)
+
+    @classmethod
+    def describe(cls, values):
+        """Describe an array of values, missing values being `NaN`.
+
+        Parameters
+        ----------
+        values : numpy.ndarray
+            A one-dimensional array of floats.
+
+        Returns
+        -------
+        dict
+            A hash map with the `na_count`, `min`, `max`, `mean`, `std`
+            (population standard deviation) and `quantiles` (see
+            `QUANTILES`) of the values.
+        """
+
+        na = numpy.isnan(values)
+        values = values[~na]
+
+        description = {
+            'na_count': int(na.sum()),
+            'min': None,
+            'max': None,
+            'mean': None,
+            'std': None,
+            'quantiles': [],
+        }
+
+        if values.size:
+            description.update({
+                'min': float(values.min()),
+                'max': float(values.max()),
+                'mean': float(values.mean()),
+                'std': float(values.std()),
+                'quantiles': numpy.percentile(
+                    values,
+                    [q * 100 for q in cls.QUANTILES]
+                ).tolist(),
+            })
+
+        return description
+
+    @classmethod
+    def compute(cls, pixel_set):
+        """Compute (and save) the statistics of a pixel set.
+
+        Values and quality scores are fetched with a single query, and
+        described with NumPy.
+        """
+
+        rows = list(pixel_set.pixels.order_by().values_list(
+            'value',
+            'quality_score'
+        ))
+        # missing quality scores (None) are converted to NaN
+        pixels = numpy.array(rows, dtype=float).reshape(-1, 2)
+
+        defaults = {'pixels_count': len(rows)}
+        for i, prefix in enumerate(('values', 'quality_scores')):
+            description = cls.describe(pixels[:, i])
+            defaults.update({
+                f'{prefix}_{key}': value
+                for key, value in description.items()
+            })
+
+        stats, __ = cls.objects.update_or_create(
+            pixel_set=pixel_set,
+            defaults=defaults
+        )
+        return stats
+
+    @classmethod
+    def count_pixels(cls, pixel_set_ids):
+        """Return the total number of pixels of the given pixel sets, from
+        their statistics (pixels are only counted when some statistics have
+        not been computed yet).
+        """
+
+        pixel_set_ids = set(pixel_set_ids)
+        aggregates = cls.objects.filter(
+            pixel_set_id__in=pixel_set_ids
+        ).aggregate(
+            nb=models.Count('pk'),
+            total=models.Sum('pixels_count'),
+        )
+
+        if aggregates['nb'] == len(pixel_set_ids):
+            return aggregates['total'] or 0
+
+        return Pixel.objects.filter(pixel_set_id__in=pixel_set_ids).count()
+
+    def get_quantiles(self):
+        """Return `(quantile, value, quality score)` tuples."""
+
+        if not (self.values_quantiles or self.quality_scores_quantiles):
+            return []
+
+        return list(zip_longest(
+            self.QUANTILES,
+            self.values_quantiles,
+            self.quality_scores_quantiles
+        ))
+
+
 class Pixel(UUIDModelMixin, models.Model):
     """A pixel is the smallest measurement unit for an Omics study
     """
@@ -349,6 +589,9 @@ class Pixel(UUIDModelMixin, models.Model):
         ordering = ('pixel_set', 'omics_unit')
         verbose_name = _("Pixel")
         verbose_name_plural = _("Pixels")
+        unique_together = (
+            ('pixel_set', 'omics_unit'),
+        )
 
 
 class Tag(tgl_models.TagTreeModel):
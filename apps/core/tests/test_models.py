@@ -1,4 +1,5 @@
 import datetime
+import numpy
 
 from django.db import IntegrityError, transaction
 from django.test import TestCase
@@ -422,6 +423,128 @@ class PixelSetTestCase(CoreFixturesTestCase):
             [self.experiment.omics_area.name, ]
         )
 
+    def test_bump_version(self):
+
+        self.assertEqual(self.pixel_set.version, 0)
+        version_updated_at = self.pixel_set.version_updated_at
+
+        self.pixel_set.bump_version()
+        self.assertEqual(self.pixel_set.version, 1)
+        self.assertGreater(
+            self.pixel_set.version_updated_at,
+            version_updated_at
+        )
+
+        self.pixel_set.bump_version()
+        self.pixel_set.refresh_from_db()
+        self.assertEqual(self.pixel_set.version, 2)
+
+    def test_get_stats(self):
+
+        self.assertIsNone(self.pixel_set.get_stats())
+
+        stats = self.pixel_set.update_stats()
+
+        self.pixel_set.refresh_from_db()
+        self.assertEqual(self.pixel_set.get_stats(), stats)
+
+
+class PixelSetStatsTestCase(CoreFixturesTestCase):
+
+    def setUp(self):
+
+        self.pixel_set = factories.PixelSetFactory()
+        for value, quality_score in ((1., 0.5), (2., None), (3., 0.1)):
+            factories.PixelFactory(
+                pixel_set=self.pixel_set,
+                value=value,
+                quality_score=quality_score,
+            )
+
+    def test_describe(self):
+
+        description = models.PixelSetStats.describe(
+            numpy.array([1., numpy.nan, 3.])
+        )
+
+        self.assertEqual(description['na_count'], 1)
+        self.assertEqual(description['min'], 1.)
+        self.assertEqual(description['max'], 3.)
+        self.assertEqual(description['mean'], 2.)
+        self.assertEqual(description['std'], 1.)
+        self.assertEqual(
+            len(description['quantiles']),
+            len(models.PixelSetStats.QUANTILES)
+        )
+        self.assertEqual(description['quantiles'][2], 2.)
+
+    def test_describe_empty(self):
+
+        description = models.PixelSetStats.describe(numpy.array([]))
+
+        self.assertEqual(description['na_count'], 0)
+        self.assertIsNone(description['min'])
+        self.assertIsNone(description['std'])
+        self.assertEqual(description['quantiles'], [])
+
+    def test_compute(self):
+
+        stats = models.PixelSetStats.compute(self.pixel_set)
+
+        self.assertEqual(stats.pixels_count, 3)
+        self.assertEqual(stats.values_na_count, 0)
+        self.assertEqual(stats.values_min, 1.)
+        self.assertEqual(stats.values_max, 3.)
+        self.assertEqual(stats.values_mean, 2.)
+        self.assertEqual(stats.quality_scores_na_count, 1)
+        self.assertEqual(stats.quality_scores_min, 0.1)
+        self.assertEqual(stats.quality_scores_max, 0.5)
+
+        # computing them again updates them
+        factories.PixelFactory(pixel_set=self.pixel_set, value=5.)
+        stats = models.PixelSetStats.compute(self.pixel_set)
+
+        self.assertEqual(models.PixelSetStats.objects.count(), 1)
+        self.assertEqual(stats.pixels_count, 4)
+        self.assertEqual(stats.values_max, 5.)
+
+    def test_compute_without_pixels(self):
+
+        stats = models.PixelSetStats.compute(factories.PixelSetFactory())
+
+        self.assertEqual(stats.pixels_count, 0)
+        self.assertIsNone(stats.values_mean)
+        self.assertEqual(stats.get_quantiles(), [])
+
+    def test_get_quantiles(self):
+
+        stats = models.PixelSetStats.compute(self.pixel_set)
+
+        quantiles = stats.get_quantiles()
+
+        self.assertEqual(len(quantiles), len(models.PixelSetStats.QUANTILES))
+        quantile, value, quality_score = quantiles[2]
+        self.assertEqual(quantile, 0.5)
+        self.assertEqual(value, 2.)
+        self.assertAlmostEqual(quality_score, 0.3)
+
+    def test_count_pixels(self):
+
+        other = factories.PixelSetFactory()
+        factories.PixelFactory.create_batch(2, pixel_set=other)
+        ids = [self.pixel_set.id, other.id]
+
+        # statistics are missing: pixels are counted
+        self.assertEqual(models.PixelSetStats.count_pixels(ids), 5)
+
+        models.PixelSetStats.compute(self.pixel_set)
+        models.PixelSetStats.compute(other)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(models.PixelSetStats.count_pixels(ids), 5)
+
+        self.assertEqual(models.PixelSetStats.count_pixels([]), 0)
+
 
 class PixelTestCase(TestCase):
 
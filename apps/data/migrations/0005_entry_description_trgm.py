@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data', '0004_auto_20180122_1055'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        # `description__icontains` lookups are translated to
+        # `UPPER("data_entry"."description"::text) LIKE UPPER(%s)`, this
+        # expression index is used by the planner for such lookups.
+        migrations.RunSQL(
+            sql=(
+                'CREATE INDEX data_entry_description_upper_trgm '
+                'ON data_entry '
+                'USING gin (UPPER("description"::text) gin_trgm_ops);'
+            ),
+            reverse_sql='DROP INDEX data_entry_description_upper_trgm;',
+        ),
+    ]
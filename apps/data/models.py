@@ -39,6 +39,27 @@ class Repository(models.Model):
         return self.name
 
 
+class EntryQuerySet(models.QuerySet):
+
+    def search(self, search_terms):
+        """Entries whose identifier is one of the search terms, or whose
+        description contains all of them (case-insensitive).
+
+        Descriptions are matched with `UPPER(description) LIKE '%TERM%'`
+        clauses, which are backed by a `pg_trgm` GIN index (see the
+        `0005_entry_description_trgm` migration).
+        """
+
+        if not search_terms:
+            return self
+
+        clauses = models.Q(description__icontains=search_terms[0])
+        for term in search_terms[1:]:
+            clauses &= models.Q(description__icontains=term)
+
+        return self.filter(models.Q(identifier__in=search_terms) | clauses)
+
+
 class Entry(UUIDModelMixin, models.Model):
 
     id = models.UUIDField(
@@ -72,6 +93,8 @@ class Entry(UUIDModelMixin, models.Model):
         related_query_name='entry',
     )
 
+    objects = EntryQuerySet.as_manager()
+
     class Meta:
         ordering = ('repository', 'identifier')
         unique_together = (
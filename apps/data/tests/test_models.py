@@ -171,3 +171,30 @@ class EntryTestCase(TestCase):
             entry.clean()
 
         self.assertEqual(qs.count(), 0)
+
+    def test_search(self):
+
+        entries = [
+            models.Entry.objects.create(
+                identifier=identifier,
+                description=description,
+                repository=self.repository,
+            )
+            for identifier, description in (
+                ('FOO001', 'Lorem ipsum dolor'),
+                ('FOO002', 'lorem dolor sit amet'),
+                ('FOO003', 'consectetur adipiscing elit'),
+            )
+        ]
+
+        qs = models.Entry.objects.search(['LOREM'])
+        self.assertEqual(set(qs), set(entries[:2]))
+
+        qs = models.Entry.objects.search(['lorem', 'sit'])
+        self.assertEqual(list(qs), entries[1:2])
+
+        qs = models.Entry.objects.search(['FOO003', 'FOO001'])
+        self.assertEqual(set(qs), {entries[0], entries[2]})
+
+        qs = models.Entry.objects.search([])
+        self.assertEqual(qs.count(), 3)
@@ -0,0 +1,15 @@
+from django.contrib import admin
+
+from apps.core.admin import UUIDModelAdminMixin
+
+from . import models
+
+
+@admin.register(models.ExportJob)
+class ExportJobAdmin(UUIDModelAdminMixin, admin.ModelAdmin):
+    list_display = (
+        'get_short_uuid', 'created_by', 'format', 'status', 'created_at',
+        'finished_at',
+    )
+    list_filter = ('status', 'format', 'created_at')
+    raw_id_fields = ('pixel_sets', )
@@ -0,0 +1,204 @@
+import hashlib
+import json
+import os
+import uuid
+
+from pathlib import Path
+
+from django.conf import settings
+from django.dispatch import receiver
+
+from apps.core.models import PixelSet
+from apps.submission.signals import importation_done
+
+
+class ExportCache(object):
+    """A content-addressed cache for exported pixel sets.
+
+    Cache entries are stored on disk, in the `EXPORT_CACHE_ROOT` directory.
+    Each entry is identified by a key computed from the kind of export, the
+    selected pixel sets (and their version), the search terms and extra
+    parameters (e.g. the export format). A JSON sidecar file lists the pixel
+    sets of an entry so that it can be invalidated when they change. Least
+    recently used entries are evicted when the total size of the cache exceeds
+    `EXPORT_CACHE_MAX_SIZE` (in bytes).
+    """
+
+    DATA_SUFFIX = '.data'
+    META_SUFFIX = '.json'
+
+    def __init__(self, root=None, max_size=None):
+
+        if root is None:
+            root = settings.EXPORT_CACHE_ROOT
+        if max_size is None:
+            max_size = settings.EXPORT_CACHE_MAX_SIZE
+
+        self.root = Path(root)
+        self.max_size = int(max_size)
+
+    @property
+    def enabled(self):
+        return self.max_size > 0
+
+    def get_key(self, kind, pixel_set_ids, search_terms=None, **params):
+        """Compute the cache key of an export.
+
+        Parameters
+        ----------
+        kind : str
+            The kind of export (e.g. 'pixelsets', 'pixels', 'html').
+        pixel_set_ids : list
+            A list of pixel set ids.
+        search_terms : list, optional
+            A list of search terms.
+        **params
+            Extra parameters of the export (e.g. the format).
+
+        Returns
+        -------
+        str
+            The hexadecimal digest of the key.
+
+        """
+
+        versions = PixelSet.objects.filter(
+            id__in=pixel_set_ids
+        ).values_list('id', 'version')
+
+        payload = {
+            'kind': kind,
+            'pixel_sets': sorted((str(id), v) for id, v in versions),
+            'search_terms': sorted(
+                set(term.strip() for term in (search_terms or []))
+            ),
+            'params': params,
+        }
+
+        return hashlib.sha256(
+            json.dumps(payload, sort_keys=True).encode('utf-8')
+        ).hexdigest()
+
+    def _data_path(self, key):
+        return self.root / f'{key}{self.DATA_SUFFIX}'
+
+    def _meta_path(self, key):
+        return self.root / f'{key}{self.META_SUFFIX}'
+
+    def get(self, key):
+        """Open a cached entry (in binary mode), or return `None` on cache
+        miss.
+
+        The entry is opened right away, so that it can still be read once
+        opened even if it gets evicted or invalidated concurrently. The caller
+        is responsible for closing the returned file.
+        """
+
+        if not self.enabled:
+            return None
+
+        path = self._data_path(key)
+        try:
+            cached = path.open('rb')
+        except FileNotFoundError:
+            return None
+
+        try:
+            # mark this entry as recently used
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return cached
+
+    def set(self, key, pixel_set_ids, content):
+        """Store `content` (str or bytes) in the cache."""
+
+        for __ in self.cache_stream(key, pixel_set_ids, [content]):
+            pass
+
+    def cache_stream(self, key, pixel_set_ids, chunks):
+        """Yield chunks while writing them to the cache.
+
+        The cache entry is only stored once all the chunks have been
+        consumed, so that an interrupted stream does not leave a truncated
+        entry behind.
+        """
+
+        if not self.enabled:
+            yield from chunks
+            return
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.root / f'{key}.{uuid.uuid4().hex}.tmp'
+
+        try:
+            with tmp_path.open('wb') as tmp:
+                for chunk in chunks:
+                    if isinstance(chunk, str):
+                        tmp.write(chunk.encode('utf-8'))
+                    else:
+                        tmp.write(chunk)
+                    yield chunk
+
+            self._meta_path(key).write_text(
+                json.dumps([str(id) for id in pixel_set_ids])
+            )
+            tmp_path.rename(self._data_path(key))
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+        self.evict()
+
+    def _entries(self):
+        if not self.root.exists():
+            return []
+        return list(self.root.glob(f'*{self.DATA_SUFFIX}'))
+
+    def _delete(self, path):
+        key = path.name[:-len(self.DATA_SUFFIX)]
+        for p in (path, self._meta_path(key)):
+            try:
+                p.unlink()
+            except FileNotFoundError:
+                pass
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits."""
+
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for __, size, __ in entries)
+        for __, size, path in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_size:
+                break
+            self._delete(path)
+            total -= size
+
+    def invalidate(self, pixel_set_ids):
+        """Delete all entries related to the given pixel sets."""
+
+        pixel_set_ids = set(str(id) for id in pixel_set_ids)
+
+        for path in self._entries():
+            key = path.name[:-len(self.DATA_SUFFIX)]
+            try:
+                cached_ids = json.loads(self._meta_path(key).read_text())
+            except (FileNotFoundError, ValueError):
+                # orphan entry
+                self._delete(path)
+                continue
+
+            if pixel_set_ids.intersection(cached_ids):
+                self._delete(path)
+
+
+@receiver(importation_done)
+def invalidate_export_cache(sender, pixel_sets, **kwargs):
+    ExportCache().invalidate([pixel_set.id for pixel_set in pixel_sets])
@@ -0,0 +1,116 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.dispatch import receiver
+
+from apps.core.models import Analysis, Experiment
+from apps.submission.signals import importation_done
+
+
+FACET_COUNTS_CACHE_KEY = 'explorer:facet_counts'
+
+FACETS = ('species', 'omics_unit_types', 'omics_areas', 'tags')
+
+
+def _get_facet_counts_sql():
+
+    analysis_tags = Analysis._meta.get_field('tags')
+    experiment_tags = Experiment._meta.get_field('tags')
+
+    return (
+        # species and omics unit types are denormalized in pixel sets arrays
+        "SELECT 'species' AS facet, core_species.id::text AS id,"
+        " COUNT(*) AS nb"
+        " FROM core_pixelset"
+        " JOIN core_species"
+        "   ON core_species.name = ANY(core_pixelset.cached_species)"
+        " GROUP BY core_species.id"
+        " UNION ALL"
+        " SELECT 'omics_unit_types', core_omicsunittype.id::text, COUNT(*)"
+        " FROM core_pixelset"
+        " JOIN core_omicsunittype"
+        "   ON core_omicsunittype.name ="
+        "   ANY(core_pixelset.cached_omics_unit_types)"
+        " GROUP BY core_omicsunittype.id"
+        # omics areas: a Pixel Set is counted for its areas and their
+        # ancestors (the filter includes descendants)
+        " UNION ALL"
+        " SELECT 'omics_areas', ancestor.id::text,"
+        " COUNT(DISTINCT core_pixelset.id)"
+        " FROM core_omicsarea ancestor"
+        " JOIN core_omicsarea descendant"
+        "   ON descendant.tree_id = ancestor.tree_id"
+        "   AND descendant.lft BETWEEN ancestor.lft AND ancestor.rght"
+        " JOIN core_pixelset"
+        "   ON descendant.name = ANY(core_pixelset.cached_omics_areas)"
+        " GROUP BY ancestor.id"
+        # tags: analyses and experiments tags, a Pixel Set is counted for its
+        # tags and their ancestors (the filter includes descendants)
+        " UNION ALL"
+        " SELECT 'tags', ancestor.id::text,"
+        " COUNT(DISTINCT core_pixelset.id)"
+        " FROM core_tag ancestor"
+        " JOIN core_tag descendant"
+        "   ON descendant.id = ancestor.id"
+        "   OR descendant.path LIKE ancestor.path || '/%'"
+        " JOIN ("
+        "   SELECT {at_analysis} AS analysis_id, {at_tag} AS tag_id"
+        "   FROM {at_table}"
+        "   UNION"
+        "   SELECT core_analysis_experiments.analysis_id, {et_tag}"
+        "   FROM core_analysis_experiments"
+        "   JOIN {et_table}"
+        "     ON {et_table}.{et_experiment} ="
+        "     core_analysis_experiments.experiment_id"
+        " ) tagged"
+        "   ON tagged.tag_id = descendant.id"
+        " JOIN core_pixelset"
+        "   ON core_pixelset.analysis_id = tagged.analysis_id"
+        " GROUP BY ancestor.id"
+    ).format(
+        at_table=analysis_tags.m2m_db_table(),
+        at_analysis=analysis_tags.m2m_column_name(),
+        at_tag=analysis_tags.m2m_reverse_name(),
+        et_table=experiment_tags.m2m_db_table(),
+        et_experiment=experiment_tags.m2m_column_name(),
+        et_tag=experiment_tags.m2m_reverse_name(),
+    )
+
+
+def get_facet_counts():
+    """Count Pixel Sets for each option of the explorer filters.
+
+    Counts are computed by a single grouped query over the denormalized
+    Pixel Sets fields (and tags), and cached until the next importation or
+    for `FACET_COUNTS_CACHE_TIMEOUT` seconds.
+
+    Returns
+    -------
+    dict
+        A hash map indexed by facet (`species`, `omics_unit_types`,
+        `omics_areas` and `tags`). Values are hash maps of Pixel Sets counts
+        indexed by (str) option id.
+    """
+
+    counts = cache.get(FACET_COUNTS_CACHE_KEY)
+
+    if counts is None:
+        counts = {facet: dict() for facet in FACETS}
+
+        with connection.cursor() as cursor:
+            cursor.execute(_get_facet_counts_sql())
+            for facet, id, nb in cursor.fetchall():
+                counts[facet][id] = nb
+
+        cache.set(
+            FACET_COUNTS_CACHE_KEY,
+            counts,
+            settings.FACET_COUNTS_CACHE_TIMEOUT
+        )
+
+    return counts
+
+
+@receiver(importation_done)
+def invalidate_facet_counts(sender, **kwargs):
+    cache.delete(FACET_COUNTS_CACHE_KEY)
@@ -65,6 +65,27 @@ class PixelSetFiltersForm(forms.Form):
         required=False,
     )
 
+    def __init__(self, *args, facet_counts=None, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # display the number of Pixel Sets next to each option
+        if facet_counts is not None:
+            for name, counts in facet_counts.items():
+                self._add_counts_to_labels(self.fields[name], counts)
+
+    @staticmethod
+    def _add_counts_to_labels(field, counts):
+
+        label_from_instance = field.label_from_instance
+
+        def label_with_count(obj):
+            return '{} ({})'.format(
+                label_from_instance(obj),
+                counts.get(str(obj.pk), 0)
+            )
+
+        field.label_from_instance = label_with_count
+
     def clean_search(self):
         return self.cleaned_data['search'].strip()
 
@@ -119,3 +140,41 @@ class PixelSetSubsetSelectionForm(forms.Form):
 
     def clean_search_terms(self):
         return list(str_to_set(self.cleaned_data['search_terms']))
+
+
+class HistogramForm(forms.Form):
+
+    DEFAULT_BINS = 50
+    MAX_BINS = 1000
+
+    bins = forms.IntegerField(
+        label=_("Number of bins"),
+        min_value=1,
+        max_value=MAX_BINS,
+        required=False,
+    )
+
+    min = forms.FloatField(
+        label=_("Lower bound"),
+        required=False,
+    )
+
+    max = forms.FloatField(
+        label=_("Upper bound"),
+        required=False,
+    )
+
+    def clean_bins(self):
+        return self.cleaned_data['bins'] or self.DEFAULT_BINS
+
+    def clean(self):
+        cleaned_data = super().clean()
+
+        low = cleaned_data.get('min')
+        high = cleaned_data.get('max')
+        if low is not None and high is not None and low >= high:
+            raise forms.ValidationError(
+                _("The lower bound should be less than the upper bound.")
+            )
+
+        return cleaned_data
@@ -0,0 +1,191 @@
+import threading
+import uuid
+
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from apps.core.models import (
+    Analysis, Experiment, OmicsArea, PixelSet, Tag
+)
+from apps.submission.signals import importation_done
+
+
+HIERARCHIES_GENERATION_KEY = 'explorer:hierarchies:generation'
+
+ANALYSIS_TAGS_THROUGH = Analysis._meta.get_field('tags').remote_field.through
+EXPERIMENT_TAGS_THROUGH = Experiment._meta.get_field(
+    'tags'
+).remote_field.through
+
+# Closures and mappings are held in memory (per process), they are rebuilt
+# when the generation (shared by all processes through Django's cache, see the
+# CACHES setting) has changed, i.e. when the hierarchies or the Pixel Sets have
+# changed. Generations are random tokens: a new generation never matches one a
+# process has already seen, even when the previous one has been evicted.
+_memo = {
+    'generation': None,
+    'values': {},
+}
+_memo_lock = threading.Lock()
+
+
+def _new_generation():
+    return uuid.uuid4().hex
+
+
+def _get_generation():
+    generation = cache.get(HIERARCHIES_GENERATION_KEY)
+    if generation is None:
+        # the generation has never been set (or has been evicted): another
+        # process may set it first
+        cache.add(HIERARCHIES_GENERATION_KEY, _new_generation(), None)
+        generation = cache.get(HIERARCHIES_GENERATION_KEY)
+    return generation
+
+
+def invalidate_hierarchies():
+    """Forget all closures and mappings, in all processes."""
+
+    cache.set(HIERARCHIES_GENERATION_KEY, _new_generation(), None)
+
+
+def _memoize(name, build):
+
+    generation = _get_generation()
+
+    with _memo_lock:
+        if _memo['generation'] != generation:
+            _memo['generation'] = generation
+            _memo['values'] = dict()
+
+        if name not in _memo['values']:
+            _memo['values'][name] = build()
+
+        return _memo['values'][name]
+
+
+def _build_closure(model):
+    """Map each node of a tree to the set of its descendants (itself
+    included), given the `parent` field of the tree model.
+    """
+
+    children = defaultdict(list)
+    nodes = model.objects.values_list('id', 'parent_id')
+    for id, parent_id in nodes:
+        children[parent_id].append(id)
+
+    closure = dict()
+
+    def descendants(id):
+        if id not in closure:
+            result = {id}
+            for child in children[id]:
+                result |= descendants(child)
+            closure[id] = frozenset(result)
+        return closure[id]
+
+    for id, __ in nodes:
+        descendants(id)
+
+    return closure
+
+
+def _build_mapping(*lookups):
+    """Map related object ids to the ids of the Pixel Sets they are related
+    to through (one of) the given lookups.
+    """
+
+    mapping = defaultdict(set)
+    for lookup in lookups:
+        pairs = PixelSet.objects.filter(
+            **{f'{lookup}__isnull': False}
+        ).order_by().values_list(lookup, 'id').distinct()
+        for related_id, pixel_set_id in pairs:
+            mapping[related_id].add(pixel_set_id)
+
+    return {
+        related_id: frozenset(ids) for related_id, ids in mapping.items()
+    }
+
+
+def _get_pixel_sets(closure_name, model, mapping_name, lookups, ids):
+
+    closure = _memoize(closure_name, lambda: _build_closure(model))
+    mapping = _memoize(mapping_name, lambda: _build_mapping(*lookups))
+
+    pixel_sets = set()
+    for id in ids:
+        for descendant in closure.get(id, (id, )):
+            pixel_sets |= mapping.get(descendant, frozenset())
+
+    return frozenset(pixel_sets)
+
+
+def get_pixel_sets_by_omics_areas(omics_areas):
+    """Return the ids of the Pixel Sets related to the given omics areas or
+    their descendants (through the experiments of their analysis).
+
+    Parameters
+    ----------
+    omics_areas : iterable
+        OmicsArea instances or ids.
+
+    Returns
+    -------
+    frozenset
+        A set of Pixel Set ids.
+    """
+
+    return _get_pixel_sets(
+        'omics_areas_closure',
+        OmicsArea,
+        'omics_areas_pixel_sets',
+        ('analysis__experiments__omics_area', ),
+        [getattr(area, 'pk', area) for area in omics_areas],
+    )
+
+
+def get_pixel_sets_by_tags(tags):
+    """Return the ids of the Pixel Sets related to the given tags or their
+    descendants (through their analysis or the experiments of their
+    analysis).
+
+    Parameters
+    ----------
+    tags : iterable
+        Tag instances or ids.
+
+    Returns
+    -------
+    frozenset
+        A set of Pixel Set ids.
+    """
+
+    return _get_pixel_sets(
+        'tags_closure',
+        Tag,
+        'tags_pixel_sets',
+        ('analysis__tags', 'analysis__experiments__tags'),
+        [getattr(tag, 'pk', tag) for tag in tags],
+    )
+
+
+@receiver(post_save, sender=Analysis)
+@receiver(post_save, sender=Experiment)
+@receiver(post_save, sender=OmicsArea)
+@receiver(post_save, sender=PixelSet)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Analysis)
+@receiver(post_delete, sender=Experiment)
+@receiver(post_delete, sender=OmicsArea)
+@receiver(post_delete, sender=PixelSet)
+@receiver(post_delete, sender=Tag)
+@receiver(m2m_changed, sender=Analysis.experiments.through)
+@receiver(m2m_changed, sender=ANALYSIS_TAGS_THROUGH)
+@receiver(m2m_changed, sender=EXPERIMENT_TAGS_THROUGH)
+@receiver(importation_done)
+def invalidate_hierarchies_on_change(sender, **kwargs):
+    invalidate_hierarchies()
@@ -0,0 +1,96 @@
+import re
+
+from functools import lru_cache
+
+
+HIGHLIGHT_CACHE_SIZE = 128
+
+# used to highlight a whole column at once, it cannot be part of a search term
+COLUMN_SEPARATOR = '\x00'
+
+
+class TermsHighlighter(object):
+    """Highlight a set of search terms in texts.
+
+    The terms are escaped and compiled once in a single (case-insensitive)
+    alternation. Longer terms come first so that they win over the terms they
+    contain (e.g. `YAL001C` over `YAL001`).
+    """
+
+    template = '<span class="highlight">{}</span>'
+
+    def __init__(self, terms):
+
+        terms = set(term.replace(COLUMN_SEPARATOR, '') for term in terms)
+        terms.discard('')
+        self.terms = tuple(sorted(terms, key=lambda t: (-len(t), t)))
+
+        self.pattern = None
+        if self.terms:
+            self.pattern = re.compile(
+                '|'.join(re.escape(term) for term in self.terms),
+                flags=re.IGNORECASE
+            )
+
+    def _replace(self, match):
+        return self.template.format(match.group(0))
+
+    def highlight(self, text):
+        """Highlight the terms in a text."""
+
+        if self.pattern is None:
+            return text
+        return self.pattern.sub(self._replace, text)
+
+    def highlight_column(self, texts):
+        """Highlight the terms in a list of texts with a single regex pass.
+
+        Parameters
+        ----------
+        texts : iterable
+            A sequence of texts (e.g. a `pandas.Series`). Missing values are
+            rendered as empty strings.
+
+        Returns
+        -------
+        list
+            The highlighted texts.
+
+        """
+
+        texts = [
+            '' if text is None or text != text else str(text)
+            for text in texts
+        ]
+
+        if self.pattern is None or not texts:
+            return texts
+
+        return self.highlight(COLUMN_SEPARATOR.join(texts)).split(
+            COLUMN_SEPARATOR
+        )
+
+
+@lru_cache(maxsize=HIGHLIGHT_CACHE_SIZE)
+def _get_highlighter(terms):
+    return TermsHighlighter(terms)
+
+
+def get_highlighter(terms):
+    """Return the (memoized) highlighter of a set of search terms.
+
+    Parameters
+    ----------
+    terms : iterable
+        A list of search terms, can be `None`.
+
+    Returns
+    -------
+    TermsHighlighter
+        The same instance is returned for the same set of terms.
+
+    """
+
+    terms = set(term for term in (terms or []) if term)
+
+    return _get_highlighter(tuple(sorted(terms)))
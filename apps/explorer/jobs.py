@@ -0,0 +1,118 @@
+import logging
+import shutil
+
+from pathlib import Path
+
+import background
+
+from django import db
+from django.conf import settings
+from django.utils.timezone import now
+
+from .cache import ExportCache
+from .models import ExportJob
+from .utils import export_pixelsets_as_stream
+
+logger = logging.getLogger(__name__)
+
+
+EXPORT_JOB_ARCHIVE_FILENAME = 'pixelsets.zip'
+
+
+def run_export_job(job):
+    """Build the archive of an export job and store it under `MEDIA_ROOT`.
+
+    Parameters
+    ----------
+    job : apps.explorer.models.ExportJob
+        The export job to run.
+
+    Returns
+    -------
+    apps.explorer.models.ExportJob
+        The finished job.
+
+    """
+
+    job.status = ExportJob.STATUS_RUNNING
+    job.save(update_fields=['status'])
+
+    name = job.archive.field.generate_filename(
+        job,
+        EXPORT_JOB_ARCHIVE_FILENAME
+    )
+    path = Path(settings.MEDIA_ROOT) / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    pixel_set_ids = list(job.pixel_sets.values_list('id', flat=True))
+
+    # also feed the exports cache, so that the same synchronous export is
+    # served from disk
+    cache = ExportCache()
+    cache_key = cache.get_key(
+        'pixelsets',
+        pixel_set_ids,
+        search_terms=job.search_terms,
+        format=job.format,
+    )
+    cached_archive = cache.get(cache_key)
+
+    if cached_archive is not None:
+        with cached_archive, path.open('wb') as archive:
+            shutil.copyfileobj(cached_archive, archive)
+    else:
+        chunks = cache.cache_stream(
+            cache_key,
+            pixel_set_ids,
+            export_pixelsets_as_stream(
+                pixel_sets=job.pixel_sets.all(),
+                search_terms=job.search_terms,
+                format=job.format,
+            )
+        )
+        with path.open('wb') as archive:
+            for chunk in chunks:
+                archive.write(chunk)
+
+    job.archive.name = name
+    job.status = ExportJob.STATUS_DONE
+    job.finished_at = now()
+    job.save(update_fields=['archive', 'status', 'finished_at'])
+
+    return job
+
+
+def start_export_job(job):
+    """Run an export job in the background thread pool."""
+
+    @background.task
+    def async_export():
+        logger.debug("Async export started ({})".format(job.id))
+
+        return run_export_job(job)
+
+    def export_callback(future):
+        """
+        We need to force databases connection closing since the background
+        process (in a separated thread) creates a new connection that would
+        never be closed otherwise.
+        """
+        e = future.exception()
+
+        if e is not None:
+            logger.error("Export failed! job: {} ({})".format(job.id, e))
+
+            ExportJob.objects.filter(pk=job.pk).update(
+                status=ExportJob.STATUS_ERROR,
+                error=str(e),
+                finished_at=now(),
+            )
+
+        logger.debug(
+            "Closing open database connections (background callback)"
+        )
+        db.connections.close_all()
+
+    # callbacks registered with `@background.callback` are called for every
+    # background task, we only want this one to be called for this job.
+    async_export().add_done_callback(export_callback)
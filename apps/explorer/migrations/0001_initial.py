@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.15 on 2026-10-18 10:02
+from __future__ import unicode_literals
+
+import apps.core.mixins
+import apps.explorer.models
+from django.conf import settings
+import django.contrib.postgres.fields
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('core', '0015_pixelset_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('search_terms', django.contrib.postgres.fields.ArrayField(base_field=models.TextField(), blank=True, default=[], size=None)),
+                ('format', models.CharField(choices=[('csv', 'csv'), ('feather', 'feather'), ('parquet', 'parquet')], default='csv', max_length=20, verbose_name='Format')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('error', 'Error')], default='pending', max_length=20, verbose_name='Status')),
+                ('archive', models.FileField(blank=True, max_length=255, upload_to=apps.explorer.models.ExportJob.archive_upload_to, verbose_name='Exported archive')),
+                ('error', models.TextField(blank=True, verbose_name='Error')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, editable=False, null=True)),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='export_jobs', related_query_name='export_job', to=settings.AUTH_USER_MODEL)),
+                ('pixel_sets', models.ManyToManyField(related_name='export_jobs', related_query_name='export_job', to='core.PixelSet')),
+            ],
+            options={
+                'verbose_name': 'Export job',
+                'verbose_name_plural': 'Export jobs',
+                'ordering': ('-created_at',),
+            },
+            bases=(apps.core.mixins.UUIDModelMixin, models.Model),
+        ),
+    ]
@@ -0,0 +1,123 @@
+import uuid
+
+from django.conf import settings
+from django.contrib.postgres.fields import ArrayField
+from django.db import models
+from django.urls import reverse
+from django.utils.translation import ugettext as _
+
+from apps.core.mixins import UUIDModelMixin
+
+from .utils import PIXELSET_EXPORT_FORMAT_CSV, PIXELSET_EXPORT_FORMATS
+
+# Connect signal receivers
+from .cache import invalidate_export_cache  # noqa
+from .facets import invalidate_facet_counts  # noqa
+from .hierarchies import invalidate_hierarchies_on_change  # noqa
+from .search import invalidate_search_terms  # noqa
+
+
+class ExportJob(UUIDModelMixin, models.Model):
+    """An export of selected pixel sets, built in the background
+    """
+
+    def archive_upload_to(instance, filename):
+        return '{}/exports/{}/{}'.format(
+            instance.created_by.id,
+            instance.id,
+            filename
+        )
+
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_ERROR = 'error'
+    STATUS_CHOICES = (
+        (STATUS_PENDING, _("Pending")),
+        (STATUS_RUNNING, _("Running")),
+        (STATUS_DONE, _("Done")),
+        (STATUS_ERROR, _("Error")),
+    )
+
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False
+    )
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='export_jobs',
+        related_query_name='export_job',
+    )
+
+    pixel_sets = models.ManyToManyField(
+        'core.PixelSet',
+        related_name='export_jobs',
+        related_query_name='export_job',
+    )
+
+    search_terms = ArrayField(
+        models.TextField(),
+        default=list(),
+        blank=True,
+    )
+
+    format = models.CharField(
+        _("Format"),
+        max_length=20,
+        choices=[(f, f) for f in PIXELSET_EXPORT_FORMATS],
+        default=PIXELSET_EXPORT_FORMAT_CSV,
+    )
+
+    status = models.CharField(
+        _("Status"),
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+    )
+
+    archive = models.FileField(
+        _("Exported archive"),
+        upload_to=archive_upload_to,
+        max_length=255,
+        blank=True,
+    )
+
+    error = models.TextField(
+        _("Error"),
+        blank=True,
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        editable=False
+    )
+
+    finished_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        editable=False
+    )
+
+    class Meta:
+        ordering = ('-created_at', )
+        verbose_name = _("Export job")
+        verbose_name_plural = _("Export jobs")
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_DONE, self.STATUS_ERROR)
+
+    def get_status_url(self):
+        return reverse(
+            'explorer:export_job_status',
+            kwargs={'pk': str(self.id)}
+        )
+
+    def get_download_url(self):
+        return reverse(
+            'explorer:export_job_download',
+            kwargs={'pk': str(self.id)}
+        )
@@ -0,0 +1,158 @@
+import base64
+import json
+
+from django.db.models import Q
+from django.db.models.fields.files import FieldFile
+
+from .utils.sql import get_approximate_count
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(
+        json.dumps(values).encode('utf-8')
+    ).decode('ascii')
+
+
+def decode_cursor(cursor, length):
+    try:
+        values = json.loads(
+            base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        )
+    except (TypeError, ValueError, UnicodeError):
+        raise InvalidCursor(cursor)
+
+    if not isinstance(values, list) or len(values) != length:
+        raise InvalidCursor(cursor)
+
+    return values
+
+
+class KeysetPage(object):
+
+    def __init__(self, object_list, paginator, has_next, has_previous,
+                 queryset=None):
+
+        self.object_list = object_list
+        self.paginator = paginator
+        # the queryset the page has been fetched from
+        self.queryset = queryset
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_cursor(self):
+        if not self.has_next() or not self.object_list:
+            return None
+        return self.paginator.get_cursor(self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        if not self.has_previous() or not self.object_list:
+            return None
+        return self.paginator.get_cursor(self.object_list[0])
+
+
+class KeysetPaginator(object):
+    """Keyset (a.k.a. seek) pagination.
+
+    Instead of skipping `OFFSET` rows, a page is the `per_page` rows that
+    come right after (or before) the ordering key of a given row. Deep pages
+    cost the same as the first one, and no `COUNT` query is required: the
+    total number of objects is only estimated by the query planner (when
+    `approximate_count` is set).
+
+    The ordering fields should all be ascending and end with a unique field.
+    """
+
+    def __init__(self, queryset, per_page, ordering, approximate_count=True):
+
+        self.queryset = queryset.order_by(*ordering)
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.approximate_count = approximate_count
+
+    @property
+    def count(self):
+        if not self.approximate_count:
+            return None
+        return get_approximate_count(self.queryset)
+
+    def get_cursor(self, obj):
+
+        values = []
+        for field in self.ordering:
+            value = getattr(obj, field)
+            if isinstance(value, FieldFile):
+                value = value.name
+            values.append(str(value))
+        return encode_cursor(values)
+
+    def _get_seek_filter(self, values, lookup):
+        """Build `(f1, f2, f3) > (v1, v2, v3)` (or `<`) as a `Q` object."""
+
+        clauses = Q()
+        for i, field in enumerate(self.ordering):
+            clause = Q(**{f'{field}__{lookup}': values[i]})
+            for previous_field, value in zip(self.ordering[:i], values):
+                clause &= Q(**{previous_field: value})
+            clauses |= clause
+        return clauses
+
+    def page(self, after=None, before=None):
+        """Return the page following the `after` cursor, or preceding the
+        `before` cursor (or the first page).
+        """
+
+        qs = self.queryset
+
+        if before is not None:
+            values = decode_cursor(before, len(self.ordering))
+            qs = qs.filter(self._get_seek_filter(values, 'lt')).reverse()
+        elif after is not None:
+            values = decode_cursor(after, len(self.ordering))
+            qs = qs.filter(self._get_seek_filter(values, 'gt'))
+
+        # fetch an extra row to know if there is another page
+        object_list = list(qs[:self.per_page + 1])
+        has_more = len(object_list) > self.per_page
+        object_list = object_list[:self.per_page]
+
+        if before is not None:
+            object_list.reverse()
+            return KeysetPage(
+                object_list,
+                self,
+                has_next=True,
+                has_previous=has_more,
+                queryset=qs,
+            )
+
+        return KeysetPage(
+            object_list,
+            self,
+            has_next=has_more,
+            has_previous=after is not None,
+            queryset=qs,
+        )
@@ -0,0 +1,94 @@
+import hashlib
+import json
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.dispatch import receiver
+
+from apps.core.models import OmicsUnit
+from apps.data.models import Entry
+from apps.submission.signals import importation_done
+
+
+SEARCH_TERMS_CACHE_PREFIX = 'explorer:search_terms'
+SEARCH_TERMS_GENERATION_KEY = f'{SEARCH_TERMS_CACHE_PREFIX}:generation'
+
+
+def normalize_search_terms(search_terms):
+    """Return the sorted list of unique (stripped, non-empty) search terms."""
+
+    return sorted(
+        set(term.strip() for term in (search_terms or []) if term.strip())
+    )
+
+
+def _new_generation():
+    # random tokens: a new generation never matches an evicted one
+    return uuid.uuid4().hex
+
+
+def _get_generation():
+    generation = cache.get(SEARCH_TERMS_GENERATION_KEY)
+    if generation is None:
+        cache.add(SEARCH_TERMS_GENERATION_KEY, _new_generation(), None)
+        generation = cache.get(SEARCH_TERMS_GENERATION_KEY)
+    return generation
+
+
+def get_search_terms_cache_key(search_terms):
+
+    digest = hashlib.sha256(
+        json.dumps(normalize_search_terms(search_terms)).encode('utf-8')
+    ).hexdigest()
+
+    return f'{SEARCH_TERMS_CACHE_PREFIX}:{_get_generation()}:{digest}'
+
+
+def resolve_search_terms(search_terms):
+    """Resolve search terms to the ids of the matching omics units.
+
+    Omics units match when the identifier of their reference is one of the
+    search terms or when its description contains all of them. The result is
+    cached for `SEARCH_TERMS_CACHE_TIMEOUT` seconds, so that the many queries
+    of a page filtered by the same search terms only resolve them once.
+
+    Parameters
+    ----------
+    search_terms : list
+        A list of search terms.
+
+    Returns
+    -------
+    frozenset
+        The ids of the matching omics units.
+
+    """
+
+    key = get_search_terms_cache_key(search_terms)
+
+    omics_unit_ids = cache.get(key)
+    if omics_unit_ids is None:
+        entries = Entry.objects.search(
+            normalize_search_terms(search_terms)
+        ).order_by().values('id')
+
+        omics_unit_ids = frozenset(
+            OmicsUnit.objects.filter(
+                reference__in=entries
+            ).values_list('id', flat=True)
+        )
+        cache.set(key, omics_unit_ids, settings.SEARCH_TERMS_CACHE_TIMEOUT)
+
+    return omics_unit_ids
+
+
+def invalidate_search_terms_cache():
+    """Forget all resolved search terms (e.g. new omics units exist)."""
+
+    cache.set(SEARCH_TERMS_GENERATION_KEY, _new_generation(), None)
+
+
+@receiver(importation_done)
+def invalidate_search_terms(sender, **kwargs):
+    invalidate_search_terms_cache()
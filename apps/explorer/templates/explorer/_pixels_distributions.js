@@ -4,13 +4,33 @@
   var $valuesContainer = document.getElementById('{{ id_values|default:"values-histogram" }}');
   var $scoresContainer = document.getElementById('{{ id_scores|default:"scores-histogram" }}');
 
-  var valuesChart = new google.visualization.Histogram($valuesContainer);
-  var scoresChart = new google.visualization.Histogram($scoresContainer);
+  var valuesChart = new google.visualization.ColumnChart($valuesContainer);
+  var scoresChart = new google.visualization.ColumnChart($scoresContainer);
+
+  {# Bins are computed server-side: endpoints send `edges` and `counts` #}
+  var toDataTable = function (data) {
+    var table = new google.visualization.DataTable();
+    var format = function (edge) {
+      return edge.toPrecision(3);
+    };
+
+    table.addColumn('string', data.label);
+    table.addColumn('number', '{% trans "Count" %}');
+    table.addRows(data.counts.map(function (count, i) {
+      return [
+        format(data.edges[i]) + ' – ' + format(data.edges[i + 1]),
+        count
+      ];
+    }));
+
+    return table;
+  };
 
   $.get('{{ url_values }}', function (data) {
     valuesChart.draw(
-      new google.visualization.DataTable(data),
+      toDataTable(data),
       {
+        bar: { groupWidth: '100%' },
         colors: ['#bd2222'],
         height: 300,
         legend: { position: 'none' },
@@ -23,8 +43,9 @@
 
   $.get('{{ url_scores }}', function (data) {
     scoresChart.draw(
-      new google.visualization.DataTable(data),
+      toDataTable(data),
       {
+        bar: { groupWidth: '100%' },
         height: 300,
         legend: { position: 'none' },
         title: '{% trans "Quality scores" %}',
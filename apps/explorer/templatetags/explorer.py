@@ -1,9 +1,9 @@
-import re
-
 from django import template
 from django.template.defaultfilters import stringfilter
 from django.utils.safestring import mark_safe
 
+from ..highlight import get_highlighter
+
 
 register = template.Library()
 
@@ -25,14 +25,7 @@ def highlight_terms(text, words):
     if not words:
         return mark_safe(text)
 
-    return mark_safe(
-        re.sub(
-            r'({})'.format('|'.join(words)),
-            '<span class="highlight">\\1</span>',
-            text,
-            flags=re.IGNORECASE
-        )
-    )
+    return mark_safe(get_highlighter(words).highlight(text))
 
 
 @register.filter
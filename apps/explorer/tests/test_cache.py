@@ -0,0 +1,178 @@
+import shutil
+
+from tempfile import mkdtemp
+
+from apps.core import factories
+from apps.core.tests import CoreFixturesTestCase
+from apps.submission.signals import importation_done
+
+from ..cache import ExportCache
+
+
+class ExportCacheTestCase(CoreFixturesTestCase):
+
+    def setUp(self):
+
+        self.root = mkdtemp()
+        self.cache = ExportCache(root=self.root, max_size=1024)
+        self.pixel_sets = factories.PixelSetFactory.create_batch(2)
+        self.pixel_set_ids = [p.id for p in self.pixel_sets]
+
+    def tearDown(self):
+
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def read(self, key):
+
+        cached = self.cache.get(key)
+        if cached is None:
+            return None
+        with cached:
+            return cached.read()
+
+    def test_disabled(self):
+
+        cache = ExportCache(root=self.root, max_size=0)
+        key = cache.get_key('pixelsets', self.pixel_set_ids)
+
+        chunks = list(cache.cache_stream(key, self.pixel_set_ids, [b'foo']))
+
+        assert chunks == [b'foo']
+        assert cache.get(key) is None
+
+    def test_get_key(self):
+
+        key = self.cache.get_key(
+            'pixelsets',
+            self.pixel_set_ids,
+            search_terms=['YAL001C', 'YAL002W'],
+            format='csv',
+        )
+
+        # order of pixel sets and search terms does not matter
+        assert key == self.cache.get_key(
+            'pixelsets',
+            reversed(self.pixel_set_ids),
+            search_terms=[' YAL002W', 'YAL001C', 'YAL001C'],
+            format='csv',
+        )
+
+        assert key != self.cache.get_key(
+            'pixelsets',
+            self.pixel_set_ids,
+            search_terms=['YAL001C', 'YAL002W'],
+            format='parquet',
+        )
+        assert key != self.cache.get_key(
+            'html',
+            self.pixel_set_ids,
+            search_terms=['YAL001C', 'YAL002W'],
+            format='csv',
+        )
+        assert key != self.cache.get_key(
+            'pixelsets',
+            self.pixel_set_ids[:1],
+            search_terms=['YAL001C', 'YAL002W'],
+            format='csv',
+        )
+
+    def test_get_key_changes_with_pixel_set_version(self):
+
+        key = self.cache.get_key('pixelsets', self.pixel_set_ids)
+
+        self.pixel_sets[0].bump_version()
+
+        assert key != self.cache.get_key('pixelsets', self.pixel_set_ids)
+
+    def test_cache_stream(self):
+
+        key = self.cache.get_key('pixelsets', self.pixel_set_ids)
+        assert self.cache.get(key) is None
+
+        stream = self.cache.cache_stream(
+            key,
+            self.pixel_set_ids,
+            [b'foo', 'bar']
+        )
+        assert next(stream) == b'foo'
+        # the entry is stored once all chunks have been consumed
+        assert self.cache.get(key) is None
+
+        assert list(stream) == ['bar']
+        assert self.read(key) == b'foobar'
+
+    def test_interrupted_stream_is_not_cached(self):
+
+        key = self.cache.get_key('pixelsets', self.pixel_set_ids)
+
+        stream = self.cache.cache_stream(
+            key,
+            self.pixel_set_ids,
+            [b'foo', b'bar']
+        )
+        next(stream)
+        stream.close()
+
+        assert self.cache.get(key) is None
+        assert list(self.cache.root.iterdir()) == []
+
+    def test_get_opens_the_entry(self):
+
+        key = self.cache.get_key('pixelsets', self.pixel_set_ids)
+        self.cache.set(key, self.pixel_set_ids, b'foo')
+
+        cached = self.cache.get(key)
+        # a concurrent invalidation does not prevent reading an opened entry
+        self.cache.invalidate(self.pixel_set_ids)
+
+        with cached:
+            assert cached.read() == b'foo'
+        assert self.cache.get(key) is None
+
+    def test_evict(self):
+
+        keys = [
+            self.cache.get_key('pixelsets', self.pixel_set_ids, n=n)
+            for n in range(3)
+        ]
+
+        self.cache.set(keys[0], self.pixel_set_ids, b'a' * 500)
+        self.cache.set(keys[1], self.pixel_set_ids, b'b' * 500)
+        # the first entry is now the most recently used one
+        self.read(keys[0])
+        self.cache.set(keys[2], self.pixel_set_ids, b'c' * 500)
+
+        assert self.read(keys[0]) is not None
+        assert self.cache.get(keys[1]) is None
+        assert self.read(keys[2]) is not None
+
+    def test_invalidate(self):
+
+        key_all = self.cache.get_key('pixelsets', self.pixel_set_ids)
+        key_first = self.cache.get_key('pixels', self.pixel_set_ids[:1])
+        key_last = self.cache.get_key('pixels', self.pixel_set_ids[1:])
+
+        self.cache.set(key_all, self.pixel_set_ids, b'foo')
+        self.cache.set(key_first, self.pixel_set_ids[:1], b'foo')
+        self.cache.set(key_last, self.pixel_set_ids[1:], b'foo')
+
+        self.cache.invalidate(self.pixel_set_ids[:1])
+
+        assert self.cache.get(key_all) is None
+        assert self.cache.get(key_first) is None
+        assert self.read(key_last) is not None
+
+    def test_importation_done_invalidates_cache(self):
+
+        key = self.cache.get_key('pixelsets', self.pixel_set_ids)
+        self.cache.set(key, self.pixel_set_ids, b'foo')
+
+        with self.settings(EXPORT_CACHE_ROOT=self.root):
+            importation_done.send(
+                sender=self.__class__,
+                experiment=None,
+                analysis=None,
+                pixel_sets=self.pixel_sets[:1],
+            )
+
+        assert self.cache.get(key) is None
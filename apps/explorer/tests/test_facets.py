@@ -0,0 +1,104 @@
+from django.core.cache import cache
+from django.test import override_settings
+
+from apps.core import factories, models
+from apps.core.tests import CoreFixturesTestCase
+from apps.submission.signals import importation_done
+
+from ..facets import get_facet_counts
+from ..forms import PixelSetFiltersForm
+
+
+@override_settings(FACET_COUNTS_CACHE_TIMEOUT=60)
+class GetFacetCountsTestCase(CoreFixturesTestCase):
+
+    def setUp(self):
+
+        cache.clear()
+
+        self.parent_area = factories.OmicsAreaFactory(name='parent')
+        self.child_area = factories.OmicsAreaFactory(
+            name='child',
+            parent=self.parent_area
+        )
+
+        experiment = factories.ExperimentFactory(omics_area=self.child_area)
+        experiment.tags = 'candida/glabrata'
+        experiment.save()
+
+        analysis = factories.AnalysisFactory(experiments=[experiment, ])
+        self.pixel_sets = factories.PixelSetFactory.create_batch(
+            2,
+            analysis=analysis
+        )
+        for pixel_set in self.pixel_sets:
+            factories.PixelFactory(pixel_set=pixel_set)
+            pixel_set.update_cached_fields()
+
+    def tearDown(self):
+
+        cache.clear()
+
+    def test_get_facet_counts(self):
+
+        counts = get_facet_counts()
+
+        species = models.Species.objects.filter(
+            name__in=self.pixel_sets[0].cached_species
+        ).get()
+        assert counts['species'][str(species.id)] >= 1
+
+        assert counts['omics_areas'][str(self.child_area.id)] == 2
+        # parents count the pixel sets of their descendants
+        assert counts['omics_areas'][str(self.parent_area.id)] == 2
+
+        tag = models.Tag.objects.get(name='candida/glabrata')
+        parent_tag = models.Tag.objects.get(name='candida')
+        assert counts['tags'][str(tag.id)] == 2
+        assert counts['tags'][str(parent_tag.id)] == 2
+
+    def test_facet_counts_are_cached(self):
+
+        expected = get_facet_counts()
+
+        with self.assertNumQueries(0):
+            assert get_facet_counts() == expected
+
+    def test_cache_is_invalidated_by_importations(self):
+
+        get_facet_counts()
+
+        importation_done.send(
+            sender=self.__class__,
+            experiment=None,
+            analysis=None,
+            pixel_sets=[],
+        )
+
+        with self.assertNumQueries(1):
+            get_facet_counts()
+
+
+class PixelSetFiltersFormTestCase(CoreFixturesTestCase):
+
+    def test_labels_with_facet_counts(self):
+
+        species = models.Species.objects.first()
+        other = factories.SpeciesFactory()
+
+        form = PixelSetFiltersForm(facet_counts={
+            'species': {str(species.id): 42},
+        })
+        labels = dict(form.fields['species'].choices)
+
+        assert labels[species.id] == f'{species} (42)'
+        assert labels[other.id] == f'{other} (0)'
+
+    def test_labels_without_facet_counts(self):
+
+        species = models.Species.objects.first()
+
+        form = PixelSetFiltersForm()
+        labels = dict(form.fields['species'].choices)
+
+        assert labels[species.id] == str(species)
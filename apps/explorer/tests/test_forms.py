@@ -1,6 +1,6 @@
 from django.test import TestCase
 
-from apps.explorer.forms import str_to_set
+from apps.explorer.forms import HistogramForm, str_to_set
 
 
 class StrToSetTestCase(TestCase):
@@ -68,3 +68,29 @@ class StrToSetTestCase(TestCase):
         result = str_to_set('a a a')
         assert len(result) == 1
         assert 'a' in result
+
+
+class HistogramFormTestCase(TestCase):
+
+    def test_default_bins(self):
+
+        form = HistogramForm({})
+
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data['bins'], HistogramForm.DEFAULT_BINS)
+        self.assertIsNone(form.cleaned_data['min'])
+        self.assertIsNone(form.cleaned_data['max'])
+
+    def test_bins_limits(self):
+
+        self.assertFalse(HistogramForm({'bins': 0}).is_valid())
+        self.assertFalse(
+            HistogramForm({'bins': HistogramForm.MAX_BINS + 1}).is_valid()
+        )
+
+    def test_invalid_range(self):
+
+        form = HistogramForm({'min': 2, 'max': 1})
+
+        self.assertFalse(form.is_valid())
+        self.assertIn('__all__', form.errors)
@@ -0,0 +1,112 @@
+from django.core.cache import cache
+
+from apps.core import factories, models
+from apps.core.tests import CoreFixturesTestCase
+
+from ..hierarchies import (
+    _get_generation, get_pixel_sets_by_omics_areas, get_pixel_sets_by_tags,
+    invalidate_hierarchies
+)
+
+
+class HierarchiesTestCase(CoreFixturesTestCase):
+
+    def setUp(self):
+
+        cache.clear()
+
+        self.parent_area = factories.OmicsAreaFactory(name='parent')
+        self.child_area = factories.OmicsAreaFactory(
+            name='child',
+            parent=self.parent_area
+        )
+
+        experiment = factories.ExperimentFactory(omics_area=self.child_area)
+        experiment.tags = 'candida/glabrata'
+        experiment.save()
+
+        analysis = factories.AnalysisFactory(experiments=[experiment, ])
+        analysis.tags = 'yeast'
+        analysis.save()
+
+        self.pixel_set = factories.PixelSetFactory(analysis=analysis)
+        self.other_pixel_set = factories.PixelSetFactory()
+
+    def tearDown(self):
+
+        cache.clear()
+
+    def test_get_pixel_sets_by_omics_areas(self):
+
+        expected = frozenset([self.pixel_set.id])
+
+        assert get_pixel_sets_by_omics_areas([self.child_area]) == expected
+        # descendants are included
+        assert get_pixel_sets_by_omics_areas([self.parent_area]) == expected
+
+    def test_get_pixel_sets_by_tags(self):
+
+        expected = frozenset([self.pixel_set.id])
+
+        for name in ('candida/glabrata', 'candida', 'yeast'):
+            tag = models.Tag.objects.get(name=name)
+            assert get_pixel_sets_by_tags([tag]) == expected
+
+    def test_closures_are_memoized(self):
+
+        tags = list(models.Tag.objects.all())
+        expected = get_pixel_sets_by_tags(tags)
+
+        with self.assertNumQueries(0):
+            assert get_pixel_sets_by_tags(tags) == expected
+
+    def test_closures_are_rebuilt_when_hierarchies_change(self):
+
+        grand_child_area = factories.OmicsAreaFactory(
+            name='grand-child',
+            parent=self.child_area
+        )
+        assert get_pixel_sets_by_omics_areas([self.parent_area]) == frozenset(
+            [self.pixel_set.id]
+        )
+
+        experiment = factories.ExperimentFactory(omics_area=grand_child_area)
+        self.other_pixel_set.analysis.experiments.add(experiment)
+
+        assert get_pixel_sets_by_omics_areas([self.parent_area]) == frozenset(
+            [self.pixel_set.id, self.other_pixel_set.id]
+        )
+
+    def test_generations_never_repeat(self):
+
+        generations = [_get_generation()]
+
+        invalidate_hierarchies()
+        generations.append(_get_generation())
+
+        # evicted generation
+        cache.clear()
+        generations.append(_get_generation())
+
+        invalidate_hierarchies()
+        generations.append(_get_generation())
+
+        assert len(set(generations)) == 4
+        assert _get_generation() == generations[-1]
+
+    def test_closures_are_rebuilt_after_eviction(self):
+
+        tag = models.Tag.objects.get(name='yeast')
+        assert get_pixel_sets_by_tags([tag]) == frozenset([self.pixel_set.id])
+
+        # the cache is cleared and the same number of changes happen
+        cache.clear()
+        other_analysis = factories.AnalysisFactory()
+        other_analysis.tags = 'yeast'
+        other_analysis.save()
+        self.other_pixel_set.analysis = other_analysis
+        self.other_pixel_set.save()
+
+        assert get_pixel_sets_by_tags([tag]) == frozenset(
+            [self.pixel_set.id, self.other_pixel_set.id]
+        )
@@ -0,0 +1,67 @@
+import pandas
+
+from django.test import TestCase
+
+from ..highlight import get_highlighter, TermsHighlighter
+
+
+class TermsHighlighterTestCase(TestCase):
+
+    def test_terms_are_sorted_longest_first(self):
+
+        highlighter = TermsHighlighter(['foo', '', 'foobar', 'ba'])
+
+        assert highlighter.terms == ('foobar', 'foo', 'ba')
+
+    def test_highlight_without_terms(self):
+
+        highlighter = TermsHighlighter([])
+
+        assert highlighter.highlight('foo bar') == 'foo bar'
+        assert highlighter.highlight_column(['foo', None]) == ['foo', '']
+
+    def test_highlight_is_case_insensitive(self):
+
+        highlighter = TermsHighlighter(['foo'])
+
+        assert highlighter.highlight('Foo bar') == (
+            '<span class="highlight">Foo</span> bar'
+        )
+
+    def test_highlight_column(self):
+
+        highlighter = TermsHighlighter(['foo', 'baz'])
+        column = pandas.Series(['foo bar', None, 'bar', 'baz foo'])
+
+        assert highlighter.highlight_column(column) == [
+            '<span class="highlight">foo</span> bar',
+            '',
+            'bar',
+            (
+                '<span class="highlight">baz</span> '
+                '<span class="highlight">foo</span>'
+            ),
+        ]
+
+    def test_highlight_many_terms(self):
+
+        terms = [f'YAL{i:03d}C' for i in range(500)]
+        highlighter = TermsHighlighter(terms)
+
+        assert highlighter.highlight('YAL042C gene') == (
+            '<span class="highlight">YAL042C</span> gene'
+        )
+
+
+class GetHighlighterTestCase(TestCase):
+
+    def test_highlighters_are_memoized(self):
+
+        highlighter = get_highlighter(['foo', 'bar'])
+
+        assert get_highlighter(['bar', 'foo', '', 'foo']) is highlighter
+        assert get_highlighter(['foo']) is not highlighter
+
+    def test_no_terms(self):
+
+        assert get_highlighter(None).pattern is None
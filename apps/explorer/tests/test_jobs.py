@@ -0,0 +1,46 @@
+import shutil
+import zipfile
+
+from django.test import override_settings
+from tempfile import mkdtemp
+
+from apps.core import factories
+from apps.core.tests import CoreFixturesTestCase
+
+from ..jobs import run_export_job
+from ..models import ExportJob
+from ..utils import PIXELSET_EXPORT_META_FILENAME
+
+
+class RunExportJobTestCase(CoreFixturesTestCase):
+
+    def setUp(self):
+
+        self.media_root = mkdtemp()
+        self.user = factories.PixelerFactory()
+        self.pixel_sets = factories.PixelSetFactory.create_batch(2)
+        for pixel_set in self.pixel_sets:
+            factories.PixelFactory.create_batch(2, pixel_set=pixel_set)
+
+    def tearDown(self):
+
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def test_run_export_job(self):
+
+        job = ExportJob.objects.create(created_by=self.user)
+        job.pixel_sets.set(self.pixel_sets)
+
+        with override_settings(MEDIA_ROOT=self.media_root):
+            run_export_job(job)
+
+            job.refresh_from_db()
+            assert job.status == ExportJob.STATUS_DONE
+            assert job.finished_at is not None
+            assert job.archive.name == (
+                f'{self.user.id}/exports/{job.id}/pixelsets.zip'
+            )
+
+            with zipfile.ZipFile(job.archive.path) as archive:
+                assert PIXELSET_EXPORT_META_FILENAME in archive.namelist()
+                assert 'pixels.csv' in archive.namelist()
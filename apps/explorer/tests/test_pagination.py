@@ -0,0 +1,95 @@
+import pytest
+
+from apps.core import factories
+from apps.core.models import PixelSet
+from apps.core.tests import CoreFixturesTestCase
+
+from ..pagination import (
+    InvalidCursor, KeysetPaginator, decode_cursor, encode_cursor
+)
+
+
+class CursorTestCase(CoreFixturesTestCase):
+
+    def test_encode_decode_cursor(self):
+
+        values = ['foo', 'bar/baz.csv', '42']
+
+        assert decode_cursor(encode_cursor(values), 3) == values
+
+    def test_decode_invalid_cursor(self):
+
+        with pytest.raises(InvalidCursor):
+            decode_cursor('not a cursor', 3)
+
+        with pytest.raises(InvalidCursor):
+            decode_cursor(encode_cursor(['foo']), 3)
+
+
+class KeysetPaginatorTestCase(CoreFixturesTestCase):
+
+    ordering = ('analysis_id', 'pixels_file', 'id')
+
+    def setUp(self):
+
+        analysis = factories.AnalysisFactory()
+        factories.PixelSetFactory.create_batch(3, analysis=analysis)
+        factories.PixelSetFactory.create_batch(4)
+
+        self.expected = list(PixelSet.objects.order_by(*self.ordering))
+        self.paginator = KeysetPaginator(
+            PixelSet.objects.all(),
+            per_page=3,
+            ordering=self.ordering,
+        )
+
+    def test_first_page(self):
+
+        page = self.paginator.page()
+
+        assert list(page) == self.expected[:3]
+        assert page.has_next()
+        assert not page.has_previous()
+        assert page.previous_cursor is None
+
+    def test_next_pages(self):
+
+        page = self.paginator.page()
+        page = self.paginator.page(after=page.next_cursor)
+
+        assert list(page) == self.expected[3:6]
+        assert page.has_next()
+        assert page.has_previous()
+
+        page = self.paginator.page(after=page.next_cursor)
+
+        assert list(page) == self.expected[6:]
+        assert not page.has_next()
+        assert page.next_cursor is None
+
+    def test_previous_page(self):
+
+        page = self.paginator.page()
+        page = self.paginator.page(after=page.next_cursor)
+        page = self.paginator.page(before=page.previous_cursor)
+
+        assert list(page) == self.expected[:3]
+        assert page.has_next()
+        assert not page.has_previous()
+
+    def test_page_does_not_count(self):
+
+        with self.assertNumQueries(1):
+            self.paginator.page()
+
+    def test_approximate_count(self):
+
+        assert isinstance(self.paginator.count, int)
+
+        paginator = KeysetPaginator(
+            PixelSet.objects.all(),
+            per_page=3,
+            ordering=self.ordering,
+            approximate_count=False,
+        )
+        assert paginator.count is None
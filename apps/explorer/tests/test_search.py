@@ -0,0 +1,84 @@
+from django.core.cache import cache
+from django.test import override_settings
+
+from apps.core import factories
+from apps.core.tests import CoreFixturesTestCase
+from apps.data.factories import EntryFactory
+from apps.submission.signals import importation_done
+
+from ..search import (
+    get_search_terms_cache_key, normalize_search_terms, resolve_search_terms
+)
+
+
+class NormalizeSearchTermsTestCase(CoreFixturesTestCase):
+
+    def test_normalize_search_terms(self):
+
+        assert normalize_search_terms(None) == []
+        assert normalize_search_terms(['foo ', '', ' ', 'bar', 'foo']) == [
+            'bar', 'foo'
+        ]
+
+
+@override_settings(SEARCH_TERMS_CACHE_TIMEOUT=60)
+class ResolveSearchTermsTestCase(CoreFixturesTestCase):
+
+    def setUp(self):
+
+        cache.clear()
+
+        self.omics_units = [
+            factories.OmicsUnitFactory(
+                reference=EntryFactory(identifier=identifier, description=d)
+            )
+            for identifier, d in (
+                ('YAL001C', 'lorem ipsum'),
+                ('YAL002W', 'dolor sit amet'),
+                ('YAL003W', 'lorem sit'),
+            )
+        ]
+
+    def tearDown(self):
+
+        cache.clear()
+
+    def test_resolve_search_terms(self):
+
+        assert resolve_search_terms(['YAL001C', 'YAL002W']) == frozenset([
+            self.omics_units[0].id, self.omics_units[1].id
+        ])
+        assert resolve_search_terms(['lorem', 'SIT']) == frozenset([
+            self.omics_units[2].id
+        ])
+        assert resolve_search_terms(['foo']) == frozenset()
+
+    def test_resolved_search_terms_are_cached(self):
+
+        expected = resolve_search_terms(['lorem'])
+
+        with self.assertNumQueries(0):
+            assert resolve_search_terms([' lorem', 'lorem']) == expected
+
+    def test_cache_is_invalidated_by_importations(self):
+
+        key = get_search_terms_cache_key(['lorem'])
+        resolve_search_terms(['lorem'])
+
+        importation_done.send(
+            sender=self.__class__,
+            experiment=None,
+            analysis=None,
+            pixel_sets=[],
+        )
+
+        assert get_search_terms_cache_key(['lorem']) != key
+        with self.assertNumQueries(1):
+            resolve_search_terms(['lorem'])
+
+    def test_cache_key_changes_after_eviction(self):
+
+        key = get_search_terms_cache_key(['lorem'])
+
+        cache.clear()
+        assert get_search_terms_cache_key(['lorem']) != key
@@ -67,3 +67,19 @@ class HighlightTermsTestCase(TestCase):
             'foo bar baz nope foo bar baz',
             ['foo']
         ) == expected
+
+    def test_escapes_terms(self):
+
+        expected = (
+            'axb <span class="highlight">a.b</span> '
+            '<span class="highlight">(</span>c'
+        )
+        assert explorer.highlight_terms('axb a.b (c', ['a.b', '(']) == expected
+
+    def test_matches_longest_terms_first(self):
+
+        expected = '<span class="highlight">YAL001C</span> gene'
+        assert explorer.highlight_terms(
+            'YAL001C gene',
+            ['YAL001', 'YAL001C']
+        ) == expected
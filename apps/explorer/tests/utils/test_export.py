@@ -1,17 +1,24 @@
 import pandas
+import pyarrow.feather
+import pyarrow.parquet
 import pytest
 import yaml
 import zipfile
 
+from io import BytesIO
+
 from apps.core import factories
 from apps.core.models import PixelSet
 from apps.core.tests import CoreFixturesTestCase
 from apps.data.factories import EntryFactory
 
 from ...utils import (
+    PIXELSET_EXPORT_FORMAT_FEATHER, PIXELSET_EXPORT_FORMAT_PARQUET,
     PIXELSET_EXPORT_META_FILENAME, PIXELSET_EXPORT_PIXELS_FILENAME,
     export_pixelsets, export_pixels, export_pixelsets_as_html,
+    export_pixels_as_stream, export_pixelsets_as_stream, get_pixels_filename,
 )
+from ...utils.export import _get_pixels_columns
 
 
 class ExportPixelSetsTestCase(CoreFixturesTestCase):
@@ -189,6 +196,111 @@ class ExportPixelSetsTestCase(CoreFixturesTestCase):
                 assert (pixels_csv[col_3][row] ==
                         pytest.approx(pixel.quality_score))
 
+    def test_export_pixelsets_sorts_rows_by_omics_unit(self):
+
+        pixel_sets = factories.PixelSetFactory.create_batch(2)
+        for pixel_set in pixel_sets:
+            factories.PixelFactory.create_batch(3, pixel_set=pixel_set)
+
+        zip_archive = self._export_pixelsets(pixel_sets)
+        self._assert_archive_is_valid(zip_archive)
+
+        with zip_archive.open(PIXELSET_EXPORT_PIXELS_FILENAME) as pixels_file:
+            pixels_csv = pandas.read_csv(pixels_file)
+
+            # one row per omics unit
+            assert len(pixels_csv.index) == 6
+
+            omics_units = list(pixels_csv['Omics Unit'])
+            assert omics_units == sorted(omics_units)
+
+    def test_export_pixelsets_as_parquet(self):
+
+        pixel_sets = factories.PixelSetFactory.create_batch(2)
+        for pixel_set in pixel_sets:
+            factories.PixelFactory.create_batch(3, pixel_set=pixel_set)
+
+        stream = export_pixelsets(
+            pixel_sets,
+            format=PIXELSET_EXPORT_FORMAT_PARQUET
+        )
+        zip_archive = zipfile.ZipFile(stream, mode='r')
+
+        pixels_filename = get_pixels_filename(PIXELSET_EXPORT_FORMAT_PARQUET)
+        assert pixels_filename == 'pixels.parquet'
+        assert zip_archive.namelist() == [
+            PIXELSET_EXPORT_META_FILENAME,
+            pixels_filename,
+        ]
+
+        with zip_archive.open(pixels_filename) as pixels_file:
+            df = pyarrow.parquet.read_table(
+                BytesIO(pixels_file.read())
+            ).to_pandas()
+
+            assert len(df.index) == 6
+            assert len(df.columns) == (2 * len(pixel_sets)) + 2
+            for column in df.columns[2:]:
+                assert df[column].dtype == float
+
+    def test_export_pixelsets_as_feather(self):
+
+        pixel_sets = factories.PixelSetFactory.create_batch(1)
+
+        stream = export_pixelsets(
+            pixel_sets,
+            format=PIXELSET_EXPORT_FORMAT_FEATHER
+        )
+        zip_archive = zipfile.ZipFile(stream, mode='r')
+
+        pixels_filename = get_pixels_filename(PIXELSET_EXPORT_FORMAT_FEATHER)
+        with zip_archive.open(pixels_filename) as pixels_file:
+            df = pyarrow.feather.read_feather(BytesIO(pixels_file.read()))
+
+            assert len(df.index) == 0
+            assert len(df.columns) == 4
+
+    def test_export_pixelsets_with_unsupported_format(self):
+
+        with pytest.raises(ValueError):
+            export_pixelsets(PixelSet.objects.none(), format='xlsx')
+
+
+class ExportPixelSetsAsStreamTestCase(CoreFixturesTestCase):
+
+    def test_streams_a_valid_archive(self):
+
+        pixel_sets = factories.PixelSetFactory.create_batch(2)
+        for pixel_set in pixel_sets:
+            factories.PixelFactory.create_batch(3, pixel_set=pixel_set)
+
+        chunks = list(
+            export_pixelsets_as_stream(pixel_sets, buffer_size=64)
+        )
+
+        # meta, several CSV chunks and the central directory
+        assert len(chunks) > 3
+
+        zip_archive = zipfile.ZipFile(BytesIO(b''.join(chunks)), mode='r')
+        assert zip_archive.testzip() is None
+
+        with zip_archive.open(PIXELSET_EXPORT_PIXELS_FILENAME) as pixels_file:
+            pixels_csv = pandas.read_csv(pixels_file)
+
+            assert len(pixels_csv.index) == 6
+            assert len(pixels_csv.columns) == (2 * len(pixel_sets)) + 2
+
+    def test_streams_csv_header_without_pixels(self):
+
+        chunks = export_pixelsets_as_stream(PixelSet.objects.none())
+
+        zip_archive = zipfile.ZipFile(BytesIO(b''.join(chunks)), mode='r')
+
+        with zip_archive.open(PIXELSET_EXPORT_PIXELS_FILENAME) as pixels_file:
+            pixels_csv = pandas.read_csv(pixels_file)
+
+            assert list(pixels_csv.columns) == ['Omics Unit', 'Description']
+
 
 class ExportPixelsTestCase(CoreFixturesTestCase):
 
@@ -316,6 +428,87 @@ class ExportPixelsTestCase(CoreFixturesTestCase):
 
         assert len(pixels_csv['Omics Unit'].items()) == 1
 
+    def test_export_pixels_as_parquet(self):
+
+        pixel_set = factories.PixelSetFactory.create()
+        pixels = factories.PixelFactory.create_batch(3, pixel_set=pixel_set)
+
+        output = export_pixels(
+            pixel_set,
+            format=PIXELSET_EXPORT_FORMAT_PARQUET
+        )
+        output.seek(0)
+        df = pyarrow.parquet.read_table(output).to_pandas()
+
+        assert list(df.columns) == ['Omics Unit', 'Value', 'QS']
+        assert sorted(df['Value']) == pytest.approx(
+            sorted(pixel.value for pixel in pixels)
+        )
+
+
+class ExportPixelsAsStreamTestCase(CoreFixturesTestCase):
+
+    def test_streams_header_for_empty_pixel_set(self):
+
+        pixel_set = factories.PixelSetFactory.create()
+
+        chunks = list(export_pixels_as_stream(pixel_set))
+
+        assert b''.join(chunks) == b'Omics Unit,Value,QS\n'
+
+    def test_streams_pixels_by_chunks(self):
+
+        pixel_set = factories.PixelSetFactory.create()
+        factories.PixelFactory.create_batch(5, pixel_set=pixel_set)
+
+        chunks = list(export_pixels_as_stream(pixel_set, buffer_size=64))
+
+        assert len(chunks) > 1
+        assert all(len(chunk) >= 64 for chunk in chunks[:-1])
+
+        pixels_csv = pandas.read_csv(BytesIO(b''.join(chunks)))
+        assert len(pixels_csv.index) == 5
+
+    def test_connection_is_usable_after_closing_the_stream(self):
+
+        pixel_set = factories.PixelSetFactory.create()
+        factories.PixelFactory.create_batch(5, pixel_set=pixel_set)
+
+        stream = export_pixels_as_stream(pixel_set, buffer_size=64)
+        next(stream)
+        stream.close()
+
+        assert pixel_set.pixels.count() == 5
+
+    def test_streams_same_content_as_export_pixels(self):
+
+        pixel_set = factories.PixelSetFactory.create()
+        factories.PixelFactory.create_batch(5, pixel_set=pixel_set)
+        factories.PixelFactory.create(
+            pixel_set=pixel_set,
+            value=0.12345678901234568,
+        )
+
+        content = b''.join(export_pixels_as_stream(pixel_set))
+
+        assert content.decode('utf-8') == export_pixels(pixel_set).getvalue()
+
+    def test_uses_na_for_missing_quality_scores(self):
+
+        pixel_set = factories.PixelSetFactory.create()
+        pixel = factories.PixelFactory.create(
+            pixel_set=pixel_set,
+            quality_score=None,
+        )
+
+        content = b''.join(export_pixels_as_stream(pixel_set))
+
+        row = content.decode('utf-8').splitlines()[1]
+        identifier, value, quality_score = row.split(',')
+        assert identifier == pixel.omics_unit.reference.identifier
+        assert float(value) == pixel.value
+        assert quality_score == 'NA'
+
 
 class ExportPixelsetsAsHtmlTestCase(CoreFixturesTestCase):
 
@@ -481,6 +674,36 @@ class ExportPixelsetsAsHtmlTestCase(CoreFixturesTestCase):
         self.assertInHTML('<th>0</th>', html)
         self.assertNotInHTML('<th>1</th>', html)
 
+    def test_limits_number_of_fetched_omics_units(self):
+
+        pixel_sets = factories.PixelSetFactory.create_batch(2)
+        entries = [
+            EntryFactory.create(identifier=identifier)
+            for identifier in ('YAL003W', 'YAL001C', 'YAL002W')
+        ]
+        for pixel_set in pixel_sets:
+            for entry in entries:
+                factories.PixelFactory.create(
+                    omics_unit__reference=entry,
+                    pixel_set=pixel_set
+                )
+
+        pixels = _get_pixels_columns(
+            [pixel_set.id for pixel_set in pixel_sets],
+            limit=2
+        )
+
+        assert len(pixels['omics_unit']) == 4
+        assert sorted(set(pixels['omics_unit'])) == ['YAL001C', 'YAL002W']
+
+        html = export_pixelsets_as_html(
+            pixel_set_ids=[pixel_set.id for pixel_set in pixel_sets],
+            display_limit=2
+        )
+        assert 'YAL001C' in html
+        assert 'YAL002W' in html
+        assert 'YAL003W' not in html
+
     def test_filters_by_omics_units(self):
 
         pixel_set = factories.PixelSetFactory.create()
@@ -561,3 +784,41 @@ class ExportPixelsetsAsHtmlTestCase(CoreFixturesTestCase):
         self.assertNotInHTML('<th>1</th>', html)
 
         self.assertIn('<span class="highlight">', html)
+
+
+class GetPixelsColumnsTestCase(CoreFixturesTestCase):
+
+    def test_returns_empty_columns_without_pixelsets(self):
+
+        with self.assertNumQueries(0):
+            columns = _get_pixels_columns([])
+
+        assert len(columns) == 6
+        assert all(len(column) == 0 for column in columns.values())
+
+    def test_fetches_all_pixelsets_with_a_single_query(self):
+
+        pixel_sets = factories.PixelSetFactory.create_batch(3)
+        for pixel_set in pixel_sets:
+            factories.PixelFactory.create_batch(2, pixel_set=pixel_set)
+
+        with self.assertNumQueries(1):
+            columns = _get_pixels_columns([p.id for p in pixel_sets])
+
+        assert len(columns['pixel_set_id']) == 6
+        assert set(columns['pixel_set_id']) == set(p.id for p in pixel_sets)
+        assert all(len(column) == 6 for column in columns.values())
+
+    def test_filters_by_search_terms(self):
+
+        pixel_set = factories.PixelSetFactory.create()
+        pixels = factories.PixelFactory.create_batch(2, pixel_set=pixel_set)
+        identifier = pixels[0].omics_unit.reference.identifier
+
+        columns = _get_pixels_columns(
+            [pixel_set.id],
+            search_terms=[identifier]
+        )
+
+        assert columns['omics_unit'] == [identifier]
+        assert columns['value'] == [pytest.approx(pixels[0].value)]
@@ -0,0 +1,62 @@
+from apps.core import factories
+from apps.core.models import Pixel
+from apps.core.tests import CoreFixturesTestCase
+
+from ...utils.histogram import get_histogram
+
+
+class GetHistogramTestCase(CoreFixturesTestCase):
+
+    def setUp(self):
+
+        self.pixel_set = factories.PixelSetFactory()
+        for value in (0., 1., 1.5, 2., 4.):
+            factories.PixelFactory(pixel_set=self.pixel_set, value=value)
+
+        self.qs = Pixel.objects.filter(pixel_set=self.pixel_set)
+
+    def test_empty_queryset(self):
+
+        histogram = get_histogram(Pixel.objects.none(), 'value', bins=4)
+
+        self.assertEqual(histogram, {'edges': [], 'counts': []})
+
+    def test_bins_span_values_range(self):
+
+        histogram = get_histogram(self.qs, 'value', bins=4)
+
+        self.assertEqual(histogram['edges'], [0., 1., 2., 3., 4.])
+        # the maximum value belongs to the last bin
+        self.assertEqual(histogram['counts'], [1, 2, 1, 1])
+
+    def test_with_range(self):
+
+        histogram = get_histogram(self.qs, 'value', bins=2, low=1., high=2.)
+
+        self.assertEqual(histogram['edges'], [1., 1.5, 2.])
+        # values outside the range are ignored
+        self.assertEqual(histogram['counts'], [1, 2])
+
+    def test_with_lower_bound_only(self):
+
+        histogram = get_histogram(self.qs, 'value', bins=2, low=2.)
+
+        self.assertEqual(histogram['edges'], [2., 3., 4.])
+        self.assertEqual(histogram['counts'], [1, 1])
+
+    def test_single_value(self):
+
+        qs = self.qs.filter(value=1.5)
+
+        histogram = get_histogram(qs, 'value', bins=1)
+
+        self.assertEqual(histogram['edges'], [1., 2.])
+        self.assertEqual(histogram['counts'], [1])
+
+    def test_number_of_queries(self):
+
+        with self.assertNumQueries(1):
+            get_histogram(self.qs, 'value', bins=10, low=0., high=4.)
+
+        with self.assertNumQueries(2):
+            get_histogram(self.qs, 'value', bins=10)
@@ -0,0 +1,133 @@
+import pandas
+import pytest
+
+from django.db.models import F
+from io import BytesIO, StringIO
+
+from apps.core import factories
+from apps.core.models import Pixel
+from apps.core.tests import CoreFixturesTestCase
+
+from ...utils.sql import copy_to_csv
+
+
+class CopyToCsvTestCase(CoreFixturesTestCase):
+
+    columns = [
+        ('omics_unit_identifier', 'Omics Unit'),
+        ('value', 'Value'),
+        ('quality_score', 'QS'),
+    ]
+
+    def _get_queryset(self, **filters):
+
+        return Pixel.objects.filter(**filters).order_by().annotate(
+            omics_unit_identifier=F('omics_unit__reference__identifier'),
+        ).values_list(
+            'omics_unit_identifier',
+            'value',
+            'quality_score',
+        )
+
+    def test_writes_headers_for_empty_queryset(self):
+
+        pixel_set = factories.PixelSetFactory.create()
+
+        output = copy_to_csv(
+            self._get_queryset(pixel_set=pixel_set),
+            self.columns,
+            StringIO()
+        )
+
+        assert output.getvalue() == 'Omics Unit,Value,QS\n'
+
+    def test_writes_headers_for_empty_result_set(self):
+
+        output = copy_to_csv(
+            self._get_queryset(pixel_set_id__in=[]),
+            self.columns,
+            StringIO()
+        )
+
+        assert output.getvalue() == 'Omics Unit,Value,QS\n'
+
+    def test_writes_rows(self):
+
+        pixel_set = factories.PixelSetFactory.create()
+        pixels = factories.PixelFactory.create_batch(3, pixel_set=pixel_set)
+
+        output = copy_to_csv(
+            self._get_queryset(pixel_set=pixel_set),
+            self.columns,
+            BytesIO(),
+            order_by='omics_unit_identifier'
+        )
+        output.seek(0)
+
+        pixels_csv = pandas.read_csv(output)
+        pixels = sorted(
+            pixels,
+            key=lambda pixel: pixel.omics_unit.reference.identifier
+        )
+
+        assert list(pixels_csv['Omics Unit']) == [
+            pixel.omics_unit.reference.identifier for pixel in pixels
+        ]
+        assert list(pixels_csv['Value']) == pytest.approx(
+            [pixel.value for pixel in pixels]
+        )
+
+    def test_writes_na_for_missing_values(self):
+
+        pixel_set = factories.PixelSetFactory.create()
+        factories.PixelFactory.create(pixel_set=pixel_set, quality_score=None)
+
+        output = copy_to_csv(
+            self._get_queryset(pixel_set=pixel_set),
+            self.columns,
+            StringIO()
+        )
+
+        assert output.getvalue().splitlines()[1].endswith(',NA')
+
+    def test_writes_floats_with_full_precision(self):
+
+        value = 0.12345678901234568
+        quality_score = 1.0000000000000002e-05
+        pixel_set = factories.PixelSetFactory.create()
+        factories.PixelFactory.create(
+            pixel_set=pixel_set,
+            value=value,
+            quality_score=quality_score,
+        )
+
+        output = copy_to_csv(
+            self._get_queryset(pixel_set=pixel_set),
+            self.columns,
+            StringIO()
+        )
+
+        row = output.getvalue().splitlines()[1]
+        __, csv_value, csv_quality_score = row.split(',')
+        assert float(csv_value) == value
+        assert float(csv_quality_score) == quality_score
+
+
+class AnyLookupTestCase(CoreFixturesTestCase):
+
+    def test_any(self):
+
+        pixels = factories.PixelFactory.create_batch(3)
+
+        qs = Pixel.objects.filter(
+            omics_unit__id__any=[p.omics_unit.id for p in pixels[:2]]
+        )
+
+        assert '= ANY(' in str(qs.query)
+        assert set(qs) == set(pixels[:2])
+
+    def test_any_without_values(self):
+
+        factories.PixelFactory.create_batch(2)
+
+        assert Pixel.objects.filter(omics_unit__id__any=[]).count() == 0
@@ -1,5 +1,6 @@
 import datetime
 import json
+import numpy
 import pytest
 
 from django.core.urlresolvers import reverse
@@ -191,6 +192,26 @@ class PixelSetDetailViewTestCase(GetSearchTermsMixin, CoreFixturesTestCase):
             'Download a CSV file with the selected Pixels'
         )
 
+    def test_uses_pixel_set_stats(self):
+
+        response = self.client.get(self.url)
+
+        self.assertIsNone(response.context['stats'])
+        self.assertEqual(response.context['total_count'], self.n_pixels)
+        self.assertNotContains(response, '<table class="stats">')
+
+        stats = self.pixel_set.update_stats()
+        # statistics are read as is (pixels are not counted anymore)
+        stats.pixels_count = 42
+        stats.save()
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.context['stats'], stats)
+        self.assertEqual(response.context['total_count'], 42)
+        self.assertEqual(response.context['pixels_count'], 42)
+        self.assertContains(response, '<table class="stats">')
+
     def test_select_one_pixel(self):
 
         session = self.client.session
@@ -380,12 +401,39 @@ class PixelSetDetailValuesViewTestCase(GetSearchTermsMixin,
 
         data = json.loads(response.content)
 
-        cols = data['cols']
-        self.assertEqual(cols[0]['label'], 'id')
-        self.assertEqual(cols[1]['label'], 'value')
+        self.assertEqual(data['label'], 'value')
+
+        ids = data['ids']
+        values = data['values']
+        self.assertEqual(len(ids), 2)
+        self.assertEqual(len(values), 2)
+        self.assertEqual(
+            set(ids),
+            set(str(pixel.id) for pixel in self.pixels)
+        )
 
-        rows = data['rows']
-        self.assertEqual(len(rows), 2)
+    def test_returns_float32_values(self):
+
+        response = self.client.get(
+            self.url,
+            data={'format': 'float32'},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response['Content-Type'],
+            'application/octet-stream'
+        )
+        self.assertEqual(response['X-Values-Count'], '2')
+
+        values = numpy.frombuffer(response.content, dtype='<f4')
+        self.assertEqual(len(values), 2)
+        numpy.testing.assert_allclose(
+            sorted(values),
+            sorted(pixel.value for pixel in self.pixels),
+            rtol=1e-6
+        )
 
     def test_filters_by_term_in_description(self):
 
@@ -419,14 +467,14 @@ class PixelSetDetailValuesViewTestCase(GetSearchTermsMixin,
 
         data = json.loads(response.content)
 
-        cols = data['cols']
-        self.assertEqual(cols[0]['label'], 'id')
-        self.assertEqual(cols[1]['label'], 'value')
+        self.assertEqual(data['label'], 'value')
 
-        rows = data['rows']
-        self.assertEqual(len(rows), 1)
-        self.assertEqual(rows[0]['c'][0]['v'], str(selected_pixel.id))
-        self.assertEqual(rows[0]['c'][1]['v'], selected_pixel.value)
+        ids = data['ids']
+        values = data['values']
+        self.assertEqual(len(ids), 1)
+        self.assertEqual(len(values), 1)
+        self.assertEqual(ids[0], str(selected_pixel.id))
+        self.assertEqual(values[0], selected_pixel.value)
 
     def test_filters_by_(self):
 
@@ -453,14 +501,14 @@ class PixelSetDetailValuesViewTestCase(GetSearchTermsMixin,
 
         data = json.loads(response.content)
 
-        cols = data['cols']
-        self.assertEqual(cols[0]['label'], 'id')
-        self.assertEqual(cols[1]['label'], 'value')
+        self.assertEqual(data['label'], 'value')
 
-        rows = data['rows']
-        self.assertEqual(len(rows), 1)
-        self.assertEqual(rows[0]['c'][0]['v'], str(selected_pixel.id))
-        self.assertEqual(rows[0]['c'][1]['v'], selected_pixel.value)
+        ids = data['ids']
+        values = data['values']
+        self.assertEqual(len(ids), 1)
+        self.assertEqual(len(values), 1)
+        self.assertEqual(ids[0], str(selected_pixel.id))
+        self.assertEqual(values[0], selected_pixel.value)
 
 
 class PixelSetDetailQualityScoresViewTestCase(GetSearchTermsMixin,
@@ -508,12 +556,12 @@ class PixelSetDetailQualityScoresViewTestCase(GetSearchTermsMixin,
 
         data = json.loads(response.content)
 
-        cols = data['cols']
-        self.assertEqual(cols[0]['label'], 'id')
-        self.assertEqual(cols[1]['label'], 'quality_score')
+        self.assertEqual(data['label'], 'quality_score')
 
-        rows = data['rows']
-        self.assertEqual(len(rows), 2)
+        ids = data['ids']
+        values = data['values']
+        self.assertEqual(len(ids), 2)
+        self.assertEqual(len(values), 2)
 
     def test_filters_by_omics_units(self):
 
@@ -540,14 +588,14 @@ class PixelSetDetailQualityScoresViewTestCase(GetSearchTermsMixin,
 
         data = json.loads(response.content)
 
-        cols = data['cols']
-        self.assertEqual(cols[0]['label'], 'id')
-        self.assertEqual(cols[1]['label'], 'quality_score')
+        self.assertEqual(data['label'], 'quality_score')
 
-        rows = data['rows']
-        self.assertEqual(len(rows), 1)
-        self.assertEqual(rows[0]['c'][0]['v'], str(selected_pixel.id))
-        self.assertEqual(rows[0]['c'][1]['v'], selected_pixel.quality_score)
+        ids = data['ids']
+        values = data['values']
+        self.assertEqual(len(ids), 1)
+        self.assertEqual(len(values), 1)
+        self.assertEqual(ids[0], str(selected_pixel.id))
+        self.assertEqual(values[0], selected_pixel.quality_score)
 
     def test_filters_by_term_in_description(self):
 
@@ -581,14 +629,14 @@ class PixelSetDetailQualityScoresViewTestCase(GetSearchTermsMixin,
 
         data = json.loads(response.content)
 
-        cols = data['cols']
-        self.assertEqual(cols[0]['label'], 'id')
-        self.assertEqual(cols[1]['label'], 'quality_score')
+        self.assertEqual(data['label'], 'quality_score')
 
-        rows = data['rows']
-        self.assertEqual(len(rows), 1)
-        self.assertEqual(rows[0]['c'][0]['v'], str(selected_pixel.id))
-        self.assertEqual(rows[0]['c'][1]['v'], selected_pixel.quality_score)
+        ids = data['ids']
+        values = data['values']
+        self.assertEqual(len(ids), 1)
+        self.assertEqual(len(values), 1)
+        self.assertEqual(ids[0], str(selected_pixel.id))
+        self.assertEqual(values[0], selected_pixel.quality_score)
 
 
 class DataTableDetailViewTestCase(TestCase):
@@ -653,3 +701,204 @@ class PixelSetDetailClearViewTestCase(GetSearchTermsMixin,
             self.get_search_terms(self.client.session, default=None),
             []
         )
+
+
+class PixelSetDetailValuesHistogramViewTestCase(GetSearchTermsMixin,
+                                                CoreFixturesTestCase):
+
+    def setUp(self):
+
+        self.user = factories.PixelerFactory(
+            is_active=True,
+            is_staff=True,
+            is_superuser=True,
+        )
+        self.client.login(
+            username=self.user.username,
+            password=factories.PIXELER_PASSWORD,
+        )
+
+        self.pixel_set = factories.PixelSetFactory()
+        self.pixels = [
+            factories.PixelFactory(pixel_set=self.pixel_set, value=value)
+            for value in (0., 1., 4.)
+        ]
+
+        self.url = reverse(
+            'explorer:pixelset_detail_values_histogram',
+            kwargs={'pk': str(self.pixel_set.id)}
+        )
+
+    def test_returns_bad_request_when_not_ajax(self):
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_returns_json(self):
+
+        response = self.client.get(
+            self.url,
+            data={'bins': 4},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/json')
+
+        data = json.loads(response.content)
+
+        self.assertEqual(data['label'], 'value')
+        self.assertEqual(data['edges'], [0., 1., 2., 3., 4.])
+        self.assertEqual(data['counts'], [1, 1, 0, 1])
+
+    def test_with_range(self):
+
+        response = self.client.get(
+            self.url,
+            data={'bins': 2, 'min': 0, 'max': 2},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+        data = json.loads(response.content)
+
+        self.assertEqual(data['edges'], [0., 1., 2.])
+        self.assertEqual(data['counts'], [1, 1])
+
+    def test_invalid_parameters(self):
+
+        response = self.client.get(
+            self.url,
+            data={'bins': 0},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('bins', json.loads(response.content)['errors'])
+
+    def test_filters_by_omics_units(self):
+
+        omics_unit_id = self.pixels[0].omics_unit.reference.identifier
+
+        # set search terms in session
+        response = self.client.post(self.pixel_set.get_absolute_url(), {
+            'search_terms': omics_unit_id,
+        }, follow=True)
+
+        self.assertEqual(
+            self.get_search_terms(self.client.session, default=None),
+            [omics_unit_id]
+        )
+
+        response = self.client.get(
+            self.url,
+            data={},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+        data = json.loads(response.content)
+
+        self.assertEqual(sum(data['counts']), 1)
+
+
+class PixelSetConditionalGetTestCase(GetSearchTermsMixin,
+                                     CoreFixturesTestCase):
+
+    def setUp(self):
+
+        self.user = factories.PixelerFactory(
+            is_active=True,
+            is_staff=True,
+            is_superuser=True,
+        )
+        self.client.login(
+            username=self.user.username,
+            password=factories.PIXELER_PASSWORD,
+        )
+
+        self.pixel_set = factories.PixelSetFactory()
+        self.pixels = factories.PixelFactory.create_batch(
+            2,
+            pixel_set=self.pixel_set
+        )
+
+        self.values_url = reverse(
+            'explorer:pixelset_detail_values',
+            kwargs={'pk': str(self.pixel_set.id)}
+        )
+        self.export_url = self.pixel_set.get_export_pixels_url()
+
+    def get_values(self, **extra):
+
+        return self.client.get(
+            self.values_url,
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest',
+            **extra
+        )
+
+    def test_sends_validators(self):
+
+        response = self.get_values()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['ETag'].startswith('W/"'))
+        self.assertIn('Last-Modified', response)
+        self.assertIn('private', response['Cache-Control'])
+        self.assertIn('no-cache', response['Cache-Control'])
+
+    def test_not_modified(self):
+
+        etag = self.get_values()['ETag']
+
+        response = self.get_values(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+
+    def test_not_modified_since(self):
+
+        last_modified = self.get_values()['Last-Modified']
+
+        response = self.get_values(HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_modified_when_version_changes(self):
+
+        etag = self.get_values()['ETag']
+
+        self.pixel_set.bump_version()
+
+        response = self.get_values(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_modified_when_search_terms_change(self):
+
+        etag = self.get_values()['ETag']
+
+        self.client.post(self.pixel_set.get_absolute_url(), {
+            'search_terms': self.pixels[0].omics_unit.reference.identifier,
+        }, follow=True)
+
+        response = self.get_values(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_export_not_modified(self):
+
+        response = self.client.get(self.export_url)
+
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        response = self.client.get(self.export_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
@@ -0,0 +1,110 @@
+from django.core.urlresolvers import reverse
+from unittest.mock import patch
+
+from apps.core import factories
+from apps.core.tests import CoreFixturesTestCase
+from apps.explorer.models import ExportJob
+
+
+class ExportJobCreateViewTestCase(CoreFixturesTestCase):
+
+    def setUp(self):
+
+        self.user = factories.PixelerFactory(
+            is_active=True,
+            is_staff=True,
+            is_superuser=True,
+        )
+        self.client.login(
+            username=self.user.username,
+            password=factories.PIXELER_PASSWORD,
+        )
+        self.url = reverse('explorer:export_job_create')
+
+    def test_get_is_not_allowed(self):
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 405)
+
+    def test_redirects_when_selection_is_empty(self):
+
+        response = self.client.post(self.url, follow=True)
+
+        self.assertRedirects(response, reverse('explorer:pixelset_list'))
+        self.assertContains(response, 'Cannot export an empty selection.')
+        self.assertEqual(ExportJob.objects.count(), 0)
+
+    def test_creates_job(self):
+
+        pixel_sets = factories.PixelSetFactory.create_batch(2)
+        self.client.post(
+            reverse('explorer:pixelset_select'),
+            {'pixel_sets': [str(p.id) for p in pixel_sets]},
+            follow=True
+        )
+
+        with patch('apps.explorer.views.views_export.transaction') as t:
+            response = self.client.post(self.url, {'format': 'parquet'})
+            self.assertEqual(t.on_commit.call_count, 1)
+
+        self.assertEqual(response.status_code, 202)
+
+        job = ExportJob.objects.get()
+        self.assertEqual(job.created_by, self.user)
+        self.assertEqual(job.format, 'parquet')
+        self.assertEqual(job.status, ExportJob.STATUS_PENDING)
+        self.assertEqual(set(job.pixel_sets.all()), set(pixel_sets))
+
+        self.assertEqual(response['Location'], job.get_status_url())
+        self.assertEqual(response.json()['status'], ExportJob.STATUS_PENDING)
+        self.assertIsNone(response.json()['download_url'])
+
+
+class ExportJobStatusViewTestCase(CoreFixturesTestCase):
+
+    def setUp(self):
+
+        self.user = factories.PixelerFactory(
+            is_active=True,
+            is_staff=True,
+            is_superuser=True,
+        )
+        self.client.login(
+            username=self.user.username,
+            password=factories.PIXELER_PASSWORD,
+        )
+
+    def test_status(self):
+
+        job = ExportJob.objects.create(
+            created_by=self.user,
+            status=ExportJob.STATUS_DONE,
+        )
+
+        response = self.client.get(job.get_status_url())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            'id': str(job.id),
+            'status': ExportJob.STATUS_DONE,
+            'status_url': job.get_status_url(),
+            'error': '',
+            'download_url': job.get_download_url(),
+        })
+
+    def test_status_of_other_users_jobs(self):
+
+        job = ExportJob.objects.create(created_by=factories.PixelerFactory())
+
+        response = self.client.get(job.get_status_url())
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_download_unfinished_job(self):
+
+        job = ExportJob.objects.create(created_by=self.user)
+
+        response = self.client.get(job.get_download_url())
+
+        self.assertEqual(response.status_code, 404)
@@ -14,7 +14,10 @@ from apps.core.tests import CoreFixturesTestCase
 from apps.core.management.commands.make_development_fixtures import (
     make_development_fixtures
 )
-from apps.explorer.utils import PIXELSET_EXPORT_PIXELS_FILENAME
+from apps.explorer.utils import (
+    PIXELSET_EXPORT_FORMAT_PARQUET, PIXELSET_EXPORT_PIXELS_FILENAME,
+    get_pixels_filename,
+)
 from apps.explorer.views import PixelSetExportView
 from apps.explorer.views.helpers import get_selected_pixel_sets_from_session
 from apps.explorer.views.views_detail import GetSearchTermsMixin
@@ -111,6 +114,65 @@ class PixelSetListViewTestCase(CoreFixturesTestCase):
             html=True
         )
 
+    def test_keyset_pagination(self):
+
+        make_development_fixtures(
+            n_pixel_sets=12,
+            n_pixels_per_set=1
+        )
+
+        response = self.client.get(self.url)
+        self.assertContains(response, '<tr class="pixelset">', count=10)
+
+        page_obj = response.context['page_obj']
+        self.assertTrue(page_obj.has_next())
+        self.assertFalse(page_obj.has_previous())
+
+        response = self.client.get(self.url, {'after': page_obj.next_cursor})
+        self.assertContains(response, '<tr class="pixelset">', count=2)
+        self.assertFalse(response.context['page_obj'].has_next())
+
+    def test_renders_displayed_and_total_counts(self):
+
+        make_development_fixtures(
+            n_pixel_sets=12,
+            n_pixels_per_set=1
+        )
+
+        response = self.client.get(self.url)
+        self.assertContains(response, 'Displayed: 10')
+        self.assertContains(response, 'Total: ~')
+
+        with patch(
+            'apps.explorer.views.views_list.PixelSetListView'
+            '.approximate_count',
+            False
+        ):
+            response = self.client.get(self.url)
+        self.assertContains(response, 'Displayed: 10')
+        self.assertNotContains(response, 'Total:')
+        self.assertNotContains(response, '~None')
+
+    def test_renders_pixels_count(self):
+
+        make_development_fixtures(
+            n_pixel_sets=1,
+            n_pixels_per_set=3
+        )
+
+        response = self.client.get(self.url)
+        self.assertContains(
+            response,
+            '<td class="pixels-count">3 pixels</td>',
+            count=1,
+            html=True,
+        )
+
+    def test_invalid_pagination_cursor(self):
+
+        response = self.client.get(self.url, {'after': 'foo'})
+        self.assertEqual(response.status_code, 404)
+
     def test_species_filter(self):
 
         # Create 8 pixelset
@@ -134,6 +196,7 @@ class PixelSetListViewTestCase(CoreFixturesTestCase):
                 omics_unit=omics_unit,
                 pixel_set=pixel_set,
             )
+            pixel_set.update_cached_fields()
 
         # no filter
         response = self.client.get(self.url)
@@ -185,6 +248,22 @@ class PixelSetListViewTestCase(CoreFixturesTestCase):
             count=(n_pixel_sets // 2)
         )
 
+    def test_species_and_omics_unit_types_filters_do_not_join_pixels(self):
+
+        make_development_fixtures(
+            n_pixel_sets=2,
+            n_pixels_per_set=1
+        )
+
+        data = {
+            'species': [models.Species.objects.first().id, ],
+            'omics_unit_types': [models.OmicsUnitType.objects.first().id, ],
+        }
+        response = self.client.get(self.url, data)
+
+        query = str(response.context['page_obj'].queryset.query)
+        self.assertNotIn('"core_pixel"', query)
+
     def test_omics_areas_filter(self):
 
         # Create 8 pixelset
@@ -540,6 +619,7 @@ class PixelSetListViewTestCase(CoreFixturesTestCase):
             omics_unit=omics_unit,
             pixel_set=pixel_set,
         )
+        pixel_set.update_cached_fields()
 
         # no filter
         response = self.client.get(self.url)
@@ -1208,7 +1288,10 @@ class PixelSetExportViewTestCase(GetSearchTermsMixin, CoreFixturesTestCase):
             )
 
             try:
-                zip = ZipFile(BytesIO(response.content), 'r')
+                zip = ZipFile(
+                    BytesIO(b''.join(response.streaming_content)),
+                    'r'
+                )
                 self.assertIsNone(zip.testzip())
             finally:
                 zip.close()
@@ -1270,7 +1353,10 @@ class PixelSetExportViewTestCase(GetSearchTermsMixin, CoreFixturesTestCase):
             )
 
             try:
-                zip = ZipFile(BytesIO(response.content), 'r')
+                zip = ZipFile(
+                    BytesIO(b''.join(response.streaming_content)),
+                    'r'
+                )
                 self.assertIsNone(zip.testzip())
 
                 with zip.open(PIXELSET_EXPORT_PIXELS_FILENAME) as pixels_file:
@@ -1278,3 +1364,97 @@ class PixelSetExportViewTestCase(GetSearchTermsMixin, CoreFixturesTestCase):
                     self.assertEqual(len(pixels_csv.index), 1)
             finally:
                 zip.close()
+
+    def test_exports_pixels_in_requested_format(self):
+
+        pixel_set = factories.PixelSetFactory.create()
+        factories.PixelFactory.create_batch(2, pixel_set=pixel_set)
+
+        self.client.post(
+            reverse('explorer:pixelset_select'),
+            {'pixel_sets': [pixel_set.id]},
+            follow=True
+        )
+
+        response = self.client.get('{}?{}={}'.format(
+            self.url,
+            PixelSetExportView.FORMAT_QUERY_PARAM,
+            PIXELSET_EXPORT_FORMAT_PARQUET,
+        ))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/zip')
+
+        try:
+            zip = ZipFile(
+                BytesIO(b''.join(response.streaming_content)),
+                'r'
+            )
+            self.assertIsNone(zip.testzip())
+            self.assertIn(
+                get_pixels_filename(PIXELSET_EXPORT_FORMAT_PARQUET),
+                zip.namelist()
+            )
+        finally:
+            zip.close()
+
+    def test_displays_message_after_redirect_when_format_is_unsupported(self):
+
+        pixel_set = factories.PixelSetFactory.create()
+        self.client.post(
+            reverse('explorer:pixelset_select'),
+            {'pixel_sets': [pixel_set.id]},
+            follow=True
+        )
+
+        response = self.client.get('{}?{}=xlsx'.format(
+            self.url,
+            PixelSetExportView.FORMAT_QUERY_PARAM,
+        ), follow=True)
+
+        self.assertContains(
+            response,
+            (
+                '<div class="message error">'
+                'Cannot export the selection as xlsx.'
+                '</div>'
+            ),
+            html=True
+        )
+
+    def test_conditional_get(self):
+
+        pixel_sets = factories.PixelSetFactory.create_batch(2)
+        self.client.post(
+            reverse('explorer:pixelset_select'),
+            {'pixel_sets': [str(p.id) for p in pixel_sets]},
+            follow=True
+        )
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('private', response['Cache-Control'])
+        etag = response['ETag']
+        self.assertIn('Last-Modified', response)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+        # another format is another export
+        response = self.client.get(
+            self.url,
+            data={PixelSetExportView.FORMAT_QUERY_PARAM: 'parquet'},
+            HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+
+        # pixels of a selected pixel set have changed
+        pixel_sets[0].bump_version()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
@@ -115,6 +115,35 @@ class PixelSetSelectionViewTestCase(CoreFixturesTestCase):
             f'<div class="histogram" id="scores-histogram-{pixel_sets[1].id}">'
         )
 
+    def test_uses_pixel_set_stats(self):
+
+        pixel_sets = factories.PixelSetFactory.create_batch(2)
+        for pixel_set in pixel_sets:
+            factories.PixelFactory.create_batch(3, pixel_set=pixel_set)
+        self.client.post(
+            reverse('explorer:pixelset_select'),
+            {'pixel_sets': [str(p.id) for p in pixel_sets]},
+            follow=True
+        )
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.context['total_count'], 6)
+        self.assertNotContains(response, '<table class="stats">')
+
+        for pixel_set in pixel_sets:
+            pixel_set.update_stats()
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.context['total_count'], 6)
+        self.assertEqual(response.context['pixels_count'], 6)
+        self.assertContains(
+            response,
+            '<table class="stats">',
+            count=len(pixel_sets)
+        )
+
 
 class DataTableSelectionViewTestCase(TestCase):
 
@@ -173,12 +202,12 @@ class PixelSetSelectionValuesViewTestCase(GetSearchTermsMixin,
 
         data = json.loads(response.content)
 
-        cols = data['cols']
-        self.assertEqual(cols[0]['label'], 'id')
-        self.assertEqual(cols[1]['label'], 'value')
+        self.assertEqual(data['label'], 'value')
 
-        rows = data['rows']
-        self.assertEqual(len(rows), 2)
+        ids = data['ids']
+        values = data['values']
+        self.assertEqual(len(ids), 2)
+        self.assertEqual(len(values), 2)
 
     def test_filters_by_omics_units(self):
 
@@ -214,14 +243,14 @@ class PixelSetSelectionValuesViewTestCase(GetSearchTermsMixin,
 
         data = json.loads(response.content)
 
-        cols = data['cols']
-        self.assertEqual(cols[0]['label'], 'id')
-        self.assertEqual(cols[1]['label'], 'value')
+        self.assertEqual(data['label'], 'value')
 
-        rows = data['rows']
-        self.assertEqual(len(rows), 1)
-        self.assertEqual(rows[0]['c'][0]['v'], str(selected_pixel.id))
-        self.assertEqual(rows[0]['c'][1]['v'], selected_pixel.value)
+        ids = data['ids']
+        values = data['values']
+        self.assertEqual(len(ids), 1)
+        self.assertEqual(len(values), 1)
+        self.assertEqual(ids[0], str(selected_pixel.id))
+        self.assertEqual(values[0], selected_pixel.value)
 
     def test_filters_by_term_in_description(self):
 
@@ -263,14 +292,14 @@ class PixelSetSelectionValuesViewTestCase(GetSearchTermsMixin,
 
         data = json.loads(response.content)
 
-        cols = data['cols']
-        self.assertEqual(cols[0]['label'], 'id')
-        self.assertEqual(cols[1]['label'], 'value')
+        self.assertEqual(data['label'], 'value')
 
-        rows = data['rows']
-        self.assertEqual(len(rows), 1)
-        self.assertEqual(rows[0]['c'][0]['v'], str(selected_pixel.id))
-        self.assertEqual(rows[0]['c'][1]['v'], selected_pixel.value)
+        ids = data['ids']
+        values = data['values']
+        self.assertEqual(len(ids), 1)
+        self.assertEqual(len(values), 1)
+        self.assertEqual(ids[0], str(selected_pixel.id))
+        self.assertEqual(values[0], selected_pixel.value)
 
 
 class PixelSetSelectionQualityScoresViewTestCase(GetSearchTermsMixin,
@@ -318,12 +347,12 @@ class PixelSetSelectionQualityScoresViewTestCase(GetSearchTermsMixin,
 
         data = json.loads(response.content)
 
-        cols = data['cols']
-        self.assertEqual(cols[0]['label'], 'id')
-        self.assertEqual(cols[1]['label'], 'quality_score')
+        self.assertEqual(data['label'], 'quality_score')
 
-        rows = data['rows']
-        self.assertEqual(len(rows), 2)
+        ids = data['ids']
+        values = data['values']
+        self.assertEqual(len(ids), 2)
+        self.assertEqual(len(values), 2)
 
     def test_filters_by_omics_units(self):
 
@@ -359,14 +388,14 @@ class PixelSetSelectionQualityScoresViewTestCase(GetSearchTermsMixin,
 
         data = json.loads(response.content)
 
-        cols = data['cols']
-        self.assertEqual(cols[0]['label'], 'id')
-        self.assertEqual(cols[1]['label'], 'quality_score')
+        self.assertEqual(data['label'], 'quality_score')
 
-        rows = data['rows']
-        self.assertEqual(len(rows), 1)
-        self.assertEqual(rows[0]['c'][0]['v'], str(selected_pixel.id))
-        self.assertEqual(rows[0]['c'][1]['v'], selected_pixel.quality_score)
+        ids = data['ids']
+        values = data['values']
+        self.assertEqual(len(ids), 1)
+        self.assertEqual(len(values), 1)
+        self.assertEqual(ids[0], str(selected_pixel.id))
+        self.assertEqual(values[0], selected_pixel.quality_score)
 
     def test_filters_by_term_in_description(self):
 
@@ -405,14 +434,14 @@ class PixelSetSelectionQualityScoresViewTestCase(GetSearchTermsMixin,
 
         data = json.loads(response.content)
 
-        cols = data['cols']
-        self.assertEqual(cols[0]['label'], 'id')
-        self.assertEqual(cols[1]['label'], 'quality_score')
+        self.assertEqual(data['label'], 'quality_score')
 
-        rows = data['rows']
-        self.assertEqual(len(rows), 1)
-        self.assertEqual(rows[0]['c'][0]['v'], str(selected_pixel.id))
-        self.assertEqual(rows[0]['c'][1]['v'], selected_pixel.quality_score)
+        ids = data['ids']
+        values = data['values']
+        self.assertEqual(len(ids), 1)
+        self.assertEqual(len(values), 1)
+        self.assertEqual(ids[0], str(selected_pixel.id))
+        self.assertEqual(values[0], selected_pixel.quality_score)
 
 
 class DataTableCumulativeViewTestCase(TestCase):
@@ -478,12 +507,12 @@ class PixelSetSelectionCumulativeQualityScoresViewTestCase(CoreFixturesTestCase)
 
         data = json.loads(response.content)
 
-        cols = data['cols']
-        self.assertEqual(cols[0]['label'], 'id')
-        self.assertEqual(cols[1]['label'], 'quality_score')
+        self.assertEqual(data['label'], 'quality_score')
 
-        rows = data['rows']
-        self.assertEqual(len(rows), 2)
+        ids = data['ids']
+        values = data['values']
+        self.assertEqual(len(ids), 2)
+        self.assertEqual(len(values), 2)
 
     def test_no_selected_pixel_sets_returns_empty(self):
 
@@ -498,12 +527,12 @@ class PixelSetSelectionCumulativeQualityScoresViewTestCase(CoreFixturesTestCase)
 
         data = json.loads(response.content)
 
-        cols = data['cols']
-        self.assertEqual(cols[0]['label'], 'id')
-        self.assertEqual(cols[1]['label'], 'quality_score')
+        self.assertEqual(data['label'], 'quality_score')
 
-        rows = data['rows']
-        self.assertEqual(len(rows), 0)
+        ids = data['ids']
+        values = data['values']
+        self.assertEqual(len(ids), 0)
+        self.assertEqual(len(values), 0)
 
 
 class PixelSetSelectionCumulativeValuesViewTestCase(CoreFixturesTestCase):
@@ -555,12 +584,12 @@ class PixelSetSelectionCumulativeValuesViewTestCase(CoreFixturesTestCase):
 
         data = json.loads(response.content)
 
-        cols = data['cols']
-        self.assertEqual(cols[0]['label'], 'id')
-        self.assertEqual(cols[1]['label'], 'value')
+        self.assertEqual(data['label'], 'value')
 
-        rows = data['rows']
-        self.assertEqual(len(rows), 2)
+        ids = data['ids']
+        values = data['values']
+        self.assertEqual(len(ids), 2)
+        self.assertEqual(len(values), 2)
 
     def test_no_selected_pixel_sets_returns_empty(self):
 
@@ -575,12 +604,12 @@ class PixelSetSelectionCumulativeValuesViewTestCase(CoreFixturesTestCase):
 
         data = json.loads(response.content)
 
-        cols = data['cols']
-        self.assertEqual(cols[0]['label'], 'id')
-        self.assertEqual(cols[1]['label'], 'value')
+        self.assertEqual(data['label'], 'value')
 
-        rows = data['rows']
-        self.assertEqual(len(rows), 0)
+        ids = data['ids']
+        values = data['values']
+        self.assertEqual(len(ids), 0)
+        self.assertEqual(len(values), 0)
 
 
 class PixelSetSelectionClearViewTestCase(GetSearchTermsMixin,
@@ -628,3 +657,73 @@ class PixelSetSelectionClearViewTestCase(GetSearchTermsMixin,
             self.get_search_terms(self.client.session, default=None),
             []
         )
+
+
+class PixelSetSelectionCumulativeValuesHistogramViewTestCase(
+        CoreFixturesTestCase):
+
+    def setUp(self):
+
+        self.user = factories.PixelerFactory(
+            is_active=True,
+            is_staff=True,
+            is_superuser=True,
+        )
+        self.client.login(
+            username=self.user.username,
+            password=factories.PIXELER_PASSWORD,
+        )
+
+        self.pixel_sets = factories.PixelSetFactory.create_batch(2)
+        for pixel_set, value in zip(self.pixel_sets, (0., 2.)):
+            factories.PixelFactory(pixel_set=pixel_set, value=value)
+
+        self.url = reverse(
+            'explorer:pixelset_selection_cumulative_values_histogram'
+        )
+
+    def test_returns_bad_request_when_not_ajax(self):
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_returns_json(self):
+
+        # select 2 pixel sets
+        data = {
+            'pixel_sets': [pixel_set.id for pixel_set in self.pixel_sets]
+        }
+        self.client.post(
+            reverse('explorer:pixelset_select'), data, follow=True
+        )
+
+        response = self.client.get(
+            self.url,
+            data={'bins': 2},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/json')
+
+        data = json.loads(response.content)
+
+        self.assertEqual(data['label'], 'value')
+        self.assertEqual(data['edges'], [0., 1., 2.])
+        self.assertEqual(data['counts'], [1, 1])
+
+    def test_no_selected_pixel_sets_returns_empty(self):
+
+        response = self.client.get(
+            self.url,
+            data={},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+        data = json.loads(response.content)
+
+        self.assertEqual(data['edges'], [])
+        self.assertEqual(data['counts'], [])
@@ -31,6 +31,16 @@ urlpatterns = [
         views.PixelSetDetailQualityScoresView.as_view(),
         name='pixelset_detail_quality_scores'
     ),
+    url(
+        r'^pixelset/(?P<pk>{})/values-histogram.json$'.format(UUID_REGEX),
+        views.PixelSetDetailValuesHistogramView.as_view(),
+        name='pixelset_detail_values_histogram'
+    ),
+    url(
+        r'^pixelset/(?P<pk>{})/quality-scores-histogram.json$'.format(UUID_REGEX),  # noqa
+        views.PixelSetDetailQualityScoresHistogramView.as_view(),
+        name='pixelset_detail_quality_scores_histogram'
+    ),
     url(
         r'^pixelset/(?P<pk>{})/clear$'.format(UUID_REGEX),
         views.PixelSetDetailClearView.as_view(),
@@ -76,6 +86,16 @@ urlpatterns = [
         views.PixelSetSelectionCumulativeQualityScoresView.as_view(),
         name='pixelset_selection_cumulative_quality_scores'
     ),
+    url(
+        r'^pixelset/selection/cumulative-values-histogram.json$',
+        views.PixelSetSelectionCumulativeValuesHistogramView.as_view(),
+        name='pixelset_selection_cumulative_values_histogram'
+    ),
+    url(
+        r'^pixelset/selection/cumulative-quality-scores-histogram.json$',
+        views.PixelSetSelectionCumulativeQualityScoresHistogramView.as_view(),
+        name='pixelset_selection_cumulative_quality_scores_histogram'
+    ),
     url(
         r'^pixelset/selection/(?P<pk>{})/values.json$'.format(UUID_REGEX),
         views.PixelSetSelectionValuesView.as_view(),
@@ -86,9 +106,34 @@ urlpatterns = [
         views.PixelSetSelectionQualityScoresView.as_view(),
         name='pixelset_selection_quality_scores'
     ),
+    url(
+        r'^pixelset/selection/(?P<pk>{})/values-histogram.json$'.format(UUID_REGEX),  # noqa
+        views.PixelSetSelectionValuesHistogramView.as_view(),
+        name='pixelset_selection_values_histogram'
+    ),
+    url(
+        r'^pixelset/selection/(?P<pk>{})/quality-scores-histogram.json$'.format(UUID_REGEX),  # noqa
+        views.PixelSetSelectionQualityScoresHistogramView.as_view(),
+        name='pixelset_selection_quality_scores_histogram'
+    ),
     url(
         r'^pixelset/(?P<pk>{})/export$'.format(UUID_REGEX),
         views.PixelSetExportPixelsView.as_view(),
         name='pixelset_export_pixels'
     ),
+    url(
+        r'^export/$',
+        views.ExportJobCreateView.as_view(),
+        name='export_job_create'
+    ),
+    url(
+        r'^export/(?P<pk>{})/status.json$'.format(UUID_REGEX),
+        views.ExportJobStatusView.as_view(),
+        name='export_job_status'
+    ),
+    url(
+        r'^export/(?P<pk>{})/download$'.format(UUID_REGEX),
+        views.ExportJobDownloadView.as_view(),
+        name='export_job_download'
+    ),
 ]
@@ -1,15 +1,27 @@
 from .export import (
+    PIXELSET_EXPORT_FORMAT_CSV, PIXELSET_EXPORT_FORMAT_FEATHER,
+    PIXELSET_EXPORT_FORMAT_PARQUET, PIXELSET_EXPORT_FORMATS,
     PIXELSET_EXPORT_META_FILENAME, PIXELSET_EXPORT_PIXELS_FILENAME,
-    export_pixelsets, export_pixels, export_pixelsets_as_html,
-    get_queryset_filtered_by_search_terms,
+    export_pixelsets, export_pixels, export_pixels_as_stream,
+    export_pixelsets_as_html, export_pixelsets_as_stream,
+    get_pixels_filename, get_queryset_filtered_by_search_terms,
 )
+from .histogram import get_histogram
 
 
 __all__ = (
+    'PIXELSET_EXPORT_FORMAT_CSV',
+    'PIXELSET_EXPORT_FORMAT_FEATHER',
+    'PIXELSET_EXPORT_FORMAT_PARQUET',
+    'PIXELSET_EXPORT_FORMATS',
     'PIXELSET_EXPORT_META_FILENAME',
     'PIXELSET_EXPORT_PIXELS_FILENAME',
     'export_pixels',
+    'export_pixels_as_stream',
     'export_pixelsets',
     'export_pixelsets_as_html',
+    'export_pixelsets_as_stream',
+    'get_histogram',
+    'get_pixels_filename',
     'get_queryset_filtered_by_search_terms',
 )
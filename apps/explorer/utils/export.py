@@ -1,25 +1,52 @@
 import pandas
+import pyarrow
+import pyarrow.feather
+import pyarrow.parquet
 import re
 import uuid
 import yaml
 import zipfile
 
 from io import BytesIO, StringIO
-from django.db.models import Q
+from tempfile import SpooledTemporaryFile
+
+from django.db.models import (
+    Case, F, FloatField, Func, Max, Value, When
+)
 from django.utils.translation import ugettext as _
 
 from apps.core.models import Pixel
-from apps.explorer.templatetags.explorer import highlight_terms
+from apps.explorer.highlight import get_highlighter
+from apps.explorer.search import resolve_search_terms
+
+from .sql import copy_to_csv, stream_copy_to_csv
 
 
 PIXELSET_EXPORT_META_FILENAME = 'meta.yaml'
 PIXELSET_EXPORT_PIXELS_FILENAME = 'pixels.csv'
+PIXELSET_EXPORT_BUFFER_SIZE = 64 * 1024
+PIXELSET_EXPORT_SPOOL_SIZE = 10 * 1024 * 1024
+PIXELSET_EXPORT_PIXELS_COLUMNS = [
+    ('omics_unit_identifier', 'Omics Unit'),
+    ('value', 'Value'),
+    ('quality_score', 'QS'),
+]
+
+PIXELSET_EXPORT_FORMAT_CSV = 'csv'
+PIXELSET_EXPORT_FORMAT_FEATHER = 'feather'
+PIXELSET_EXPORT_FORMAT_PARQUET = 'parquet'
+PIXELSET_EXPORT_FORMATS = (
+    PIXELSET_EXPORT_FORMAT_CSV,
+    PIXELSET_EXPORT_FORMAT_FEATHER,
+    PIXELSET_EXPORT_FORMAT_PARQUET,
+)
 
 
 def _get_pixelsets_dataframe_and_metadata(pixel_set_ids,
                                           search_terms=None,
                                           descriptions=dict(),
-                                          with_links=False):
+                                          with_links=False,
+                                          limit=None):
     """The function takes Pixel Set IDs and optionally a list of search terms
     like Omics Units identifiers or terms in descriptions, a hash map of Pixel
     Set descriptions, and a boolean to determine whether to build URLs for
@@ -40,6 +67,8 @@ def _get_pixelsets_dataframe_and_metadata(pixel_set_ids,
         A hash map containing Pixel Set descriptions indexed by ID.
     with_links: bool, optional
         Whether the omics units should have URLs or not.
+    limit: int, optional
+        The maximum number of omics units (i.e. rows) to fetch.
 
     Returns
     -------
@@ -50,27 +79,72 @@ def _get_pixelsets_dataframe_and_metadata(pixel_set_ids,
         for each Pixel Set.
     """
 
+    columns, meta, short_ids = _get_pixelsets_metadata(
+        pixel_set_ids,
+        descriptions=descriptions
+    )
+
+    # we fetch the pixels of all the Pixel Sets at once in a single "long"
+    # table (one row per pixel) and then pivot it to get one row per omics
+    # unit and two columns per Pixel Set. It is way faster than filling a
+    # "wide" dataframe cell by cell.
+    pixels = _get_pixels_columns(
+        short_ids.keys(),
+        search_terms=search_terms,
+        limit=limit
+    )
+
+    if not len(pixels['pixel_set_id']):
+        return pandas.DataFrame(columns=columns), meta
+
+    pixels['short_id'] = [
+        short_ids[pixel_set_id] for pixel_set_id in pixels.pop('pixel_set_id')
+    ]
+
+    df = _pivot_pixels(
+        pandas.DataFrame(pixels),
+        columns,
+        with_links=with_links
+    )
+
+    return df, meta
+
+
+def _get_pixelsets_metadata(pixel_set_ids, descriptions=dict()):
+    """Compute the exported columns and the metadata of the given Pixel Sets.
+
+    Parameters
+    ----------
+
+    pixel_set_ids: list
+        A list of Pixel Set ids.
+    descriptions: dict, optional
+        A hash map containing Pixel Set descriptions indexed by ID.
+
+    Returns
+    -------
+    columns: list
+        The ordered list of exported columns.
+    meta: dict
+        A hash map indexed by Pixel Set ID. Values are dict with information
+        for each Pixel Set.
+    short_ids: dict
+        A hash map of Pixel Set short IDs indexed by (UUID) Pixel Set ID.
+    """
+
     columns = ['Omics Unit', 'Description']
-    indexes = set()
     meta = dict()
-    pixels = dict()
+    short_ids = dict()
 
-    # we build a dict with the pixel information for each omics unit, and we
-    # compute the list of indexes and columns to construct the pandas dataframe
-    # after. It is better to prepare these information than to dynamically
-    # build the dataframe.
     for index, pixel_set_id in enumerate(pixel_set_ids):
         if not isinstance(pixel_set_id, uuid.UUID):
             short_id = uuid.UUID(pixel_set_id).hex[:7]
         else:
             short_id = pixel_set_id.hex[:7]
 
-        value_col = f'Value {short_id}'
-        score_col = f'QS {short_id}'
-
         # add columns for this pixel set
-        columns.append(value_col)
-        columns.append(score_col)
+        columns.append(f'Value {short_id}')
+        columns.append(f'QS {short_id}')
 
         # add metadata for this pixel set
         meta[short_id] = {
@@ -79,87 +153,241 @@ def _get_pixelsets_dataframe_and_metadata(pixel_set_ids,
             'description': descriptions.get(pixel_set_id, ''),
         }
 
-        if short_id not in pixels:
-            pixels[short_id] = []
+        short_ids[uuid.UUID(str(pixel_set_id))] = short_id
 
-        qs = Pixel.objects.filter(
-            pixel_set_id=pixel_set_id
-        ).select_related(
-            'omics_unit__reference'
-        ).order_by(
+    return columns, meta, short_ids
+
+
+def _get_pixels_columns(pixel_set_ids, search_terms=None, limit=None):
+    """Fetch the pixels of the given Pixel Sets with a single query, and return
+    them as plain columns (one list per field) rather than model instances.
+
+    Parameters
+    ----------
+
+    pixel_set_ids: iterable
+        A sequence of Pixel Set ids.
+    search_terms: list, optional
+        A list of search terms.
+    limit: int, optional
+        Only fetch the pixels of the first `limit` omics units (sorted by
+        identifier).
+
+    Returns
+    -------
+    dict
+        A hash map indexed by column name: `pixel_set_id`, `omics_unit`,
+        `description`, `url`, `value` and `quality_score`. Values are lists of
+        the same length.
+    """
+
+    names = (
+        'pixel_set_id',
+        'omics_unit',
+        'description',
+        'url',
+        'value',
+        'quality_score',
+    )
+
+    pixel_set_ids = list(pixel_set_ids)
+    if not pixel_set_ids:
+        return {name: [] for name in names}
+
+    qs = Pixel.objects.filter(pixel_set_id__in=pixel_set_ids)
+    qs = get_queryset_filtered_by_search_terms(qs, search_terms=search_terms)
+
+    if limit is not None:
+        # the limit is applied by the database in a sub-query, so that we
+        # only transfer (and pivot) the pixels that will be displayed.
+        identifiers = qs.order_by(
             'omics_unit__reference__identifier'
-        )
+        ).values(
+            'omics_unit__reference__identifier'
+        ).distinct()[:limit]
+        qs = qs.filter(omics_unit__reference__identifier__in=identifiers)
+
+    # rows are sorted once the pixels have been pivoted, we do not need the
+    # (costly) default ordering here
+    rows = qs.order_by().values_list(
+        'pixel_set_id',
+        'omics_unit__reference__identifier',
+        'omics_unit__reference__description',
+        'omics_unit__reference__url',
+        'value',
+        'quality_score',
+    )
 
-        qs = get_queryset_filtered_by_search_terms(
-            qs,
-            search_terms=search_terms
-        )
+    columns = list(zip(*rows)) or [()] * len(names)
 
-        for pixel in qs:
-            omics_unit = pixel.omics_unit.reference.identifier
-            description = pixel.omics_unit.reference.description
+    return {name: list(column) for name, column in zip(names, columns)}
 
-            link = '<a href="{}">{}</a>'.format(
-                pixel.omics_unit.reference.url,
-                omics_unit,
-            )
 
-            pixels[short_id].append({
-                'description': description.replace('\n', ' '),
-                'link': link,
-                'omics_unit': omics_unit,
-                'quality_score': pixel.quality_score,
-                'value': pixel.value,
-            })
-            indexes.add(omics_unit)
-
-    df = pandas.DataFrame(index=sorted(indexes), columns=columns)
-    if indexes:
-        # populate the dataframe with each pixel information
-        for short_id in pixels.keys():
-            for pixel in pixels[short_id]:
-                df.loc[
-                    pixel['omics_unit'],
-                    [
-                        'Omics Unit',
-                        'Description',
-                        f'Value {short_id}',
-                        f'QS {short_id}',
-                    ]
-                ] = [
-                    pixel['link'] if with_links else pixel['omics_unit'],
-                    pixel['description'],
-                    pixel['value'],
-                    pixel['quality_score'],
-                ]
-        # drop the indexes to get numerical indexes instead of omics units (so
-        # that we have numbers displayed in the HTML table)
-        df = df.reset_index(drop=True)
+def _pivot_pixels(pixels, columns, with_links=False):
+    """Turn a "long" pandas.DataFrame with one row per pixel into the "wide"
+    pandas.DataFrame exported to the users, i.e. one row per omics unit and two
+    columns (value and quality score) per Pixel Set.
 
-    return df, meta
+    Parameters
+    ----------
+
+    pixels: pandas.DataFrame
+        A pandas DataFrame with the following columns: `short_id`,
+        `omics_unit`, `description`, `url`, `value` and `quality_score`.
+    columns: list
+        The ordered list of columns of the resulting DataFrame.
+    with_links: bool, optional
+        Whether the omics units should have URLs or not.
+
+    Returns
+    -------
+    pandas.DataFrame
+        A pandas DataFrame.
+    """
+
+    # a pixel set should not contain the same omics unit twice, but if it
+    # does, the last pixel wins (as it used to)
+    pixels = pixels.drop_duplicates(
+        subset=['omics_unit', 'short_id'],
+        keep='last'
+    ).astype({
+        'value': float,
+        'quality_score': float,
+    })
+
+    omics_units = pixels.drop_duplicates(subset='omics_unit', keep='last')
+    if with_links:
+        omics_unit_col = (
+            '<a href="' + omics_units['url'] + '">' +
+            omics_units['omics_unit'] + '</a>'
+        )
+    else:
+        omics_unit_col = omics_units['omics_unit']
+
+    omics_units = pandas.DataFrame({
+        'Omics Unit': omics_unit_col.values,
+        'Description': omics_units['description'].str.replace(
+            '\n', ' '
+        ).values,
+    }, index=omics_units['omics_unit'].values)
+
+    values = pixels.pivot(
+        index='omics_unit',
+        columns='short_id',
+        values='value'
+    ).rename(columns=lambda short_id: f'Value {short_id}')
+
+    scores = pixels.pivot(
+        index='omics_unit',
+        columns='short_id',
+        values='quality_score'
+    ).rename(columns=lambda short_id: f'QS {short_id}')
+
+    df = pandas.concat(
+        [omics_units, values, scores],
+        axis=1
+    ).reindex(
+        columns=columns
+    ).sort_index()
+
+    # drop the indexes to get numerical indexes instead of omics units (so
+    # that we have numbers displayed in the HTML table)
+    return df.reset_index(drop=True)
 
 
 def get_queryset_filtered_by_search_terms(qs, search_terms=None):
     # we only filter by search terms when specified
     if search_terms:
-        clauses = Q(
-            omics_unit__reference__description__icontains=search_terms[0]
-        )
-        for term in search_terms[1:]:
-            clauses &= Q(omics_unit__reference__description__icontains=term)
-
+        # matching omics units are resolved once (and cached), rather than
+        # filtering the whole pixels/omics units/entries join for each query.
         qs = qs.filter(
-            Q(omics_unit__reference__identifier__in=search_terms) | clauses
+            omics_unit__id__any=list(resolve_search_terms(search_terms))
         )
 
     return qs
 
 
-def export_pixelsets(pixel_sets, search_terms=None):
+def get_pixels_filename(format=PIXELSET_EXPORT_FORMAT_CSV):
+    """Return the name of the pixels file of an archive given its format."""
+
+    if format not in PIXELSET_EXPORT_FORMATS:
+        raise ValueError(
+            _("Unsupported export format: {}").format(format)
+        )
+
+    return 'pixels.{}'.format(format)
+
+
+def _write_dataframe(df, output, format):
+    """Write a pandas.DataFrame of pixels in a binary (columnar) format, with
+    typed float columns for values and quality scores.
+    """
+
+    # value and quality score columns are the only non-string columns, and
+    # binary formats require a default index
+    df = df.astype({
+        column: float for column in df.columns
+        if column.startswith(('Value', 'QS'))
+    }).reset_index(drop=True)
+
+    # files are written with pyarrow directly: pandas (0.23) does not
+    # support the pyarrow release we use, and needs the feather-format
+    # package for Feather files
+    if format == PIXELSET_EXPORT_FORMAT_PARQUET:
+        pyarrow.parquet.write_table(
+            pyarrow.Table.from_pandas(df, preserve_index=False),
+            output
+        )
+    elif format == PIXELSET_EXPORT_FORMAT_FEATHER:
+        pyarrow.feather.write_feather(df, output)
+    else:
+        raise ValueError(
+            _("Unsupported export format: {}").format(format)
+        )
+
+    return output
+
+
+class _ZipStream(object):
+    """A write-only (and unseekable) binary buffer used to stream a ZIP archive
+    while it is being written: written bytes are kept until they are popped.
+    """
+
+    def __init__(self):
+
+        self.chunks = []
+        self.position = 0
+
+    def write(self, data):
+
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+
+        return self.position
+
+    def flush(self):
+
+        pass
+
+    def pop(self):
+
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def export_pixelsets(pixel_sets, search_terms=None,
+                     format=PIXELSET_EXPORT_FORMAT_CSV):
     """This function exports a list of PixelSet objects as a ZIP archive.
 
     The (in-memory) ZIP archive contains a `meta.yaml` file and a `pixels.csv`
     file according to this spec: https://github.com/Candihub/pixel/issues/144.
+    When another `format` is requested, the `pixels.csv` file is replaced by a
+    `pixels.parquet` (Apache Parquet) or a `pixels.feather` (Feather/Arrow IPC)
+    file.
 
     Parameters
     ----------
@@ -168,6 +396,8 @@ def export_pixelsets(pixel_sets, search_terms=None):
         containing PixelSet objects.
     search_terms: list, optional
         A list of search terms.
+    format: str, optional
+        The format of the pixels file, one of `PIXELSET_EXPORT_FORMATS`.
 
     Returns
     -------
@@ -176,17 +406,51 @@ def export_pixelsets(pixel_sets, search_terms=None):
 
     """
 
+    stream = BytesIO()
+    for chunk in export_pixelsets_as_stream(pixel_sets, search_terms, format):
+        stream.write(chunk)
+
+    return stream
+
+
+def export_pixelsets_as_stream(pixel_sets, search_terms=None,
+                               format=PIXELSET_EXPORT_FORMAT_CSV,
+                               buffer_size=PIXELSET_EXPORT_BUFFER_SIZE):
+    """This function exports a list of PixelSet objects as a ZIP archive that
+    is generated chunk by chunk, so that it can be sent to the client while it
+    is being built (see `export_pixelsets()` for the archive content).
+
+    Parameters
+    ----------
+    pixel_sets : iterable
+        A sequence, an iterator, or some other object which supports iteration,
+        containing PixelSet objects.
+    search_terms: list, optional
+        A list of search terms.
+    format: str, optional
+        The format of the pixels file, one of `PIXELSET_EXPORT_FORMATS`.
+    buffer_size: int, optional
+        The number of bytes of the pixels file compressed at once.
+
+    Yields
+    ------
+    bytes
+        The next chunk of the ZIP archive.
+
+    """
+
+    pixels_filename = get_pixels_filename(format)
+
     descriptions = {}
     for pixel_set in pixel_sets:
         descriptions[pixel_set.id] = pixel_set.description
 
-    df, pixelsets_meta = _get_pixelsets_dataframe_and_metadata(
+    columns, pixelsets_meta, short_ids = _get_pixelsets_metadata(
         pixel_set_ids=descriptions.keys(),
-        search_terms=search_terms,
         descriptions=descriptions,
     )
 
-    stream = BytesIO()
+    stream = _ZipStream()
     archive = zipfile.ZipFile(
         stream,
         mode='w',
@@ -198,24 +462,120 @@ def export_pixelsets(pixel_sets, search_terms=None):
         PIXELSET_EXPORT_META_FILENAME,
         yaml.dump({'pixelsets': list(pixelsets_meta.values())})
     )
+    yield stream.pop()
+
+    # the pixels file is spooled to disk when it gets large, then it is
+    # compressed chunk by chunk
+    with SpooledTemporaryFile(max_size=PIXELSET_EXPORT_SPOOL_SIZE) as pixels:
+        if format == PIXELSET_EXPORT_FORMAT_CSV:
+            # the CSV file is generated by the database
+            _copy_pixelsets(short_ids, pixels, search_terms=search_terms)
+        else:
+            df, __ = _get_pixelsets_dataframe_and_metadata(
+                pixel_set_ids=short_ids.keys(),
+                search_terms=search_terms,
+            )
+            _write_dataframe(df, pixels, format)
+        pixels.seek(0)
+
+        # add `pixels.{format}` file
+        with archive.open(
+            pixels_filename,
+            mode='w',
+            force_zip64=True
+        ) as pixels_file:
+            for chunk in iter(lambda: pixels.read(buffer_size), b''):
+                pixels_file.write(chunk)
+                yield stream.pop()
+
+    archive.close()
+    yield stream.pop()
+
+
+def _copy_pixelsets(short_ids, output, search_terms=None):
+    """Write the pixels of the given Pixel Sets as a CSV file (one row per
+    omics unit and two columns per Pixel Set) thanks to the PostgreSQL `COPY`
+    command. The pivot is performed by the database.
+
+    Parameters
+    ----------
+
+    short_ids: dict
+        A hash map of Pixel Set short IDs indexed by (UUID) Pixel Set ID.
+    output : File handler
+        A file handler to write the CSV content.
+    search_terms: list, optional
+        A list of search terms.
+    """
+
+    columns = [
+        ('omics_unit_identifier', 'Omics Unit'),
+        ('omics_unit_description', 'Description'),
+    ]
+    pixels = dict()
+
+    for index, (pixel_set_id, short_id) in enumerate(short_ids.items()):
+        pixels[f'value_{index}'] = Max(
+            Case(
+                When(pixel_set_id=pixel_set_id, then=F('value')),
+                output_field=FloatField(),
+            )
+        )
+        pixels[f'quality_score_{index}'] = Max(
+            Case(
+                When(pixel_set_id=pixel_set_id, then=F('quality_score')),
+                output_field=FloatField(),
+            )
+        )
+        columns.append((f'value_{index}', f'Value {short_id}'))
+        columns.append((f'quality_score_{index}', f'QS {short_id}'))
+
+    qs = Pixel.objects.filter(pixel_set_id__in=list(short_ids.keys()))
+    qs = get_queryset_filtered_by_search_terms(qs, search_terms=search_terms)
+
+    # one row per omics unit
+    qs = qs.order_by().values(
+        omics_unit_identifier=F('omics_unit__reference__identifier'),
+    ).annotate(
+        omics_unit_description=Max(
+            Func(
+                F('omics_unit__reference__description'),
+                Value('\n'),
+                Value(' '),
+                function='REPLACE'
+            )
+        ),
+        **pixels
+    )
 
-    csv = StringIO()
-    df.to_csv(
-        path_or_buf=csv,
-        na_rep='NA',
-        index=False,
+    return copy_to_csv(
+        qs,
+        columns,
+        output,
+        order_by='omics_unit_identifier'
     )
 
-    # add `pixels.csv` file
-    archive.writestr(PIXELSET_EXPORT_PIXELS_FILENAME, csv.getvalue())
 
-    archive.close()
+def _get_pixels_queryset(pixel_set, search_terms=None):
 
-    return stream
+    qs = get_queryset_filtered_by_search_terms(
+        pixel_set.pixels.all(),
+        search_terms=search_terms
+    )
 
+    return qs.order_by().annotate(
+        omics_unit_identifier=F('omics_unit__reference__identifier'),
+    ).values_list(
+        'omics_unit_identifier',
+        'value',
+        'quality_score',
+    )
 
-def export_pixels(pixel_set, search_terms=None, output=None):
-    """This function exports the Pixels of a given PixelSet as a CSV file.
+
+def export_pixels(pixel_set, search_terms=None, output=None,
+                  format=PIXELSET_EXPORT_FORMAT_CSV):
+    """This function exports the Pixels of a given PixelSet as a CSV file (or
+    as an Apache Parquet or a Feather file, depending on `format`).
 
     If the list of `search_terms` is empty, all Pixels will be exported.
 
@@ -227,38 +587,66 @@ def export_pixels(pixel_set, search_terms=None, output=None):
         A list of search terms.
     output : String or File handler, optional
         A string or file handler to write the CSV content.
+    format: str, optional
+        The export format, one of `PIXELSET_EXPORT_FORMATS`.
 
     Returns
     -------
     io.StringIO
-        A String I/O containing the CSV file if `output` is not specified,
-        `output` otherwise.
+        A String I/O containing the CSV file (a Binary I/O for other formats)
+        if `output` is not specified, `output` otherwise.
 
     """
 
-    qs = pixel_set.pixels.select_related('omics_unit__reference')
-    qs = get_queryset_filtered_by_search_terms(qs, search_terms=search_terms)
+    qs = _get_pixels_queryset(pixel_set, search_terms=search_terms)
 
-    data = list(
-        qs.values_list(
-            'omics_unit__reference__identifier',
-            'value',
-            'quality_score',
+    if format != PIXELSET_EXPORT_FORMAT_CSV:
+        df = pandas.DataFrame.from_records(
+            list(qs),
+            columns=('Omics Unit', 'Value', 'QS', )
         )
-    )
 
-    df = pandas.DataFrame(data, columns=('Omics Unit', 'Value', 'QS', ))
+        if output is None:
+            output = BytesIO()
+
+        return _write_dataframe(df, output, format)
 
     if output is None:
         output = StringIO()
 
-    df.to_csv(
-        path_or_buf=output,
-        na_rep='NA',
-        index=False,
-    )
+    return copy_to_csv(qs, PIXELSET_EXPORT_PIXELS_COLUMNS, output)
 
-    return output
+
+def export_pixels_as_stream(pixel_set, search_terms=None,
+                            buffer_size=PIXELSET_EXPORT_BUFFER_SIZE):
+    """This function exports the Pixels of a given PixelSet as a CSV file that
+    is generated chunk by chunk.
+
+    The CSV file is generated by the database (like `export_pixels()`) and
+    streamed as soon as rows are sent, so that it is never held in memory nor
+    fully generated before the first chunk is sent.
+
+    Parameters
+    ----------
+    pixel_set : apps.core.models.PixelSet
+        A PixelSet object.
+    search_terms: list, optional
+        A list of search terms.
+    buffer_size: int, optional
+        The minimum number of bytes sent at once.
+
+    Yields
+    ------
+    bytes
+        The next chunk of the CSV file.
+
+    """
+
+    yield from stream_copy_to_csv(
+        _get_pixels_queryset(pixel_set, search_terms=search_terms),
+        PIXELSET_EXPORT_PIXELS_COLUMNS,
+        buffer_size=buffer_size,
+    )
 
 
 def export_pixelsets_as_html(pixel_set_ids,
@@ -294,22 +682,23 @@ def export_pixelsets_as_html(pixel_set_ids,
     # tell pandas not to format floats
     pandas.set_option('display.float_format', lambda val: '{}'.format(val))
 
+    # only the first rows are fetched from the database
     df, __ = _get_pixelsets_dataframe_and_metadata(
         pixel_set_ids,
         search_terms=search_terms,
         with_links=True,
+        limit=display_limit,
     )
 
+    # Highlight search terms in description column
+    if search_terms and len(df.index):
+        df['Description'] = get_highlighter(search_terms).highlight_column(
+            df['Description']
+        )
+
     html = df.to_html(
         escape=False,
         max_rows=display_limit,
-        formatters={
-            # Highlight search terms in description column
-            'Description': lambda description: highlight_terms(
-                description,
-                search_terms
-            ),
-        },
     ).replace(' border="1"', '')  # pandas hardcodes table borders...
 
     # replace the empty table body with a message.
@@ -0,0 +1,77 @@
+from django.db.models import (
+    Count, F, FloatField, IntegerField, Max, Min, Value
+)
+from django.db.models.functions import Least
+
+from .sql import WidthBucket
+
+
+def get_histogram(qs, column, bins, low=None, high=None):
+    """Count the values of a queryset column in `bins` equal-width bins.
+
+    Bins are computed by the database (`WIDTH_BUCKET`), so that only one row
+    per non-empty bin is fetched, whatever the number of values. Missing
+    values are ignored.
+
+    Parameters
+    ----------
+    qs : django.db.models.query.QuerySet
+        The queryset to build the histogram from.
+    column : str
+        The name of the (numeric) column.
+    bins : int
+        The number of bins.
+    low : float, optional
+        The lower bound of the first bin. Defaults to the minimum value.
+    high : float, optional
+        The upper bound of the last bin. Defaults to the maximum value.
+
+    Returns
+    -------
+    dict
+        A hash map with the `bins + 1` bin `edges` and the `bins` values
+        `counts`. Both lists are empty when there is no value.
+    """
+
+    qs = qs.order_by().filter(**{f'{column}__isnull': False})
+
+    if low is None or high is None:
+        limits = qs.aggregate(low=Min(column), high=Max(column))
+        if low is None:
+            low = limits['low']
+        if high is None:
+            high = limits['high']
+
+    if low is None or high is None or low > high:
+        return {'edges': [], 'counts': []}
+
+    low, high = float(low), float(high)
+    if low == high:
+        # all values are equal, center them in a bin of width 1
+        low, high = low - 0.5, high + 0.5
+
+    qs = qs.filter(**{f'{column}__gte': low, f'{column}__lte': high})
+
+    # the upper bound belongs to the last bin (not to the overflow one)
+    buckets = qs.annotate(
+        bucket=Least(
+            WidthBucket(
+                F(column),
+                Value(low, output_field=FloatField()),
+                Value(high, output_field=FloatField()),
+                Value(bins, output_field=IntegerField()),
+                output_field=IntegerField(),
+            ),
+            Value(bins, output_field=IntegerField()),
+            output_field=IntegerField(),
+        )
+    ).values('bucket').annotate(nb=Count('*')).values_list('bucket', 'nb')
+
+    counts = [0] * bins
+    for bucket, nb in buckets:
+        counts[bucket - 1] = nb
+
+    width = (high - low) / bins
+    edges = [low + i * width for i in range(bins)] + [high]
+
+    return {'edges': edges, 'counts': counts}
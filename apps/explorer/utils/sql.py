@@ -0,0 +1,252 @@
+import json
+import queue
+import threading
+
+from django.core.exceptions import EmptyResultSet
+from django.db import connection, connections, models, transaction
+from django.db.models import Lookup
+
+
+COPY_STREAM_QUEUE_SIZE = 16
+
+_COPY_DONE = object()
+
+
+def _get_copy_to_csv_sql(cursor, qs, columns, order_by=None):
+
+    qn = connection.ops.quote_name
+
+    try:
+        sql, params = qs.query.sql_with_params()
+        query = cursor.mogrify(sql, params).decode('utf-8')
+    except EmptyResultSet:
+        # the queryset cannot return any row (e.g. it has been filtered
+        # with an empty list of ids), but we still want the headers.
+        query = 'SELECT {} WHERE FALSE'.format(
+            ', '.join(f'NULL AS {qn(name)}' for name, __ in columns)
+        )
+
+    select = 'SELECT {} FROM ({}) AS pixels'.format(
+        ', '.join(f'{qn(name)} AS {qn(hdr)}' for name, hdr in columns),
+        query
+    )
+    if order_by is not None:
+        select += f' ORDER BY {qn(order_by)}'
+
+    return f"COPY ({select}) TO STDOUT WITH CSV HEADER NULL 'NA'"
+
+
+def copy_to_csv(qs, columns, output, order_by=None):
+    """This function writes the rows of a queryset as a CSV file thanks to the
+    PostgreSQL `COPY (SELECT ...) TO STDOUT` command. Rows are formatted by the
+    database server, so that we never build model instances nor a
+    pandas.DataFrame.
+
+    Missing values are written as `NA` and the first line of the CSV file
+    contains the headers. Floats are written with enough digits to be read
+    back exactly (like Python's `repr`).
+
+    Parameters
+    ----------
+    qs : django.db.models.query.QuerySet
+        A `values()` or `values_list()` queryset. Its selected columns must be
+        named (i.e. annotated) after the first item of each `columns` tuple.
+    columns : list
+        A list of `(name, header)` tuples, where `name` is the name of the
+        column in the queryset and `header` its name in the CSV file.
+    output : File handler
+        A (text or binary) file handler to write the CSV content.
+    order_by : str, optional
+        The name of the column used to sort the rows.
+
+    Returns
+    -------
+    File handler
+        The `output` file handler.
+
+    """
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        # PostgreSQL < 12 writes 15 significant digits by default
+        cursor.execute('SET LOCAL extra_float_digits = 3')
+
+        sql = _get_copy_to_csv_sql(cursor, qs, columns, order_by=order_by)
+        with connection.wrap_database_errors:
+            cursor.copy_expert(sql, output)
+
+    return output
+
+
+class _QueueWriter(object):
+    """A write-only file object sending what is written to a queue, by chunks
+    of (at least) `buffer_size` bytes. Once closed, writes are discarded.
+    """
+
+    def __init__(self, chunks, buffer_size):
+
+        self.chunks = chunks
+        self.buffer_size = buffer_size
+        self.closed = False
+        self._buffer = []
+        self._size = 0
+
+    def write(self, data):
+
+        if self.closed:
+            return
+
+        self._buffer.append(data)
+        self._size += len(data)
+        if self._size >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+
+        if self._buffer and not self.closed:
+            self.chunks.put(b''.join(self._buffer))
+        self._buffer = []
+        self._size = 0
+
+
+def stream_copy_to_csv(qs, columns, order_by=None, buffer_size=64 * 1024,
+                       queue_size=COPY_STREAM_QUEUE_SIZE):
+    """Generate the CSV file of `copy_to_csv()` chunk by chunk, as soon as the
+    rows are sent by the database.
+
+    `COPY` blocks until all the rows have been written, so that it runs in a
+    background thread (with the cursor, hence the transaction, of the current
+    database connection) that feeds a bounded queue: the database is never
+    far ahead of the client. The connection must not be used by the current
+    thread until the generator is exhausted or closed.
+
+    Parameters
+    ----------
+    qs : django.db.models.query.QuerySet
+        See `copy_to_csv()`.
+    columns : list
+        See `copy_to_csv()`.
+    order_by : str, optional
+        See `copy_to_csv()`.
+    buffer_size : int, optional
+        The minimum number of bytes of a chunk (but the last one).
+    queue_size : int, optional
+        The maximum number of chunks waiting to be sent.
+
+    Yields
+    ------
+    bytes
+        The next chunk of the CSV file.
+
+    """
+
+    chunks = queue.Queue(maxsize=queue_size)
+    writer = _QueueWriter(chunks, buffer_size)
+    errors = []
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute('SET LOCAL extra_float_digits = 3')
+        sql = _get_copy_to_csv_sql(cursor, qs, columns, order_by=order_by)
+
+        # the thread must use this connection (connections are per thread)
+        database = connections[connection.alias]
+        raw_cursor = cursor.cursor
+
+        def copy():
+            try:
+                with database.wrap_database_errors:
+                    raw_cursor.copy_expert(sql, writer)
+                writer.flush()
+            except Exception as error:
+                errors.append(error)
+            finally:
+                chunks.put(_COPY_DONE)
+
+        thread = threading.Thread(target=copy, daemon=True)
+        thread.start()
+
+        chunk = None
+        try:
+            while True:
+                chunk = chunks.get()
+                if chunk is _COPY_DONE:
+                    break
+                yield chunk
+        finally:
+            # the client may be gone: let COPY complete (discarding the rows)
+            # so that the connection can be used again
+            writer.closed = True
+            while chunk is not _COPY_DONE:
+                chunk = chunks.get()
+            thread.join()
+
+        if errors:
+            raise errors[0]
+
+
+def get_approximate_count(qs):
+    """Return the number of rows of a queryset, as estimated by the PostgreSQL
+    query planner (`EXPLAIN`) rather than counted with `COUNT(*)`.
+
+    Parameters
+    ----------
+    qs : django.db.models.query.QuerySet
+        The queryset to count.
+
+    Returns
+    -------
+    int
+        The estimated number of rows.
+
+    """
+
+    try:
+        sql, params = qs.query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+@models.UUIDField.register_lookup
+class Any(Lookup):
+    """`field = ANY(%s)` lookup: the whole list of values is sent as a single
+    (array) parameter, rather than one parameter per value with `IN`.
+    """
+
+    lookup_name = 'any'
+
+    def get_prep_lookup(self):
+        field = self.lhs.output_field
+        return [field.get_prep_value(value) for value in self.rhs]
+
+    def process_rhs(self, compiler, connection):
+        field = self.lhs.output_field
+        values = [
+            field.get_db_prep_value(value, connection, prepared=True)
+            for value in self.rhs
+        ]
+        return '%s', [values]
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} = ANY({rhs})', lhs_params + rhs_params
+
+
+class WidthBucket(models.Func):
+    """`WIDTH_BUCKET(expression, low, high, count)`: the number of the bucket
+    (from 1 to `count`) `expression` falls into, in an histogram of `count`
+    equal-width buckets spanning the `[low, high[` range.
+
+    Django 1.11 ignores a class level `output_field`: pass
+    `output_field=IntegerField()` when combining it with other expressions.
+    """
+
+    function = 'WIDTH_BUCKET'
@@ -1,8 +1,12 @@
 from .views_detail import (
     DataTableDetailView, PixelSetDetailClearView,
-    PixelSetDetailQualityScoresView, PixelSetDetailValuesView,
+    PixelSetDetailQualityScoresHistogramView, PixelSetDetailQualityScoresView,
+    PixelSetDetailValuesHistogramView, PixelSetDetailValuesView,
     PixelSetDetailView, PixelSetExportPixelsView,
 )
+from .views_export import (
+    ExportJobCreateView, ExportJobDownloadView, ExportJobStatusView,
+)
 from .views_list import (
     PixelSetClearView, PixelSetDeselectView, PixelSetExportView,
     PixelSetListView, PixelSetSelectView,
@@ -10,8 +14,12 @@ from .views_list import (
 from .views_selection import (
     DataTableCumulativeView, DataTableSelectionView,
     PixelSetSelectionClearView, PixelSetSelectionCumulativeValuesView,
-    PixelSetSelectionCumulativeQualityScoresView, PixelSetSelectionValuesView,
+    PixelSetSelectionCumulativeValuesHistogramView,
+    PixelSetSelectionCumulativeQualityScoresView,
+    PixelSetSelectionCumulativeQualityScoresHistogramView,
+    PixelSetSelectionValuesView, PixelSetSelectionValuesHistogramView,
     PixelSetSelectionView, PixelSetSelectionQualityScoresView,
+    PixelSetSelectionQualityScoresHistogramView,
 )
 
 
@@ -19,10 +27,15 @@ __all__ = [
     DataTableCumulativeView,
     DataTableDetailView,
     DataTableSelectionView,
+    ExportJobCreateView,
+    ExportJobDownloadView,
+    ExportJobStatusView,
     PixelSetClearView,
     PixelSetDeselectView,
     PixelSetDetailClearView,
+    PixelSetDetailQualityScoresHistogramView,
     PixelSetDetailQualityScoresView,
+    PixelSetDetailValuesHistogramView,
     PixelSetDetailValuesView,
     PixelSetDetailView,
     PixelSetExportPixelsView,
@@ -30,9 +43,13 @@ __all__ = [
     PixelSetListView,
     PixelSetSelectView,
     PixelSetSelectionClearView,
+    PixelSetSelectionCumulativeQualityScoresHistogramView,
     PixelSetSelectionCumulativeQualityScoresView,
+    PixelSetSelectionCumulativeValuesHistogramView,
     PixelSetSelectionCumulativeValuesView,
+    PixelSetSelectionQualityScoresHistogramView,
     PixelSetSelectionQualityScoresView,
+    PixelSetSelectionValuesHistogramView,
     PixelSetSelectionValuesView,
     PixelSetSelectionView,
 ]
@@ -1,18 +1,118 @@
+import hashlib
+import json
+import numpy
+
+from calendar import timegm
+
 from django.core.exceptions import SuspiciousOperation
-from django.http import HttpResponse
+from django.db.models import TextField
+from django.db.models.functions import Cast
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
 from django.utils.decorators import method_decorator
+from django.utils.http import http_date, quote_etag
 from django.utils.translation import ugettext as _
 from django.views.decorators.gzip import gzip_page
 from django.views.generic.edit import FormMixin
-from gviz_api import DataTable
 
-from ..forms import PixelSetSubsetSelectionForm
-from ..utils import get_queryset_filtered_by_search_terms
+from apps.core.models import PixelSet
+
+from ..forms import HistogramForm, PixelSetSubsetSelectionForm
+from ..utils import get_histogram, get_queryset_filtered_by_search_terms
 
 from .helpers import set_search_terms_to_session
 
 
-class DataTableMixin(object):
+class ConditionalGetMixin(object):
+    """Answer `GET` (and `HEAD`) requests with `ETag` and `Last-Modified`
+    headers computed from the version of the pixel sets a response is built
+    from, and with `304 Not Modified` when the client already has it.
+
+    The `ETag` also covers the search terms and the query string, since
+    responses depend on them. Responses are private (they depend on the
+    session) and should be revalidated before being reused.
+    """
+
+    def get_conditional_pixel_set_ids(self):
+
+        raise NotImplementedError(
+            _('You should define `get_conditional_pixel_set_ids()`')
+        )
+
+    def get_validators(self, request):
+        """Return the (weak) `ETag` and the `Last-Modified` timestamp of the
+        response.
+        """
+
+        versions = PixelSet.objects.filter(
+            id__in=self.get_conditional_pixel_set_ids()
+        ).values_list('id', 'version', 'version_updated_at')
+
+        last_modified = None
+        pixel_sets = []
+        for id, version, updated_at in versions:
+            pixel_sets.append((str(id), version))
+            if last_modified is None or updated_at > last_modified:
+                last_modified = updated_at
+
+        search_terms = []
+        if hasattr(self, 'get_search_terms'):
+            search_terms = self.get_search_terms(request.session)
+
+        payload = {
+            'view': type(self).__name__,
+            'pixel_sets': sorted(pixel_sets),
+            'search_terms': sorted(search_terms),
+            'params': sorted(request.GET.lists()),
+        }
+        etag = hashlib.sha256(
+            json.dumps(payload, sort_keys=True).encode('utf-8')
+        ).hexdigest()
+
+        if last_modified is not None:
+            last_modified = timegm(last_modified.utctimetuple())
+
+        # weak validator: the same content may be sent gzipped or not
+        return 'W/{}'.format(quote_etag(etag)), last_modified
+
+    def dispatch(self, request, *args, **kwargs):
+
+        method = request.method.lower()
+        if method not in ('get', 'head') or \
+                method not in self.http_method_names:
+            return super().dispatch(request, *args, **kwargs)
+
+        etag, last_modified = self.get_validators(request)
+
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=last_modified
+        )
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+            patch_cache_control(response, private=True, no_cache=True)
+
+        return response
+
+
+class DataTableMixin(ConditionalGetMixin):
+    """Send the pixels of a queryset as columns: parallel `ids` and `values`
+    arrays in a JSON document, e.g.:
+
+        {"label": "value", "ids": ["1d9c…", …], "values": [0.42, …]}
+
+    With the `?format=float32` query parameter, only the values are sent, as
+    a binary array of little-endian float32 (missing values are NaN).
+    """
+
+    FORMAT_QUERY_PARAM = 'format'
+    FORMAT_FLOAT32 = 'float32'
 
     def get_search_terms(self, session, **kwargs):
 
@@ -32,8 +132,7 @@ class DataTableMixin(object):
 
         return list(self.get_headers().keys())
 
-    @method_decorator(gzip_page)
-    def get(self, request, *args, **kwargs):
+    def get_filtered_pixels_queryset(self, request):
 
         if not request.is_ajax():
             raise SuspiciousOperation(
@@ -42,15 +141,88 @@ class DataTableMixin(object):
 
         search_terms = self.get_search_terms(request.session)
 
-        qs = get_queryset_filtered_by_search_terms(
+        return get_queryset_filtered_by_search_terms(
             self.get_pixels_queryset(),
             search_terms=search_terms
         )
 
-        dt = DataTable(self.get_headers())
-        dt.LoadData(qs.values(*self.get_columns()))
+    @method_decorator(gzip_page)
+    def get(self, request, *args, **kwargs):
+
+        qs = self.get_filtered_pixels_queryset(request)
+
+        id_column, value_column = self.get_columns()
+
+        if request.GET.get(self.FORMAT_QUERY_PARAM) == self.FORMAT_FLOAT32:
+            values = numpy.fromiter(
+                (
+                    numpy.nan if value is None else value
+                    for value in qs.order_by().values_list(
+                        value_column,
+                        flat=True
+                    ).iterator()
+                ),
+                dtype='<f4'
+            )
+
+            response = HttpResponse(
+                values.tobytes(),
+                content_type='application/octet-stream'
+            )
+            response['X-Values-Count'] = len(values)
+            return response
+
+        # ids are formatted by the database rather than building (and
+        # formatting) UUID objects
+        rows = qs.order_by().annotate(
+            str_id=Cast(id_column, TextField())
+        ).values_list('str_id', value_column)
+
+        columns = list(zip(*rows)) or [(), ()]
+        ids, values = (list(column) for column in columns)
+
+        return HttpResponse(
+            json.dumps({
+                'label': value_column,
+                'ids': ids,
+                'values': values,
+            }),
+            content_type='application/json'
+        )
+
+
+class HistogramMixin(DataTableMixin):
+    """Send the histogram of the pixels values (instead of the values), e.g.:
+
+        {"label": "value", "edges": [0.0, 0.5, 1.0], "counts": [12, 3]}
+
+    The number of bins and their range can be set with the `bins`, `min` and
+    `max` query parameters (see `HistogramForm`).
+    """
+
+    def get(self, request, *args, **kwargs):
 
-        return HttpResponse(dt.ToJSon(), content_type='application/json')
+        qs = self.get_filtered_pixels_queryset(request)
+
+        form = HistogramForm(request.GET)
+        if not form.is_valid():
+            return JsonResponse({'errors': form.errors}, status=400)
+
+        __, value_column = self.get_columns()
+
+        histogram = get_histogram(
+            qs,
+            value_column,
+            bins=form.cleaned_data['bins'],
+            low=form.cleaned_data['min'],
+            high=form.cleaned_data['max'],
+        )
+
+        return JsonResponse({
+            'label': value_column,
+            'edges': histogram['edges'],
+            'counts': histogram['counts'],
+        })
 
 
 class SubsetSelectionMixin(FormMixin):
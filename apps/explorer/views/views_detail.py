@@ -1,16 +1,23 @@
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import HttpResponse, HttpResponseRedirect
+from django.http import (
+    FileResponse, HttpResponseRedirect, StreamingHttpResponse
+)
 from django.utils import timezone
 from django.utils.translation import ugettext as _
 from django.views.generic import DetailView
 from django.views.generic.detail import BaseDetailView
 from apps.core.models import PixelSet
 
-from ..utils import export_pixels, get_queryset_filtered_by_search_terms
+from ..cache import ExportCache
+from ..utils import (
+    export_pixels_as_stream, get_queryset_filtered_by_search_terms
+)
 
 from .helpers import get_search_terms_from_session, set_search_terms_to_session
-from .mixins import DataTableMixin, SubsetSelectionMixin
+from .mixins import (
+    ConditionalGetMixin, DataTableMixin, HistogramMixin, SubsetSelectionMixin
+)
 
 
 class GetSearchTermsMixin(object):
@@ -32,6 +39,10 @@ class DataTableDetailView(LoginRequiredMixin, GetSearchTermsMixin,
 
     model = PixelSet
 
+    def get_conditional_pixel_set_ids(self):
+
+        return [self.kwargs.get(self.pk_url_kwarg)]
+
     def get_pixels_queryset(self):
 
         return self.get_object().pixels
@@ -51,6 +62,16 @@ class PixelSetDetailQualityScoresView(DataTableDetailView):
         return {'id': ('string'), 'quality_score': ('number')}
 
 
+class PixelSetDetailValuesHistogramView(
+        HistogramMixin, PixelSetDetailValuesView):
+    pass
+
+
+class PixelSetDetailQualityScoresHistogramView(
+        HistogramMixin, PixelSetDetailQualityScoresView):
+    pass
+
+
 class PixelSetDetailView(LoginRequiredMixin, GetSearchTermsMixin,
                          SubsetSelectionMixin,
                          DetailView):
@@ -64,6 +85,7 @@ class PixelSetDetailView(LoginRequiredMixin, GetSearchTermsMixin,
 
         qs = super().get_queryset().select_related(
             'analysis__pixeler',
+            'stats',
         )
 
         return qs
@@ -80,12 +102,22 @@ class PixelSetDetailView(LoginRequiredMixin, GetSearchTermsMixin,
 
         pixels = qs[:self.pixels_limit]
 
+        stats = self.object.get_stats()
+        if stats is not None:
+            total_count = stats.pixels_count
+        else:
+            total_count = self.object.pixels.count()
+
+        # only count pixels when they are filtered
+        pixels_count = qs.count() if search_terms else total_count
+
         context.update({
             'pixels': pixels,
-            'pixels_count': qs.count(),
+            'pixels_count': pixels_count,
             'pixels_limit': self.pixels_limit,
             'search_terms': search_terms,
-            'total_count': self.object.pixels.count(),
+            'stats': stats,
+            'total_count': total_count,
             'pixelset_experiments': self.object.analysis.experiments.all(),
         })
         return context
@@ -96,12 +128,17 @@ class PixelSetDetailView(LoginRequiredMixin, GetSearchTermsMixin,
 
 
 class PixelSetExportPixelsView(LoginRequiredMixin, GetSearchTermsMixin,
+                               ConditionalGetMixin,
                                BaseDetailView):
 
     ATTACHEMENT_FILENAME = 'pixels_{date_time}.csv'
 
     model = PixelSet
 
+    def get_conditional_pixel_set_ids(self):
+
+        return [self.kwargs.get(self.pk_url_kwarg)]
+
     @staticmethod
     def get_export_archive_filename():
 
@@ -112,16 +149,37 @@ class PixelSetExportPixelsView(LoginRequiredMixin, GetSearchTermsMixin,
     def get(self, request, *args, **kwargs):
 
         search_terms = self.get_search_terms(request.session)
+        pixel_set = self.get_object()
 
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename={}'.format(
-            self.get_export_archive_filename()
+        cache = ExportCache()
+        cache_key = cache.get_key(
+            'pixels',
+            [pixel_set.id],
+            search_terms=search_terms,
         )
+        cached_csv = cache.get(cache_key)
 
-        export_pixels(
-            self.get_object(),
-            search_terms=search_terms,
-            output=response
+        if cached_csv is not None:
+            response = FileResponse(
+                cached_csv,
+                content_type='text/csv'
+            )
+        else:
+            # the CSV file is sent to the client (and cached) chunk by chunk,
+            # as the database generates it
+            response = StreamingHttpResponse(
+                cache.cache_stream(
+                    cache_key,
+                    [pixel_set.id],
+                    export_pixels_as_stream(
+                        pixel_set,
+                        search_terms=search_terms,
+                    )
+                ),
+                content_type='text/csv'
+            )
+        response['Content-Disposition'] = 'attachment; filename={}'.format(
+            self.get_export_archive_filename()
         )
 
         return response
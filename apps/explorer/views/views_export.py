@@ -0,0 +1,106 @@
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import transaction
+from django.http import FileResponse, Http404, JsonResponse
+from django.views.generic.detail import BaseDetailView
+
+from ..jobs import start_export_job
+from ..models import ExportJob
+from ..utils import PIXELSET_EXPORT_FORMAT_CSV, PIXELSET_EXPORT_FORMATS
+
+from .helpers import get_selected_pixel_sets_from_session
+from .views_list import PixelSetExportView
+
+
+def get_export_job_status(job):
+
+    status = {
+        'id': str(job.id),
+        'status': job.status,
+        'status_url': job.get_status_url(),
+        'error': job.error,
+        'download_url': None,
+    }
+
+    if job.status == ExportJob.STATUS_DONE:
+        status['download_url'] = job.get_download_url()
+
+    return status
+
+
+class ExportJobCreateView(PixelSetExportView):
+    """Start building the export of the selected pixel sets in the background,
+    instead of streaming it from the request/response cycle.
+    """
+
+    http_method_names = ['post', ]
+
+    def post(self, request, *args, **kwargs):
+
+        selection = get_selected_pixel_sets_from_session(self.request.session)
+
+        if not len(selection):
+            return self.empty_selection(request)
+
+        export_format = request.POST.get(
+            self.FORMAT_QUERY_PARAM,
+            PIXELSET_EXPORT_FORMAT_CSV
+        )
+        if export_format not in PIXELSET_EXPORT_FORMATS:
+            return self.unsupported_format(request, export_format)
+
+        search_terms = []
+        # only take omics units into account if it is requested.
+        if request.POST.get(self.SUBSET_QUERY_PARAM, False):
+            search_terms = self.get_search_terms(self.request.session)
+
+        job = ExportJob.objects.create(
+            created_by=request.user,
+            search_terms=search_terms,
+            format=export_format,
+        )
+        job.pixel_sets.set(selection)
+
+        # the background thread uses its own database connection: it must
+        # not start before the job has been committed.
+        transaction.on_commit(lambda: start_export_job(job))
+
+        response = JsonResponse(get_export_job_status(job), status=202)
+        response['Location'] = job.get_status_url()
+        return response
+
+
+class ExportJobMixin(LoginRequiredMixin):
+
+    model = ExportJob
+
+    def get_queryset(self):
+
+        return super().get_queryset().filter(created_by=self.request.user)
+
+
+class ExportJobStatusView(ExportJobMixin, BaseDetailView):
+
+    def get(self, request, *args, **kwargs):
+
+        return JsonResponse(get_export_job_status(self.get_object()))
+
+
+class ExportJobDownloadView(ExportJobMixin, BaseDetailView):
+
+    def get(self, request, *args, **kwargs):
+
+        job = self.get_object()
+
+        if job.status != ExportJob.STATUS_DONE:
+            raise Http404('This export is not ready yet.')
+
+        response = FileResponse(
+            job.archive.open('rb'),
+            content_type='application/zip'
+        )
+        response['Content-Disposition'] = 'attachment; filename={}'.format(
+            PixelSetExportView.ATTACHEMENT_FILENAME.format(
+                date_time=job.created_at.strftime('%Y%m%d_%Hh%Mm%Ss')
+            )
+        )
+        return response
@@ -1,7 +1,9 @@
 from django.db.models import Q
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import HttpResponse, HttpResponseRedirect
+from django.http import (
+    FileResponse, Http404, HttpResponseRedirect, StreamingHttpResponse
+)
 from django.urls.base import reverse
 from django.utils import timezone
 from django.utils.translation import ugettext as _, ngettext
@@ -10,17 +12,27 @@ from django.views.generic import (
 )
 from django.views.generic.edit import FormMixin
 
-from apps.core.models import OmicsArea, PixelSet, Tag
+from apps.core.models import PixelSet
 
+from ..cache import ExportCache
+from ..facets import get_facet_counts
 from ..forms import (
     PixelSetFiltersForm, PixelSetExportForm,
     PixelSetSelectForm, SessionPixelSetSelectForm
 )
-from ..utils import export_pixelsets
+from ..hierarchies import (
+    get_pixel_sets_by_omics_areas, get_pixel_sets_by_tags
+)
+from ..pagination import InvalidCursor, KeysetPaginator
+from ..utils import (
+    PIXELSET_EXPORT_FORMAT_CSV, PIXELSET_EXPORT_FORMATS,
+    export_pixelsets_as_stream
+)
 
 from .helpers import (
     get_selected_pixel_sets_from_session, set_selected_pixel_sets_to_session
 )
+from .mixins import ConditionalGetMixin
 from .views_selection import GetSearchTermsMixin
 
 
@@ -29,6 +41,9 @@ class PixelSetListView(LoginRequiredMixin, FormMixin, ListView):
     form_class = PixelSetFiltersForm
     model = PixelSet
     paginate_by = 10
+    # keyset pagination: the ordering must end with a unique field
+    ordering = ('analysis_id', 'pixels_file', 'id')
+    approximate_count = True
     template_name = 'explorer/pixelset_list.html'
 
     def get_form_kwargs(self):
@@ -36,6 +51,7 @@ class PixelSetListView(LoginRequiredMixin, FormMixin, ListView):
         kwargs = {
             'initial': self.get_initial(),
             'prefix': self.get_prefix(),
+            'facet_counts': get_facet_counts(),
         }
 
         if self.request.method == 'GET':
@@ -52,38 +68,34 @@ class PixelSetListView(LoginRequiredMixin, FormMixin, ListView):
         form = self.get_form()
         if form.is_valid():
 
+            # species and omics unit types are denormalized in (GIN indexed)
+            # Pixel Set arrays, so that we never join the pixels here
             species = form.cleaned_data.get('species')
             if species:
                 qs = qs.filter(
-                    pixel__omics_unit__strain__species__id__in=species
+                    cached_species__overlap=[s.name for s in species]
                 )
 
             omics_unit_types = form.cleaned_data.get('omics_unit_types')
             if omics_unit_types:
                 qs = qs.filter(
-                    pixel__omics_unit__type__id__in=omics_unit_types
+                    cached_omics_unit_types__overlap=[
+                        t.name for t in omics_unit_types
+                    ]
                 )
 
+            # hierarchies (descendants are included) are resolved to Pixel
+            # Sets ids thanks to closures precomputed in memory
             parent_omics_areas = form.cleaned_data.get('omics_areas')
             if parent_omics_areas:
-                omics_areas = OmicsArea.objects.get_queryset_descendants(
-                    parent_omics_areas,
-                    include_self=True
-                )
                 qs = qs.filter(
-                    analysis__experiments__omics_area__id__in=omics_areas
+                    id__in=get_pixel_sets_by_omics_areas(parent_omics_areas)
                 )
 
             parent_tags = form.cleaned_data.get('tags')
             if parent_tags:
-                # Add descendants to the tags queryset
-                tags = Tag.objects.filter(
-                    id__in=parent_tags
-                ).with_descendants()
-
                 qs = qs.filter(
-                    Q(analysis__tags__id__in=tags) |
-                    Q(analysis__experiments__tags__id__in=tags)
+                    id__in=get_pixel_sets_by_tags(parent_tags)
                 )
 
             search = form.cleaned_data.get('search')
@@ -99,6 +111,7 @@ class PixelSetListView(LoginRequiredMixin, FormMixin, ListView):
         qs = qs.select_related(
             'analysis',
             'analysis__pixeler',
+            'stats',
         ).prefetch_related(
             'analysis__experiments__tags',
             'analysis__tags',
@@ -106,6 +119,25 @@ class PixelSetListView(LoginRequiredMixin, FormMixin, ListView):
 
         return qs.distinct()
 
+    def paginate_queryset(self, queryset, page_size):
+
+        paginator = KeysetPaginator(
+            queryset,
+            page_size,
+            self.ordering,
+            approximate_count=self.approximate_count,
+        )
+
+        try:
+            page = paginator.page(
+                after=self.request.GET.get('after'),
+                before=self.request.GET.get('before'),
+            )
+        except InvalidCursor:
+            raise Http404(_("Invalid page."))
+
+        return (paginator, page, page.object_list, page.has_other_pages())
+
     def get_context_data(self, **kwargs):
 
         selected_pixelsets = get_selected_pixel_sets_from_session(
@@ -259,11 +291,17 @@ class PixelSetSelectView(LoginRequiredMixin, FormView):
         return HttpResponseRedirect(self.get_success_url())
 
 
-class PixelSetExportView(LoginRequiredMixin, GetSearchTermsMixin, View):
+class PixelSetExportView(LoginRequiredMixin, GetSearchTermsMixin,
+                         ConditionalGetMixin, View):
 
     ATTACHEMENT_FILENAME = 'pixelsets_{date_time}.zip'
+    FORMAT_QUERY_PARAM = 'format'
     SUBSET_QUERY_PARAM = 'only-subset'
 
+    def get_conditional_pixel_set_ids(self):
+
+        return get_selected_pixel_sets_from_session(self.request.session)
+
     @staticmethod
     def get_export_archive_filename():
         return PixelSetExportView.ATTACHEMENT_FILENAME.format(
@@ -277,18 +315,49 @@ class PixelSetExportView(LoginRequiredMixin, GetSearchTermsMixin, View):
         if not len(selection):
             return self.empty_selection(request)
 
+        export_format = request.GET.get(
+            self.FORMAT_QUERY_PARAM,
+            PIXELSET_EXPORT_FORMAT_CSV
+        )
+        if export_format not in PIXELSET_EXPORT_FORMATS:
+            return self.unsupported_format(request, export_format)
+
         search_terms = []
         # only take omics units into account if it is requested.
         if request.GET.get(self.SUBSET_QUERY_PARAM, False):
             search_terms = self.get_search_terms(self.request.session)
 
         qs = PixelSet.objects.filter(id__in=selection)
-        content = export_pixelsets(
-            pixel_sets=qs,
+
+        cache = ExportCache()
+        cache_key = cache.get_key(
+            'pixelsets',
+            selection,
             search_terms=search_terms,
-        ).getvalue()
+            format=export_format,
+        )
+        cached_archive = cache.get(cache_key)
 
-        response = HttpResponse(content, content_type='application/zip')
+        if cached_archive is not None:
+            response = FileResponse(
+                cached_archive,
+                content_type='application/zip'
+            )
+        else:
+            # the archive is sent to the client while it is being built (and
+            # cached), so that we never hold the whole archive in memory
+            response = StreamingHttpResponse(
+                cache.cache_stream(
+                    cache_key,
+                    selection,
+                    export_pixelsets_as_stream(
+                        pixel_sets=qs,
+                        search_terms=search_terms,
+                        format=export_format,
+                    )
+                ),
+                content_type='application/zip'
+            )
         response['Content-Disposition'] = 'attachment; filename={}'.format(
             self.get_export_archive_filename()
         )
@@ -302,3 +371,12 @@ class PixelSetExportView(LoginRequiredMixin, GetSearchTermsMixin, View):
         )
 
         return HttpResponseRedirect(reverse('explorer:pixelset_list'))
+
+    def unsupported_format(self, request, export_format):
+
+        messages.error(
+            request,
+            _("Cannot export the selection as {}.").format(export_format)
+        )
+
+        return HttpResponseRedirect(reverse('explorer:pixelset_list'))
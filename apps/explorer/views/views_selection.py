@@ -6,8 +6,9 @@ from django.urls.base import reverse
 from django.views.generic import RedirectView, TemplateView, View
 from django.views.generic.detail import BaseDetailView
 
-from apps.core.models import Pixel, PixelSet
+from apps.core.models import Pixel, PixelSet, PixelSetStats
 
+from ..cache import ExportCache
 from ..utils import (
     export_pixelsets_as_html,
     get_queryset_filtered_by_search_terms
@@ -18,7 +19,7 @@ from .helpers import (
     get_selected_pixel_sets_from_session,
     set_search_terms_to_session,
 )
-from .mixins import DataTableMixin, SubsetSelectionMixin
+from .mixins import DataTableMixin, HistogramMixin, SubsetSelectionMixin
 
 
 class GetSearchTermsMixin(object):
@@ -38,6 +39,10 @@ class DataTableCumulativeView(LoginRequiredMixin, GetSearchTermsMixin,
                               DataTableMixin,
                               View):
 
+    def get_conditional_pixel_set_ids(self):
+
+        return get_selected_pixel_sets_from_session(self.request.session)
+
     def get_pixels_queryset(self):
 
         selected_pixelset_ids = get_selected_pixel_sets_from_session(
@@ -61,12 +66,26 @@ class PixelSetSelectionCumulativeQualityScoresView(DataTableCumulativeView):
         return {'id': ('string'), 'quality_score': ('number')}
 
 
+class PixelSetSelectionCumulativeValuesHistogramView(
+        HistogramMixin, PixelSetSelectionCumulativeValuesView):
+    pass
+
+
+class PixelSetSelectionCumulativeQualityScoresHistogramView(
+        HistogramMixin, PixelSetSelectionCumulativeQualityScoresView):
+    pass
+
+
 class DataTableSelectionView(LoginRequiredMixin, GetSearchTermsMixin,
                              DataTableMixin,
                              BaseDetailView):
 
     model = PixelSet
 
+    def get_conditional_pixel_set_ids(self):
+
+        return [self.kwargs.get(self.pk_url_kwarg)]
+
     def get_pixels_queryset(self):
 
         return self.get_object().pixels
@@ -86,6 +105,16 @@ class PixelSetSelectionQualityScoresView(DataTableSelectionView):
         return {'id': ('string'), 'quality_score': ('number')}
 
 
+class PixelSetSelectionValuesHistogramView(
+        HistogramMixin, PixelSetSelectionValuesView):
+    pass
+
+
+class PixelSetSelectionQualityScoresHistogramView(
+        HistogramMixin, PixelSetSelectionQualityScoresView):
+    pass
+
+
 class PixelSetSelectionView(LoginRequiredMixin, GetSearchTermsMixin,
                             SubsetSelectionMixin,
                             TemplateView):
@@ -121,7 +150,7 @@ class PixelSetSelectionView(LoginRequiredMixin, GetSearchTermsMixin,
 
         selected_pixelsets = PixelSet.objects.filter(
             id__in=selected_pixelset_ids
-        )
+        ).select_related('stats')
 
         qs = Pixel.objects.filter(
             pixel_set_id__in=selected_pixelsets
@@ -135,18 +164,31 @@ class PixelSetSelectionView(LoginRequiredMixin, GetSearchTermsMixin,
             search_terms=search_terms
         )
 
-        pixels_count = qs.count()
+        total_count = PixelSetStats.count_pixels(selected_pixelset_ids)
 
-        total_count = Pixel.objects.filter(
-            pixel_set_id__in=selected_pixelsets
-        ).count()
+        # only count pixels when they are filtered
+        pixels_count = qs.count() if search_terms else total_count
 
-        html_table = export_pixelsets_as_html(
+        cache = ExportCache()
+        cache_key = cache.get_key(
+            'html',
             selected_pixelset_ids,
             search_terms=search_terms,
-            # we do not display all the data
             display_limit=self.omics_units_limit,
         )
+        cached_html_table = cache.get(cache_key)
+
+        if cached_html_table is not None:
+            with cached_html_table:
+                html_table = cached_html_table.read().decode('utf-8')
+        else:
+            html_table = export_pixelsets_as_html(
+                selected_pixelset_ids,
+                search_terms=search_terms,
+                # we do not display all the data
+                display_limit=self.omics_units_limit,
+            )
+            cache.set(cache_key, selected_pixelset_ids, html_table)
 
         context.update({
             'html_table': html_table,
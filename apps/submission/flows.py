@@ -198,7 +198,6 @@ class SubmissionFlow(Flow):
             logger.debug("Saving archive…")
             return archive.save(pixeler=pixeler, submission=process)
 
-        @background.callback
         def importation_callback(future):
             """
             We need to force databases connection closing since the background
@@ -247,4 +246,7 @@ class SubmissionFlow(Flow):
 
             logger.debug("Background importation callback done")
 
-        async_import_archive()
+        # callbacks registered with `@background.callback` are called for
+        # every background task (e.g. exports), we only attach this one to the
+        # importation task.
+        async_import_archive().add_done_callback(importation_callback)
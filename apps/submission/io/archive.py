@@ -5,6 +5,7 @@ from shutil import copyfile
 from tempfile import mkdtemp
 from zipfile import ZipFile, is_zipfile
 
+from django.conf import settings
 from django.utils.translation import ugettext as _
 
 from apps.core.models import Analysis, Experiment
@@ -12,7 +13,9 @@ from apps.data.models import Entry
 from apps.submission.io.xlsx import parse_template
 from .. import exceptions, signals
 from ..utils import make_absolute_path
+from .loaders import PIXELS_LOADER_COPY
 from .pixel import PixelSetParser
+from .reader import parse_pixels_files
 
 logger = logging.getLogger(__name__)
 META_FILENAME = 'meta.xlsx'
@@ -70,7 +73,19 @@ class PixelArchive(object):
 
         self.meta = parse_template(self.meta_path, serialized=serialized)
 
-    def save(self, pixeler, submission=None):
+    def save(self, pixeler, submission=None, loader=PIXELS_LOADER_COPY,
+             workers=None):
+        """Save the experiment, the analysis and the pixel sets of the archive.
+
+        Pixels are inserted with the given `loader` (see
+        `PixelSetParser.save()`), the PostgreSQL `COPY` command by default.
+
+        Pixels files are read and filtered by (at most) `workers` processes,
+        defaulting to the `SUBMISSION_IMPORT_WORKERS` setting. Omics units
+        resolution and pixels insertion need the database: pixel sets are then
+        saved one after another with the current database connection (and
+        transaction).
+        """
         logger.debug('Saving data for {}…'.format(self.archive_path))
 
         # -- Experiment
@@ -139,8 +154,17 @@ class PixelArchive(object):
             analysis.experiments.add(experiment)
 
         # -- Pixels
+        if workers is None:
+            workers = settings.SUBMISSION_IMPORT_WORKERS
+
+        datasets = self.meta['datasets']
+        datasets_pixels = parse_pixels_files(
+            [pixelset_path for pixelset_path, *__ in datasets],
+            workers=workers
+        )
+
         pixel_sets = []
-        for dataset in self.meta['datasets']:
+        for dataset, (pixels, filtered) in zip(datasets, datasets_pixels):
             pixelset_path, omics_unit_type, strain, description = dataset
             parser = PixelSetParser(
                 pixelset_path,
@@ -149,8 +173,9 @@ class PixelArchive(object):
                 omics_unit_type=omics_unit_type,
                 strain=strain
             )
-            parser.parse()
-            parser.save()
+            parser.pixels = pixels
+            parser.filtered_pixels = filtered
+            parser.save(loader=loader)
             pixel_sets.append(parser.pixelset)
 
         # Spread the word!
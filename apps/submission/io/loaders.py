@@ -0,0 +1,176 @@
+import os
+
+from io import StringIO
+
+import numpy
+import pandas
+
+from django.db import connection, transaction
+
+from apps.core.models import Pixel
+
+
+PIXELS_LOADER_ORM = 'orm'
+PIXELS_LOADER_COPY = 'copy'
+PIXELS_LOADERS = (PIXELS_LOADER_ORM, PIXELS_LOADER_COPY)
+
+COPY_CHUNK_SIZE = 100000
+
+
+def generate_uuids(n):
+    """Generate `n` random (version 4) UUIDs as hexadecimal strings, without
+    building a `uuid.UUID` object per UUID.
+    """
+
+    data = numpy.frombuffer(
+        os.urandom(16 * n),
+        dtype=numpy.uint8
+    ).reshape(n, 16).copy()
+
+    # set the version (4) and the variant (RFC 4122) bits
+    data[:, 6] = (data[:, 6] & 0x0f) | 0x40
+    data[:, 8] = (data[:, 8] & 0x3f) | 0x80
+
+    digits = data.tobytes().hex()
+    return [digits[i:i + 32] for i in range(0, 32 * n, 32)]
+
+
+def _get_copy_columns():
+
+    return [
+        Pixel._meta.get_field(name).column
+        for name in ('id', 'value', 'quality_score', 'omics_unit', 'pixel_set')
+    ]
+
+
+def _copy_rows(cursor, table, pixel_set, pixels, chunk_size):
+    """Stream pixels rows to `table` with `COPY ... FROM STDIN`."""
+
+    qn = connection.ops.quote_name
+    columns = _get_copy_columns()
+    sql = 'COPY {} ({}) FROM STDIN WITH CSV'.format(
+        qn(table),
+        ', '.join(qn(column) for column in columns)
+    )
+
+    for start in range(0, len(pixels), chunk_size):
+        chunk = pixels.iloc[start:start + chunk_size]
+
+        rows = pandas.DataFrame({
+            'id': generate_uuids(len(chunk)),
+            'value': chunk['Value'].values,
+            'quality_score': chunk['Quality_score'].values,
+            'omics_unit_id': chunk['omics_unit_id'].astype(str).values,
+            'pixel_set_id': str(pixel_set.id),
+        }, columns=columns)
+
+        # missing values are written as empty (unquoted) strings, i.e.
+        # NULL for COPY
+        buffer = StringIO()
+        rows.to_csv(buffer, header=False, index=False)
+        buffer.seek(0)
+
+        # copy_expert() is not wrapped by Django: raise Django exceptions
+        with connection.wrap_database_errors:
+            cursor.copy_expert(sql, buffer)
+
+
+def copy_pixels(pixel_set, pixels, chunk_size=COPY_CHUNK_SIZE):
+    """Insert pixels with the PostgreSQL `COPY ... FROM STDIN` command.
+
+    Rows are written as CSV in an in-memory buffer (one chunk at a time) and
+    streamed to the `core_pixel` table, so that we never build `Pixel`
+    instances nor send one `INSERT` parameter per value. Like
+    `bulk_create()`, no signal is sent and pixels are inserted atomically.
+
+    Parameters
+    ----------
+    pixel_set : apps.core.models.PixelSet
+        The pixel set of the pixels.
+    pixels : pandas.DataFrame
+        Pixels with `Value`, `Quality_score` (missing values being `None` or
+        `NaN`) and `omics_unit_id` columns.
+    chunk_size : int, optional
+        The maximum number of rows sent by `COPY` command.
+
+    Returns
+    -------
+    int
+        The number of inserted pixels.
+
+    """
+
+    # chunks are copied in a single transaction: either all the pixels are
+    # inserted or none of them
+    with transaction.atomic(), connection.cursor() as cursor:
+        _copy_rows(
+            cursor, Pixel._meta.db_table, pixel_set, pixels, chunk_size
+        )
+
+    return len(pixels)
+
+
+def upsert_pixels(pixel_set, pixels, chunk_size=COPY_CHUNK_SIZE):
+    """Insert pixels, or update the value and quality score of the pixels
+    that already exist for the same pixel set and omics unit.
+
+    Pixels are first copied to a temporary table (see `copy_pixels()`), then
+    merged into the `core_pixel` table with a single
+    `INSERT ... ON CONFLICT (pixel_set_id, omics_unit_id) DO UPDATE`
+    statement, which relies on the unique constraint of these columns.
+
+    Parameters
+    ----------
+    pixel_set : apps.core.models.PixelSet
+        The pixel set of the pixels.
+    pixels : pandas.DataFrame
+        Pixels with `Value`, `Quality_score` (missing values being `None` or
+        `NaN`) and `omics_unit_id` columns. Omics units must be unique.
+    chunk_size : int, optional
+        The maximum number of rows sent by `COPY` command.
+
+    Returns
+    -------
+    int
+        The number of inserted or updated pixels.
+
+    """
+
+    qn = connection.ops.quote_name
+    table = qn(Pixel._meta.db_table)
+    temporary_table = '{}_upsert'.format(Pixel._meta.db_table)
+    columns = ', '.join(qn(column) for column in _get_copy_columns())
+
+    value = qn(Pixel._meta.get_field('value').column)
+    quality_score = qn(Pixel._meta.get_field('quality_score').column)
+    conflict = ', '.join(
+        qn(Pixel._meta.get_field(name).column)
+        for name in ('pixel_set', 'omics_unit')
+    )
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            'CREATE TEMPORARY TABLE {} (LIKE {} INCLUDING DEFAULTS)'.format(
+                qn(temporary_table),
+                table,
+            )
+        )
+        _copy_rows(cursor, temporary_table, pixel_set, pixels, chunk_size)
+        cursor.execute(
+            'INSERT INTO {table} ({columns})'
+            ' SELECT {columns} FROM {temporary_table}'
+            ' ON CONFLICT ({conflict}) DO UPDATE'
+            ' SET {value} = EXCLUDED.{value},'
+            ' {quality_score} = EXCLUDED.{quality_score}'.format(
+                table=table,
+                columns=columns,
+                temporary_table=qn(temporary_table),
+                conflict=conflict,
+                value=value,
+                quality_score=quality_score,
+            )
+        )
+        count = cursor.rowcount
+        cursor.execute('DROP TABLE {}'.format(qn(temporary_table)))
+
+    return count
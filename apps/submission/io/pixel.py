@@ -11,6 +11,11 @@ from apps.core.models import OmicsUnit, Pixel, PixelSet
 from apps.data.models import Entry
 from ..exceptions import PixelSetParserError, PixelSetParserSaveError
 from ..utils import make_absolute_path
+from .loaders import (
+    PIXELS_LOADER_COPY, PIXELS_LOADER_ORM, PIXELS_LOADERS, copy_pixels,
+    upsert_pixels
+)
+from .reader import filter_pixels, read_pixels
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +36,9 @@ class PixelSetParser(object):
         self.omics_unit_type = omics_unit_type
         self.strain = strain
         self.pixels = None
+        # pixels filtered (and de-duplicated) ahead of time, e.g. by a worker
+        # process (see `PixelArchive.save()`)
+        self.filtered_pixels = None
         self.db_pixels = {
             'new': [],
             'update': [],
@@ -45,28 +53,19 @@ class PixelSetParser(object):
             )
             return
 
-        self.pixels = pandas.read_csv(
-            self.pixelset_path,
-            delim_whitespace=True,
-            index_col=0
-        )
+        self.pixels = read_pixels(self.pixelset_path)
+        self.filtered_pixels = None
 
     def filter(self, na_filter=True, fuzzy_filter=True):
 
         if self.pixels is None:
             return None, None, None
 
-        pixels = self.pixels
-        na = pixels[pixels.isna().any(axis=1)]
-        fuzzy = pixels.filter(like=';', axis=0)
-
-        if na_filter:
-            pixels = pixels.dropna()
-
-        if fuzzy_filter:
-            pixels = pixels.loc[pixels.index.drop(fuzzy.index), :]
-
-        return pixels, na, fuzzy
+        return filter_pixels(
+            self.pixels,
+            na_filter=na_filter,
+            fuzzy_filter=fuzzy_filter
+        )
 
     def _set_pixel_set(self):
 
@@ -101,6 +100,25 @@ class PixelSetParser(object):
         self.pixelset.save()
 
     def _get_omics_units(self, pixels, verbose=False):
+        """Resolve the identifiers of the pixels to omics units ids.
+
+        Existing omics units of the parser strain and type are loaded once in
+        a hash map, and missing omics units are created in bulk, so that the
+        cost of this step grows linearly with the number of pixels.
+
+        Parameters
+        ----------
+        pixels : pandas.DataFrame
+            Pixels indexed by omics unit (reference) identifier.
+        verbose : bool, optional
+            Log the number of created omics units.
+
+        Returns
+        -------
+        dict
+            A hash map of omics units ids indexed by reference identifier (in
+            the order of the pixels).
+        """
 
         if any((self.strain is None, self.omics_unit_type is None)):
             raise PixelSetParserSaveError(
@@ -111,23 +129,25 @@ class PixelSetParser(object):
             )
 
         identifiers = pixels.axes[0].tolist()
-        existing = OmicsUnit.objects.filter(
-            strain=self.strain,
-            type=self.omics_unit_type
-        ).values_list('reference__identifier', flat=True)
+        existing = dict(
+            OmicsUnit.objects.filter(
+                strain=self.strain,
+                type=self.omics_unit_type
+            ).values_list('reference__identifier', 'id')
+        )
 
-        to_create = [
-            p for p in identifiers if p not in existing
-        ]
+        to_create = set(identifiers).difference(existing)
 
-        related_entries = Entry.objects.filter(identifier__in=to_create)
+        related_entries = dict()
+        if to_create:
+            entries = Entry.objects.filter(
+                identifier__in=to_create
+            ).values_list('identifier', 'id')
+            for identifier, entry_id in entries:
+                related_entries.setdefault(identifier, entry_id)
 
-        if related_entries.count() != len(to_create):
-            missing_entries = list(set(
-                to_create
-            ).difference(
-                set(related_entries.values_list('identifier', flat=True))
-            ))
+        missing_entries = sorted(to_create.difference(related_entries))
+        if len(missing_entries):
             raise PixelSetParserSaveError(
                 _(
                     "{} entries are missing ({}). Please load entries first "
@@ -138,77 +158,142 @@ class PixelSetParser(object):
                 )
             )
 
-        omics_units = []
-        for entry in related_entries:
-            omics_units.append(
-                OmicsUnit(
-                    reference=entry,
-                    strain=self.strain,
-                    type=self.omics_unit_type,
-                )
+        omics_units = [
+            OmicsUnit(
+                reference_id=entry_id,
+                strain=self.strain,
+                type=self.omics_unit_type,
             )
-        OmicsUnit.objects.bulk_create(omics_units)
-
-        return OmicsUnit.objects.filter(
-            reference__identifier__in=identifiers,
-            strain=self.strain,
-            type=self.omics_unit_type,
-        )
+            for entry_id in related_entries.values()
+        ]
+        OmicsUnit.objects.bulk_create(omics_units, batch_size=500)
 
-    def _to_pixels(self):
+        if verbose:
+            logger.info(
+                "Created {} omics units".format(len(omics_units))
+            )
 
-        if self.pixels is None:
-            return
+        # primary keys are UUIDs set by the model: no need to fetch them
+        existing.update(
+            (identifier, omics_unit.id)
+            for identifier, omics_unit in zip(related_entries, omics_units)
+        )
 
-        self._set_pixel_set()
-        pixels, na, fuzzy = self.filter()
+        return {
+            identifier: existing[identifier] for identifier in identifiers
+        }
 
-        # Pixels and OmicsUnits are sorted by OmicsUnit reference identifier
-        omics_units = self._get_omics_units(pixels)
+    def _get_pixels_frame(self):
+        """Join the (filtered) pixels to their omics unit id.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Pixels indexed by omics unit identifier, with `Value`,
+            `Quality_score` (missing values being `None`), `omics_unit_id` and
+            `existing` (whether the pixel has already been saved) columns.
+        """
+
+        if self.pixelset is None:
+            self._set_pixel_set()
+
+        if self.filtered_pixels is None:
+            pixels, __, __ = self.filter()
+        else:
+            pixels = self.filtered_pixels
+
+        # Omics units ids indexed by reference identifier
+        omics_units = pandas.Series(
+            self._get_omics_units(pixels),
+            name='omics_unit_id',
+            dtype=object,
+        )
 
         # Look for existing Pixels
-        identifiers = pixels.axes[0].tolist()
-        existing = Pixel.objects.filter(
-            omics_unit__reference__identifier__in=identifiers,
-            pixel_set=self.pixelset,
-        ).values_list(
-            'omics_unit__reference__identifier',
-            flat=True
+        existing = list(
+            Pixel.objects.filter(
+                pixel_set=self.pixelset,
+            ).values_list('omics_unit_id', flat=True)
+        )
+
+        # Join pixels to their omics unit (only once per omics unit)
+        pixels = pixels.loc[~pixels.index.duplicated(), :].join(
+            omics_units,
+            how='inner'
+        )
+        pixels['existing'] = pixels['omics_unit_id'].isin(existing)
+        # Missing quality scores are stored as NULL
+        pixels['Quality_score'] = pixels['Quality_score'].astype(object).where(
+            pixels['Quality_score'].notna(),
+            None
         )
 
-        for omics_unit in omics_units:
-            identifier = omics_unit.reference.identifier
-            pixel = pixels.ix[identifier]
-            db_pixel = Pixel(
-                value=pixel.Value,
-                quality_score=pixel.Quality_score,
-                omics_unit=omics_unit,
+        return pixels
+
+    def _build_pixels(self, pixels):
+
+        return [
+            Pixel(
+                value=value,
+                quality_score=quality_score,
+                omics_unit_id=omics_unit_id,
                 pixel_set=self.pixelset,
             )
-            if identifier in existing:
-                self.db_pixels['update'].append(db_pixel)
-            else:
-                self.db_pixels['new'].append(db_pixel)
+            for value, quality_score, omics_unit_id in zip(
+                pixels['Value'].tolist(),
+                pixels['Quality_score'].tolist(),
+                pixels['omics_unit_id'].tolist(),
+            )
+        ]
 
-    def save(self, update=False):
+    def _to_pixels(self):
 
-        self._to_pixels()
+        if self.pixels is None:
+            return
 
-        # Create news entries
-        Pixel.objects.bulk_create(self.db_pixels['new'], batch_size=500)
+        pixels = self._get_pixels_frame()
+        existing = pixels['existing']
+
+        self.db_pixels['new'] += self._build_pixels(pixels.loc[~existing, :])
+        self.db_pixels['update'] += self._build_pixels(pixels.loc[existing, :])
+
+    def save(self, update=False, loader=PIXELS_LOADER_ORM):
+        """Save the pixels of the pixel set.
+
+        Parameters
+        ----------
+        update : bool, optional
+            Update the value and quality score of existing pixels. New and
+            existing pixels are then upserted at once (see
+            `upsert_pixels()`), whatever the `loader`.
+        loader : str, optional
+            How new pixels are inserted: with Django's `bulk_create()`
+            (`PIXELS_LOADER_ORM`) or streamed with the PostgreSQL `COPY`
+            command (`PIXELS_LOADER_COPY`), which is much faster for large
+            pixel sets.
+        """
+
+        if loader not in PIXELS_LOADERS:
+            raise PixelSetParserSaveError(
+                _("Unknown pixels loader: {}").format(loader)
+            )
+
+        if update:
+            # Create new entries and update old ones
+            pixels = self._get_pixels_frame()
+            upsert_pixels(self.pixelset, pixels)
+        elif loader == PIXELS_LOADER_COPY:
+            # Create news entries
+            pixels = self._get_pixels_frame()
+            copy_pixels(self.pixelset, pixels.loc[~pixels['existing'], :])
+        else:
+            # Create news entries
+            self._to_pixels()
+            Pixel.objects.bulk_create(self.db_pixels['new'], batch_size=500)
 
         # Populate PixelSet cached fields
         self.pixelset.update_cached_fields()
 
-        if not update:
-            return
-
-        # Update old entries
-        for updated_pixel in self.db_pixels['update']:
-            pixel = Pixel.objects.get(
-                omics_unit=updated_pixel.omics_unit,
-                pixel_set=updated_pixel.pixel_set
-            )
-            pixel.value = updated_pixel.value
-            pixel.quality_score = updated_pixel.quality_score
-            pixel.save(update_fields=['value', 'quality_score'])
+        # Pixels have changed
+        self.pixelset.update_stats()
+        self.pixelset.bump_version()
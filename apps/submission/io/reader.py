@@ -0,0 +1,115 @@
+"""Pixels files reading.
+
+This module must not import Django models: its functions are run by worker
+processes started with the "spawn" method (see `parse_pixels_files()`), that
+do not set up Django.
+"""
+import multiprocessing
+
+import pandas
+
+
+def read_pixels(pixelset_path):
+    """Read a pixels file.
+
+    Parameters
+    ----------
+    pixelset_path : pathlib.Path
+        The path of the pixels file.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Pixels indexed by omics unit (reference) identifier.
+    """
+
+    return pandas.read_csv(
+        pixelset_path,
+        delim_whitespace=True,
+        index_col=0
+    )
+
+
+def filter_pixels(pixels, na_filter=True, fuzzy_filter=True):
+    """Split pixels with missing values (NA) and pixels related to more than
+    one omics unit (fuzzy, i.e. `;` separated identifiers).
+
+    Parameters
+    ----------
+    pixels : pandas.DataFrame
+        Pixels indexed by omics unit (reference) identifier.
+    na_filter : bool, optional
+        Remove NA pixels from the returned pixels.
+    fuzzy_filter : bool, optional
+        Remove fuzzy pixels from the returned pixels.
+
+    Returns
+    -------
+    tuple
+        The (filtered) pixels, the NA pixels and the fuzzy pixels.
+    """
+
+    na = pixels[pixels.isna().any(axis=1)]
+    fuzzy = pixels.filter(like=';', axis=0)
+
+    if na_filter:
+        pixels = pixels.dropna()
+
+    if fuzzy_filter:
+        pixels = pixels.loc[pixels.index.drop(fuzzy.index), :]
+
+    return pixels, na, fuzzy
+
+
+def parse_pixels(pixelset_path):
+    """Read and filter a pixels file.
+
+    Parameters
+    ----------
+    pixelset_path : pathlib.Path
+        The path of the pixels file.
+
+    Returns
+    -------
+    tuple
+        All the pixels of the file and the filtered pixels (see
+        `filter_pixels()`), only once per omics unit.
+    """
+
+    pixels = read_pixels(pixelset_path)
+    filtered, __, __ = filter_pixels(pixels)
+
+    return pixels, filtered.loc[~filtered.index.duplicated(), :]
+
+
+def parse_pixels_files(pixelset_paths, workers=1):
+    """Read and filter pixels files (see `parse_pixels()`), in parallel if
+    more than one worker is allowed.
+
+    Files are parsed by a pool of (at most `workers`) processes started with
+    the "spawn" method, since the importation runs in a thread and forking a
+    multi-threaded process is unsafe. Each worker imports pandas when it
+    starts: this only pays off for large pixels files.
+
+    Parameters
+    ----------
+    pixelset_paths : list
+        The paths of the pixels files.
+    workers : int, optional
+        The maximum number of worker processes.
+
+    Returns
+    -------
+    list
+        `parse_pixels()` results, in the order of `pixelset_paths`.
+    """
+
+    pixelset_paths = list(pixelset_paths)
+    workers = min(workers, len(pixelset_paths))
+
+    if workers < 2:
+        return [parse_pixels(path) for path in pixelset_paths]
+
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(processes=workers) as pool:
+        return pool.map(parse_pixels, pixelset_paths)
@@ -208,6 +208,26 @@ class PixelArchiveTestCase(LoadCGDMixin, CoreFixturesTestCase):
         self.assertEqual(Experiment.objects.count(), 1)
         self.assertEqual(Analysis.objects.count(), 1)
 
+    def test_save_with_workers(self):
+
+        archive = PixelArchive(self.valid_archive_path)
+        archive.parse()
+        self._load_cgd_entries()
+
+        experiment, analysis, pixel_sets = archive.save(
+            pixeler=self.pixeler,
+            workers=2
+        )
+        self.assertEqual(Pixel.objects.count(), 3716)
+        self.assertEqual(Experiment.objects.count(), 1)
+        self.assertEqual(Analysis.objects.count(), 1)
+
+        # Pixel sets are saved in the order of the datasets
+        self.assertEqual(
+            [pixel_set.description for pixel_set in pixel_sets],
+            [description for *__, description in archive.meta['datasets']]
+        )
+
     def test_save_twice_the_same_archive(self):
 
         archive_path = Path(
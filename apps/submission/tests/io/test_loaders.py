@@ -0,0 +1,156 @@
+import uuid
+
+import pandas
+
+from django.db import IntegrityError
+from django.test import TestCase
+
+from apps.core.factories import OmicsUnitFactory, PixelSetFactory
+from apps.core.models import Pixel
+from apps.core.tests import CoreFixturesTestCase
+from apps.submission.io.loaders import (
+    copy_pixels, generate_uuids, upsert_pixels
+)
+
+
+class GenerateUUIDsTestCase(TestCase):
+
+    def test_generates_version_4_uuids(self):
+
+        uuids = generate_uuids(100)
+
+        self.assertEqual(len(uuids), 100)
+        self.assertEqual(len(set(uuids)), 100)
+        for value in uuids:
+            value = uuid.UUID(value)
+            self.assertEqual(value.version, 4)
+            self.assertEqual(value.variant, uuid.RFC_4122)
+
+    def test_generates_nothing(self):
+
+        self.assertEqual(generate_uuids(0), [])
+
+
+class CopyPixelsTestCase(CoreFixturesTestCase):
+
+    def setUp(self):
+
+        self.pixel_set = PixelSetFactory()
+        self.omics_units = OmicsUnitFactory.create_batch(3)
+
+        self.pixels = pandas.DataFrame({
+            'Value': [1.123456789012345, -2., 3.5],
+            'Quality_score': pandas.Series([0.5, None, 1e-12], dtype=object),
+            'omics_unit_id': [o.id for o in self.omics_units],
+        })
+
+    def test_copy_pixels(self):
+
+        count = copy_pixels(self.pixel_set, self.pixels)
+
+        self.assertEqual(count, 3)
+        self.assertEqual(Pixel.objects.count(), 3)
+
+        pixels = {
+            p.omics_unit_id: p
+            for p in Pixel.objects.filter(pixel_set=self.pixel_set)
+        }
+        first, second, third = (pixels[o.id] for o in self.omics_units)
+        self.assertEqual(first.value, 1.123456789012345)
+        self.assertEqual(first.quality_score, 0.5)
+        self.assertEqual(second.value, -2.)
+        self.assertIsNone(second.quality_score)
+        self.assertEqual(third.quality_score, 1e-12)
+
+    def test_copy_pixels_by_chunks(self):
+
+        count = copy_pixels(self.pixel_set, self.pixels, chunk_size=2)
+
+        self.assertEqual(count, 3)
+        self.assertEqual(Pixel.objects.count(), 3)
+
+    def test_copy_pixels_is_atomic(self):
+
+        # the last chunk cannot be copied (values are required)
+        self.pixels['Value'] = pandas.Series([1., 2., None], dtype=object)
+
+        with self.assertRaises(IntegrityError):
+            copy_pixels(self.pixel_set, self.pixels, chunk_size=2)
+
+        self.assertEqual(Pixel.objects.count(), 0)
+
+    def test_copy_no_pixels(self):
+
+        count = copy_pixels(self.pixel_set, self.pixels.iloc[:0])
+
+        self.assertEqual(count, 0)
+        self.assertEqual(Pixel.objects.count(), 0)
+
+
+class UpsertPixelsTestCase(CoreFixturesTestCase):
+
+    def setUp(self):
+
+        self.pixel_set = PixelSetFactory()
+        self.omics_units = OmicsUnitFactory.create_batch(3)
+
+        self.existing = Pixel.objects.create(
+            value=4.2,
+            quality_score=0.8,
+            omics_unit=self.omics_units[0],
+            pixel_set=self.pixel_set,
+        )
+        # same omics unit, another pixel set
+        self.other = Pixel.objects.create(
+            value=1.,
+            quality_score=0.1,
+            omics_unit=self.omics_units[0],
+            pixel_set=PixelSetFactory(),
+        )
+
+        self.pixels = pandas.DataFrame({
+            'Value': [1.5, -2., 3.5],
+            'Quality_score': pandas.Series([None, 0.2, 0.3], dtype=object),
+            'omics_unit_id': [o.id for o in self.omics_units],
+        })
+
+    def test_upsert_pixels(self):
+
+        count = upsert_pixels(self.pixel_set, self.pixels)
+
+        self.assertEqual(count, 3)
+        self.assertEqual(
+            Pixel.objects.filter(pixel_set=self.pixel_set).count(), 3
+        )
+
+        # existing pixels are updated in place
+        existing = Pixel.objects.get(pk=self.existing.pk)
+        self.assertEqual(existing.value, 1.5)
+        self.assertIsNone(existing.quality_score)
+
+        # other pixel sets are left untouched
+        other = Pixel.objects.get(pk=self.other.pk)
+        self.assertEqual(other.value, 1.)
+        self.assertEqual(other.quality_score, 0.1)
+
+        pixel = Pixel.objects.get(
+            pixel_set=self.pixel_set,
+            omics_unit=self.omics_units[2]
+        )
+        self.assertEqual(pixel.value, 3.5)
+        self.assertEqual(pixel.quality_score, 0.3)
+
+    def test_upsert_pixels_twice(self):
+
+        upsert_pixels(self.pixel_set, self.pixels)
+        self.pixels['Value'] = [7., 8., 9.]
+        upsert_pixels(self.pixel_set, self.pixels)
+
+        self.assertEqual(
+            list(
+                Pixel.objects.filter(
+                    pixel_set=self.pixel_set
+                ).order_by('value').values_list('value', flat=True)
+            ),
+            [7., 8., 9.]
+        )
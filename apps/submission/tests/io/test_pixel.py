@@ -9,6 +9,7 @@ from apps.core.tests import CoreFixturesTestCase
 from apps.data.factories import EntryFactory
 from apps.data.io.parsers import CGDParser
 from apps.data.models import Repository
+from apps.submission.io.loaders import PIXELS_LOADER_COPY
 from apps.submission.io.pixel import PixelSetParser
 from ...exceptions import PixelSetParserError, PixelSetParserSaveError
 
@@ -213,7 +214,21 @@ class PixelTestCase(LoadCGDMixin, CoreFixturesTestCase):
 
         # Then create omics units
         omics_units = parser._get_omics_units(pixels, verbose=True)
-        self.assertEqual(omics_units.count(), 1837)
+        self.assertEqual(len(omics_units), 1837)
+        self.assertEqual(OmicsUnit.objects.count(), 1837)
+        self.assertEqual(list(omics_units), pixels.axes[0].tolist())
+
+        omics_unit = OmicsUnit.objects.get(id=omics_units['CAGL0F02695g'])
+        self.assertEqual(omics_unit.reference.identifier, 'CAGL0F02695g')
+        self.assertEqual(omics_unit.strain, self.strain)
+        self.assertEqual(omics_unit.type, self.omics_unit_type)
+
+        # Existing omics units are resolved with a single query
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                parser._get_omics_units(pixels),
+                omics_units
+            )
         self.assertEqual(OmicsUnit.objects.count(), 1837)
 
     def test__to_pixels(self):
@@ -243,11 +258,55 @@ class PixelTestCase(LoadCGDMixin, CoreFixturesTestCase):
         self.assertEqual(len(parser.db_pixels['update']), 0)
 
         db_pixel = parser.db_pixels['new'][0]
-        pixel = parser.pixels.ix[db_pixel.omics_unit.reference.identifier]
+        pixel = parser.pixels.loc[db_pixel.omics_unit.reference.identifier]
 
         self.assertEqual(db_pixel.value, pixel.Value)
         self.assertEqual(db_pixel.quality_score, pixel.Quality_score)
 
+    def test__to_pixels_queries(self):
+
+        parser = PixelSetParser(
+            self.pixelset_path,
+            description=self.description,
+            analysis=self.analysis,
+            omics_unit_type=self.omics_unit_type,
+            strain=self.strain,
+        )
+        parser.parse()
+        parser._set_pixel_set()
+        self._load_cgd_entries()
+        # create omics units
+        parser._get_omics_units(parser.filter()[0])
+
+        # omics units and existing pixels: the number of queries does not
+        # depend on the number of pixels
+        with self.assertNumQueries(2):
+            parser._to_pixels()
+        self.assertEqual(len(parser.db_pixels['new']), 1837)
+
+    def test__to_pixels_with_missing_quality_scores(self):
+
+        parser = PixelSetParser(
+            self.pixelset_path,
+            description=self.description,
+            analysis=self.analysis,
+            omics_unit_type=self.omics_unit_type,
+            strain=self.strain,
+        )
+        parser.parse()
+        self._load_cgd_entries()
+        # filtered pixels (without NA nor fuzzy identifiers), but missing
+        # quality scores
+        pixels, __, __ = parser.filter()
+        pixels = pixels.assign(Quality_score=float('nan'))
+        parser.filter = lambda: (pixels, None, None)
+        parser._to_pixels()
+
+        self.assertTrue(len(parser.db_pixels['new']))
+        self.assertTrue(
+            all(p.quality_score is None for p in parser.db_pixels['new'])
+        )
+
     def test__to_pixels_with_existing_pixel(self):
 
         parser = PixelSetParser(
@@ -270,7 +329,7 @@ class PixelTestCase(LoadCGDMixin, CoreFixturesTestCase):
 
         # We should have updated existing pixel data
         identifier = existing_db_pixel.omics_unit.reference.identifier
-        pixel = parser.pixels.ix[identifier]
+        pixel = parser.pixels.loc[identifier]
         updated_db_pixel = parser.db_pixels['update'][0]
         self.assertEqual(updated_db_pixel.value, pixel.Value)
         self.assertEqual(updated_db_pixel.quality_score, pixel.Quality_score)
@@ -291,6 +350,10 @@ class PixelTestCase(LoadCGDMixin, CoreFixturesTestCase):
         parser.save()
         self.assertEqual(Pixel.objects.count(), 1837)
 
+        stats = parser.pixelset.get_stats()
+        self.assertEqual(stats.pixels_count, 1837)
+        self.assertEqual(stats.values_na_count, 0)
+
     def test_save_with_same_reference_omics_units(self):
 
         # Create two OmicsUnits with the same identifier but for different
@@ -367,11 +430,64 @@ class PixelTestCase(LoadCGDMixin, CoreFixturesTestCase):
 
         parser.save(update=True)
         self.assertEqual(Pixel.objects.count(), 1837)
+        self.assertEqual(parser.pixelset.get_stats().pixels_count, 1837)
 
         pixel = Pixel.objects.get(pk=pixel.pk)
         self.assertEqual(pixel.value, 2.703695974165)
         self.assertEqual(pixel.quality_score, 0.00268822352590468)
 
+        # saving again only updates pixels
+        parser.save(update=True)
+        self.assertEqual(Pixel.objects.count(), 1837)
+
+    def test_save_with_copy_loader(self):
+
+        parser = PixelSetParser(
+            self.pixelset_path,
+            description=self.description,
+            analysis=self.analysis,
+            omics_unit_type=self.omics_unit_type,
+            strain=self.strain,
+        )
+        parser.parse()
+        parser._set_pixel_set()
+        self._load_cgd_entries()
+
+        pixel = self._create_pixel_from_set(parser.pixelset)
+        self.assertEqual(Pixel.objects.count(), 1)
+
+        parser.save(loader=PIXELS_LOADER_COPY)
+        self.assertEqual(Pixel.objects.count(), 1837)
+        self.assertEqual(parser.pixelset.get_stats().pixels_count, 1837)
+
+        # existing pixels are left untouched
+        pixel = Pixel.objects.get(pk=pixel.pk)
+        self.assertEqual(pixel.value, 4.2)
+        self.assertEqual(pixel.quality_score, 0.8)
+
+        # new pixels are copied as is
+        pixel = Pixel.objects.get(
+            pixel_set=parser.pixelset,
+            omics_unit__reference__identifier='CAGL0F02695g',
+        )
+        self.assertEqual(pixel.value, 4.25954345565357)
+        self.assertEqual(pixel.quality_score, 5.01881633247573e-05)
+
+    def test_save_with_unknown_loader(self):
+
+        parser = PixelSetParser(
+            self.pixelset_path,
+            description=self.description,
+            analysis=self.analysis,
+            omics_unit_type=self.omics_unit_type,
+            strain=self.strain,
+        )
+        parser.parse()
+
+        with self.assertRaises(PixelSetParserSaveError):
+            parser.save(loader='foo')
+        self.assertEqual(Pixel.objects.count(), 0)
+
     def test_save_populates_cached_fields(self):
 
         parser = PixelSetParser(
@@ -0,0 +1,60 @@
+from pathlib import Path
+
+from django.test import TestCase
+
+from apps.submission.io.reader import (
+    filter_pixels, parse_pixels, parse_pixels_files, read_pixels
+)
+
+
+class ReaderTestCase(TestCase):
+
+    def setUp(self):
+
+        self.pixelset_paths = [
+            Path('apps/submission/fixtures/dataset-0001/Pixel_C10.txt'),
+            Path('apps/submission/fixtures/dataset-0001/Pixel_C60.txt'),
+            Path('apps/submission/fixtures/dataset-0002/data.txt'),
+        ]
+
+    def test_read_pixels(self):
+
+        pixels = read_pixels(self.pixelset_paths[0])
+
+        self.assertEqual(len(pixels), 1936)
+        self.assertEqual(
+            list(pixels.columns),
+            ['Value', 'Quality_score']
+        )
+
+    def test_filter_pixels(self):
+
+        pixels, na, fuzzy = filter_pixels(read_pixels(self.pixelset_paths[0]))
+
+        self.assertEqual(len(pixels), 1837)
+        self.assertEqual(len(na), 74)
+        self.assertEqual(len(fuzzy), 25)
+
+    def test_parse_pixels(self):
+
+        pixels, filtered = parse_pixels(self.pixelset_paths[0])
+
+        self.assertEqual(len(pixels), 1936)
+        self.assertEqual(len(filtered), len(set(filtered.index)))
+        self.assertTrue(filtered.notna().all().all())
+        self.assertFalse(any(';' in i for i in filtered.index))
+
+    def test_parse_pixels_files(self):
+
+        expected = [parse_pixels(path) for path in self.pixelset_paths]
+
+        for workers in (1, 2, 5):
+            results = parse_pixels_files(self.pixelset_paths, workers=workers)
+            self.assertEqual(len(results), len(expected))
+            for result, expected_result in zip(results, expected):
+                for frame, expected_frame in zip(result, expected_result):
+                    self.assertTrue(frame.equals(expected_frame))
+
+    def test_parse_no_pixels_files(self):
+
+        self.assertEqual(parse_pixels_files([], workers=2), [])
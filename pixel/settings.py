@@ -139,6 +139,56 @@ class Base(Configuration):
     MEDIA_ROOT = os.path.join(BASE_DIR, 'public', 'media')
     MEDIA_URL = '/media/'
 
+    # Django's cache is shared by all processes (web workers and importation
+    # threads), so that invalidating cached values (e.g. after an importation)
+    # is seen everywhere. The cache table is created by the `createcachetable`
+    # management command.
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'pixel_cache',
+            'OPTIONS': {
+                'MAX_ENTRIES': 10000,
+            },
+        },
+    }
+
+    # Exports cache (built archives are stored on disk, the least recently
+    # used ones are evicted when the cache exceeds its maximum size in bytes).
+    # Set the maximum size to 0 to disable it.
+    EXPORT_CACHE_ROOT = os.path.join(MEDIA_ROOT, 'cache', 'exports')
+    EXPORT_CACHE_MAX_SIZE = values.IntegerValue(
+        512 * 1024 * 1024,
+        environ_name='EXPORT_CACHE_MAX_SIZE',
+        environ_prefix=None
+    )
+
+    # Search terms are resolved to omics units ids, the result is cached for
+    # this number of seconds.
+    SEARCH_TERMS_CACHE_TIMEOUT = values.IntegerValue(
+        5 * 60,
+        environ_name='SEARCH_TERMS_CACHE_TIMEOUT',
+        environ_prefix=None
+    )
+
+    # Pixel Sets counts displayed next to explorer filters are cached for this
+    # number of seconds (or until the next importation).
+    FACET_COUNTS_CACHE_TIMEOUT = values.IntegerValue(
+        60 * 60,
+        environ_name='FACET_COUNTS_CACHE_TIMEOUT',
+        environ_prefix=None
+    )
+
+    # Pixels files of a submission are read and filtered by this number of
+    # worker processes (1 to parse them one after another in the importation
+    # thread). Starting a worker costs more than parsing a few thousand
+    # pixels: only raise it for very large pixels files on multi-core hosts.
+    SUBMISSION_IMPORT_WORKERS = values.IntegerValue(
+        1,
+        environ_name='SUBMISSION_IMPORT_WORKERS',
+        environ_prefix=None
+    )
+
 
 class Development(Base):
 
@@ -237,6 +287,16 @@ class Test(Base):
     INSTALLED_APPS = Base.INSTALLED_APPS + [
         'apps.core.tests.mixins',
     ]
+
+    # Tests run in a single process, cache queries must not be counted
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+    }
+    EXPORT_CACHE_MAX_SIZE = 0
+    SEARCH_TERMS_CACHE_TIMEOUT = 0
+    FACET_COUNTS_CACHE_TIMEOUT = 0
     LOGGING = {
         'version': 1,
         'disable_existing_loggers': False,